@@ -1,14 +1,26 @@
 """Chain brand detection with city-wide local chain detection."""
 
+import heapq
 import logging
-from typing import Dict, Any, List
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Union
+from langgraph.constants import Send
 from agents.state import BusinessAnalysisState
 from utils.city_chain_detector import CityChainDetector
+from utils.distance import haversine_km
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1)
+def _get_city_detector() -> CityChainDetector:
+    """Load the city database once and share it across the per-business enrichment tasks."""
+    return CityChainDetector()
+
+
 def chain_brand_node(state: BusinessAnalysisState) -> Dict[str, Any]:
-    """Find businesses and detect city-wide local chains."""
+    """Prepare businesses for per-business chain enrichment (fan-out dispatcher)."""
     logger.info("Starting chain brand detection with city-wide analysis")
     
     try:
@@ -24,31 +36,26 @@ def chain_brand_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         # Add distance information to businesses
         all_businesses = _add_distance_to_businesses(all_businesses, latitude, longitude)
         
-        # NEW: Enrich businesses with city-wide chain information
-        # This now also detects chains within the search results
-        city_detector = CityChainDetector()
-        enriched_businesses = city_detector.enrich_businesses_with_chain_data(all_businesses, business_type)
-        
-        # Add sentiment data and top reviews to businesses
-        enriched_businesses = _add_sentiment_and_reviews(enriched_businesses, state.get("sentiment_analysis", {}), state.get("reviews_data", []))
-        
-        # Log chain detection results
-        chain_count = sum(1 for b in enriched_businesses if b.get('is_local_chain', False))
-        logger.info(f"Found {len(enriched_businesses)} businesses, {chain_count} are chains")
+        # Chains within the search results need the whole list, and brand classification
+        # batches several names per LLM request, so both run here before the businesses
+        # are enriched one by one
+        city_detector = _get_city_detector()
+        result_chain_infos = city_detector.find_result_chains(all_businesses)
+        brand_infos = city_detector.classify_brands(all_businesses, business_type)
+        for business, result_chain_info, brand_info in zip(all_businesses, result_chain_infos, brand_infos):
+            business['result_chain_info'] = result_chain_info
+            business['brand_info'] = brand_info
         
         # Return updated state
         return {
-            **state,
-            "chain_brands": enriched_businesses,
-            "nearby_businesses": enriched_businesses,
-            "current_step": "chain_brand_completed"
+            "nearby_businesses": all_businesses,
+            "current_step": "chain_brand_dispatched"
         }
         
     except Exception as e:
         error_msg = f"Error in business detection node: {str(e)}"
         logger.error(error_msg)
         return {
-            **state,
             "chain_brands": [],
             "nearby_businesses": [],
             "error": error_msg,
@@ -56,41 +63,97 @@ def chain_brand_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         }
 
 
-def _add_distance_to_businesses(businesses: List[Dict], center_lat: float, center_lon: float) -> List[Dict]:
-    """Add distance information to businesses."""
-    from math import radians, sin, cos, sqrt, atan2
+def dispatch_businesses(state: BusinessAnalysisState) -> Union[str, List[Send]]:
+    """
+    Fan out one enrich_business task per business.
     
-    def _calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two coordinates in kilometers."""
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1_rad = radians(lat1)
-        lat2_rad = radians(lat2)
-        delta_lat = radians(lat2 - lat1)
-        delta_lon = radians(lon2 - lon1)
+    Args:
+        state: Current state of the workflow
         
-        a = sin(delta_lat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
+    Returns:
+        Send packets for enrich_business, or the collector node when there is nothing to enrich
+    """
+    businesses = state.get("nearby_businesses") or []
+    if not businesses:
+        return "collect_businesses"
+    
+    business_sentiments, business_reviews = _index_sentiment_and_reviews(
+        state.get("sentiment_analysis", {}), state.get("reviews_data", [])
+    )
+    business_type = state["business_type"]
+    
+    return [
+        Send("enrich_business", {
+            "business": business,
+            "business_type": business_type,
+            "brand_info": business.get("brand_info"),
+            "sentiment_metrics": business_sentiments.get(business.get("name", "Unknown"), {}),
+            "reviews": business_reviews.get(business.get("name", "Unknown"), [])
+        })
+        for business in businesses
+    ]
+
+
+def enrich_business_node(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Enrich a single business with chain, brand, sentiment, and review data.
+    
+    Args:
+        task: Payload sent by dispatch_businesses
         
-        return R * c
+    Returns:
+        Single-item chain_brands update, appended by the state reducer
+    """
+    business = task["business"]
+    
+    try:
+        enriched = _get_city_detector().enrich_business(
+            business, task["business_type"], business.get("result_chain_info"), task.get("brand_info")
+        )
+        enriched = _add_business_sentiment(enriched, task["sentiment_metrics"], task["reviews"])
+        return {"chain_brands": [enriched]}
+    except Exception as e:
+        logger.error(f"Error enriching business {business.get('name', 'Unknown')}: {str(e)}")
+        return {"chain_brands": []}
+
+
+def collect_businesses_node(state: BusinessAnalysisState) -> Dict[str, Any]:
+    """Gather the enriched businesses produced by the fan-out."""
+    enriched_businesses = state.get("chain_brands") or []
+    
+    # Log chain detection results
+    chain_count = sum(1 for b in enriched_businesses if b.get('is_local_chain', False))
+    logger.info(f"Found {len(enriched_businesses)} businesses, {chain_count} are chains")
+    
+    # Keep the dispatcher's error marker if it failed before fanning out
+    current_step = state.get("current_step")
+    if current_step != "chain_brand_error":
+        current_step = "chain_brand_completed"
+    
+    # Return updated state
+    return {
+        "nearby_businesses": enriched_businesses,
+        "current_step": current_step
+    }
+
+
+def _add_distance_to_businesses(businesses: List[Dict], center_lat: float, center_lon: float) -> List[Dict]:
+    """Add distance information to businesses."""
+    # Businesses without coordinates are placed at the search center
+    lats = [business.get('latitude', center_lat) for business in businesses]
+    lons = [business.get('longitude', center_lon) for business in businesses]
+    distances = haversine_km(center_lat, center_lon, lats, lons).tolist()
     
     # Add distance to each business
     businesses_with_distance = []
-    for business in businesses:
+    for business, lat, lon, distance in zip(businesses, lats, lons, distances):
         business_copy = business.copy()
-        
-        # Get business coordinates
-        lat = business.get('latitude', center_lat)
-        lon = business.get('longitude', center_lon)
-        
-        # Calculate distance
-        distance = _calculate_distance(center_lat, center_lon, lat, lon)
         business_copy['distance'] = distance
-        
+    
         # Also add lat/lon fields with standard names for consistency
         business_copy['lat'] = lat
         business_copy['lon'] = lon
-        
+    
         businesses_with_distance.append(business_copy)
     
     return businesses_with_distance
@@ -113,17 +176,21 @@ def _find_nearby_businesses(latitude: float, longitude: float, business_type: st
     return []
 
 
-def _add_sentiment_and_reviews(businesses: List[Dict], sentiment_analysis: Dict, reviews_data: List[Dict]) -> List[Dict]:
+def _compound_score(review: Dict) -> float:
+    """Sort key for reviews by VADER compound score."""
+    return review.get("sentiment", {}).get("compound", 0)
+
+
+def _index_sentiment_and_reviews(sentiment_analysis: Dict, reviews_data: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str, List[Dict]]]:
     """
-    Add sentiment data and top positive/negative reviews to businesses.
+    Index sentiment metrics and reviews by business name.
     
     Args:
-        businesses: List of businesses
         sentiment_analysis: Sentiment analysis data
         reviews_data: Raw reviews data
         
     Returns:
-        Enriched businesses with sentiment and review data
+        Tuple of (business name -> sentiment metrics, business name -> reviews)
     """
     # Create a mapping of business names to sentiment metrics
     business_sentiments = {}
@@ -132,43 +199,45 @@ def _add_sentiment_and_reviews(businesses: List[Dict], sentiment_analysis: Dict,
         business_sentiments[name] = business_sentiment.get("metrics", {})
     
     # Group reviews by business name
-    from collections import defaultdict
     business_reviews = defaultdict(list)
     for review in reviews_data:
         business_name = review.get("business_name", "Unknown")
         business_reviews[business_name].append(review)
     
-    # Add sentiment data and top reviews to each business
-    enriched_businesses = []
-    for business in businesses:
-        business_copy = business.copy()
-        
-        # Add sentiment metrics
-        business_name = business.get("name", "Unknown")
-        sentiment_metrics = business_sentiments.get(business_name, {})
-        
-        # Add sentiment data to business
-        business_copy["rating"] = business.get("rating", 0) or 0
-        business_copy["reviews_count"] = business.get("reviews_count", 0) or 0
-        business_copy["positive_percentage"] = sentiment_metrics.get("positive_percentage", 0)
-        business_copy["negative_percentage"] = sentiment_metrics.get("negative_percentage", 0)
-        business_copy["average_sentiment"] = sentiment_metrics.get("average_sentiment", 0)
-        
-        # Get reviews for this business
-        reviews = business_reviews.get(business_name, [])
-        
-        # Filter and sort reviews by sentiment
-        positive_reviews = [r for r in reviews if r.get("sentiment", {}).get("label") == "positive"]
-        negative_reviews = [r for r in reviews if r.get("sentiment", {}).get("label") == "negative"]
-        
-        # Sort by compound score (most positive/negative first)
-        positive_reviews.sort(key=lambda r: r.get("sentiment", {}).get("compound", 0), reverse=True)
-        negative_reviews.sort(key=lambda r: r.get("sentiment", {}).get("compound", 0))
-        
-        # Add top 2 positive and negative reviews
-        business_copy["positive_reviews"] = positive_reviews[:2]
-        business_copy["negative_reviews"] = negative_reviews[:2]
+    return business_sentiments, business_reviews
+
+
+def _add_business_sentiment(business: Dict, sentiment_metrics: Dict, reviews: List[Dict]) -> Dict:
+    """
+    Add sentiment data and top positive/negative reviews to a business.
+    
+    Args:
+        business: Business dictionary
+        sentiment_metrics: Sentiment metrics for this business
+        reviews: Reviews for this business
         
-        enriched_businesses.append(business_copy)
+    Returns:
+        Enriched copy of the business
+    """
+    business_copy = business.copy()
+    
+    # Add sentiment data to business
+    business_copy["rating"] = business.get("rating", 0) or 0
+    business_copy["reviews_count"] = business.get("reviews_count", 0) or 0
+    business_copy["positive_percentage"] = sentiment_metrics.get("positive_percentage", 0)
+    business_copy["negative_percentage"] = sentiment_metrics.get("negative_percentage", 0)
+    business_copy["average_sentiment"] = sentiment_metrics.get("average_sentiment", 0)
+    
+    # Add top 2 positive and negative reviews (most positive/negative first by compound score)
+    business_copy["positive_reviews"] = heapq.nlargest(
+        2,
+        (r for r in reviews if r.get("sentiment", {}).get("label") == "positive"),
+        key=_compound_score
+    )
+    business_copy["negative_reviews"] = heapq.nsmallest(
+        2,
+        (r for r in reviews if r.get("sentiment", {}).get("label") == "negative"),
+        key=_compound_score
+    )
     
-    return enriched_businesses
\ No newline at end of file
+    return business_copy
@@ -1,13 +1,17 @@
 """Extract reviews node for business advisor workflow."""
 
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 from agents.state import BusinessAnalysisState
 from utils.api_clients import SerpApiClient
 from utils.database import store_serp_reviews, get_serp_reviews, get_cached_business_ids
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent review fetches
+MAX_REVIEW_WORKERS = 8
+
 def extract_reviews_node(state: BusinessAnalysisState) -> Dict[str, Any]:
     """
     Node to extract reviews for nearby businesses.
@@ -30,7 +34,6 @@ def extract_reviews_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         if not nearby_businesses:
             logger.info("No businesses found, skipping review extraction")
             return {
-                **state,
                 "reviews_data": [],
                 "current_step": "extract_reviews_completed"
             }
@@ -39,57 +42,35 @@ def extract_reviews_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         serp_client = SerpApiClient()
         
         # Extract reviews for each business (limit to top 10 businesses, max 20 reviews each)
+        # Review fetches are blocking HTTP calls, so they run on a thread pool
+        businesses = nearby_businesses[:10]
         reviews_data = []
         
-        for i, business in enumerate(nearby_businesses[:10]):
-            data_id = business.get("data_id")
-            business_name = business.get("name", "Unknown")
-            business_lat = business.get("latitude", latitude)
-            business_lon = business.get("longitude", longitude)
-            
-            if not data_id:
-                logger.warning(f"No data_id for business: {business_name}")
-                continue
-            
-            logger.info(f"[{i+1}/10] Processing reviews for: {business_name} (ID: {data_id})")
-            
-            # Fetch reviews from API (no caching, limit to 20 reviews per business)
-            logger.info(f"  → Fetching reviews from API (max 20 reviews)")
+        with ThreadPoolExecutor(max_workers=min(MAX_REVIEW_WORKERS, len(businesses))) as executor:
+            fetched = executor.map(
+                lambda item: _fetch_business_reviews(serp_client, item[0], item[1]),
+                enumerate(businesses)
+            )
             
-            # Collect reviews (limit to 20)
-            all_reviews = []
-            
-            try:
-                # Get reviews for the business
-                review_response = serp_client.get_place_reviews(data_id)
-                reviews = review_response.get("reviews", [])
-                
-                # Limit to 20 reviews total
-                if len(reviews) > 20:
-                    reviews = reviews[:20]
-                
-                all_reviews.extend(reviews)
-                logger.info(f"  - Got {len(all_reviews)} reviews (limited to 20)")
-                
-                # Add business context to each review
-                for review in all_reviews:
-                    review["business_name"] = business_name
-                    review["business_rating"] = business.get("rating")
-                    review["business_address"] = business.get("address")
+            # Results come back in business order; store them from this thread
+            for business, all_reviews in zip(businesses, fetched):
+                if not all_reviews:
+                    continue
                 
                 reviews_data.extend(all_reviews)
                 
                 # Store reviews in database
-                store_serp_reviews(business_name, data_id, all_reviews, business_lat, business_lon)
-                
-            except Exception as e:
-                logger.warning(f"  ✗ Error extracting reviews for {business_name}: {str(e)}")
-                continue
+                store_serp_reviews(
+                    business.get("name", "Unknown"),
+                    business.get("data_id"),
+                    all_reviews,
+                    business.get("latitude", latitude),
+                    business.get("longitude", longitude)
+                )
         
         logger.info(f"Completed: Extracted/used {len(reviews_data)} total reviews from {min(10, len(nearby_businesses))} businesses")
         
         return {
-            **state,
             "reviews_data": reviews_data,
             "current_step": "extract_reviews_completed"
         }
@@ -98,8 +79,53 @@ def extract_reviews_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         error_msg = f"Error in extract reviews node: {str(e)}"
         logger.error(error_msg)
         return {
-            **state,
             "reviews_data": [],
             "error": error_msg,
             "current_step": "extract_reviews_error"
-        }
\ No newline at end of file
+        }
+
+
+def _fetch_business_reviews(serp_client: SerpApiClient, index: int, business: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Fetch up to 20 reviews for a single business.
+    
+    Args:
+        serp_client: Shared SerpApi client
+        index: Position of the business in the processing list
+        business: Business dictionary
+        
+    Returns:
+        Reviews annotated with business context (empty on failure)
+    """
+    data_id = business.get("data_id")
+    business_name = business.get("name", "Unknown")
+    
+    if not data_id:
+        logger.warning(f"No data_id for business: {business_name}")
+        return []
+    
+    logger.info(f"[{index+1}/10] Processing reviews for: {business_name} (ID: {data_id})")
+    
+    # Fetch reviews from API (no caching, limit to 20 reviews per business)
+    logger.info(f"  → Fetching reviews from API (max 20 reviews)")
+    
+    try:
+        # Get reviews for the business
+        review_response = serp_client.get_place_reviews(data_id)
+        reviews = review_response.get("reviews", [])
+        
+        # Limit to 20 reviews total
+        all_reviews = reviews[:20]
+        logger.info(f"  - Got {len(all_reviews)} reviews (limited to 20)")
+        
+        # Add business context to each review
+        for review in all_reviews:
+            review["business_name"] = business_name
+            review["business_rating"] = business.get("rating")
+            review["business_address"] = business.get("address")
+        
+        return all_reviews
+        
+    except Exception as e:
+        logger.warning(f"  ✗ Error extracting reviews for {business_name}: {str(e)}")
+        return []
\ No newline at end of file
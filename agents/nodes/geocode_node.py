@@ -1,14 +1,28 @@
 """Geocode node for business advisor workflow."""
 
 import logging
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from agents.state import BusinessAnalysisState
+from utils.coordinate_index import CoordinateIndex
+from utils.data_files import CSV_ENGINE
 from utils.geocoder import Geocoder
 
 logger = logging.getLogger(__name__)
 
+# Property CSV relative to the project root, falling back to the working directory
+PROPERTY_CSV_PATH = next(
+    (path for path in (
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                     "data", "property_project_lat_long.csv"),
+        "data/property_project_lat_long.csv"
+    ) if os.path.exists(path)),
+    None
+)
+
 
 def geocode_node(state: BusinessAnalysisState) -> Dict[str, Any]:
     """
@@ -37,7 +51,6 @@ def geocode_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         if area_name and area_name != 'Unknown':
             logger.info(f"Found property in CSV: {area_name}")
             return {
-                **state,
                 "area_name": area_name,
                 "current_step": "geocode_completed"
             }
@@ -52,7 +65,6 @@ def geocode_node(state: BusinessAnalysisState) -> Dict[str, Any]:
             
             # Return updated state
             return {
-                **state,
                 "area_name": location_info["area_name"],
                 "current_step": "geocode_completed"
             }
@@ -60,7 +72,6 @@ def geocode_node(state: BusinessAnalysisState) -> Dict[str, Any]:
             logger.error(f"Error in reverse geocoding: {geocode_error}")
             # If geocoding fails, still return with area_name as Unknown
             return {
-                **state,
                 "area_name": "Unknown",
                 "current_step": "geocode_completed"
             }
@@ -69,13 +80,36 @@ def geocode_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         error_msg = f"Error in geocode node: {str(e)}"
         logger.error(error_msg)
         return {
-            **state,
             "area_name": "Unknown",
             "error": error_msg,
             "current_step": "geocode_error"
         }
 
 
+@lru_cache(maxsize=1)
+def _load_property_table() -> Optional[Tuple[CoordinateIndex, np.ndarray]]:
+    """
+    Load the property coordinate table once and keep it resident.
+    
+    Returns:
+        Tuple of (coordinate index, property names), or None if the CSV is missing
+    """
+    if PROPERTY_CSV_PATH is None:
+        logger.warning("Property CSV file not found")
+        return None
+    
+    df = pd.read_csv(PROPERTY_CSV_PATH, usecols=['latitude', 'longitude', 'project_name', 'brand_name'], engine=CSV_ENGINE)
+    logger.debug("Loaded CSV with %d rows for lookup", len(df))
+    
+    # Prefer the project name, falling back to the brand name
+    names = df['project_name'].fillna(df['brand_name'])
+    
+    coordinate_index = CoordinateIndex(
+        df['latitude'].to_numpy(dtype=np.float64), df['longitude'].to_numpy(dtype=np.float64)
+    )
+    return coordinate_index, names.to_numpy(dtype=object)
+
+
 def _lookup_property_in_csv(latitude: float, longitude: float) -> str:
     """
     Look up property name in CSV file based on coordinates.
@@ -88,49 +122,33 @@ def _lookup_property_in_csv(latitude: float, longitude: float) -> str:
         Property name if found, 'Unknown' otherwise
     """
     try:
-        # Load the property data CSV
-        # Get the directory of this file and construct path relative to project root
-        current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        csv_path = os.path.join(current_dir, "data", "property_project_lat_long.csv")
-        
-        if not os.path.exists(csv_path):
-            # Fallback to relative path
-            csv_path = "data/property_project_lat_long.csv"
-            
-        if not os.path.exists(csv_path):
-            logger.warning(f"Property CSV file not found at {csv_path}")
+        property_table = _load_property_table()
+        if property_table is None:
             return "Unknown"
         
-        df = pd.read_csv(csv_path)
+        coordinate_index, names = property_table
         
-        logger.debug(f"Loaded CSV with {len(df)} rows for lookup")
-        logger.debug(f"Looking for coordinates: {latitude}, {longitude}")
+        logger.debug("Looking for coordinates: %s, %s", latitude, longitude)
         
         # Look for exact coordinate match (with small tolerance for floating point comparison)
-        tolerance = 0.000001  # About 10cm tolerance
-        
-        # Log the first few rows for debugging
-        logger.debug("First few CSV rows:")
-        for i in range(min(3, len(df))):
-            logger.debug(f"Row {i}: {df.iloc[i]['latitude']}, {df.iloc[i]['longitude']}, {df.iloc[i].get('project_name', 'N/A')}")
-        
-        matching_rows = df[
-            (abs(df['latitude'] - latitude) < tolerance) &
-            (abs(df['longitude'] - longitude) < tolerance)
-        ]
+        idx = coordinate_index.find(latitude, longitude)
         
-        logger.debug(f"Found {len(matching_rows)} matching rows")
-        
-        if not matching_rows.empty:
+        if idx is not None:
             # Return the first matching property name
-            first_match = matching_rows.iloc[0]
-            property_name = first_match.get('project_name') or first_match.get('brand_name')
-            logger.debug(f"Found property name: {property_name}")
-            if property_name:
+            property_name = names[idx]
+            logger.debug("Found property name: %s", property_name)
+            if pd.notna(property_name) and property_name:
                 return property_name
         
         logger.debug("No matching property found in CSV")
         return "Unknown"
     except Exception as e:
         logger.error(f"Error looking up property in CSV: {e}")
-        return "Unknown"
\ No newline at end of file
+        return "Unknown"
+
+
+# Warm the property table at import so the first request does not pay the CSV parse
+try:
+    _load_property_table()
+except Exception as e:
+    logger.warning(f"Could not preload property CSV: {e}")
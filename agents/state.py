@@ -1,6 +1,26 @@
 """State definition for the business opportunity analysis workflow."""
 
-from typing import TypedDict, List, Dict, Any
+import operator
+from typing import Annotated, TypedDict, List, Dict, Any
+
+
+class BusinessRecord(TypedDict, total=False):
+    """Business entry as built by find_businesses_node; later nodes add more keys."""
+    
+    name: str
+    address: str
+    rating: float
+    reviews_count: int
+    price: str
+    type: str
+    data_id: str
+    latitude: float
+    longitude: float
+    position: Dict[str, Any]
+    gps_coordinates: Dict[str, Any]
+    is_chain: bool
+    distance: float
+
 
 class BusinessAnalysisState(TypedDict):
     """State that flows through the LangGraph workflow."""
@@ -15,11 +35,11 @@ class BusinessAnalysisState(TypedDict):
     longitude: float
     area_name: str
     property_name: str  # Full property/location name
-    nearby_businesses: List[Dict[str, Any]]
+    nearby_businesses: List[BusinessRecord]  # Replaced wholesale by chain_brand_node - no append reducer
     reviews_data: List[Dict[str, Any]]
     sentiment_analysis: Dict[str, Any]
     llm_recommendation: Dict[str, Any]
-    chain_brands: List[Dict[str, Any]]  # Now contains all businesses, not just chain brands
+    chain_brands: Annotated[List[Dict[str, Any]], operator.add]  # Now contains all businesses, not just chain brands
     nearby_amenities: Dict[str, List[Dict[str, Any]]]  # NEW: Nearby amenities by type
     chart_data: Dict[str, Any]  # NEW: Interactive chart data for visualization
     
@@ -27,7 +47,7 @@ class BusinessAnalysisState(TypedDict):
     extracted_filters: Dict[str, Any]  # Contains business types, location, coordinates
     
     # Scraped data (NEW)
-    scraped_data: List[Dict[str, Any]]  # Real-time web-scraped data
+    scraped_data: Annotated[List[Dict[str, Any]], operator.add]  # Real-time web-scraped data
     scraper_executed: bool
     
     # Query type
@@ -36,4 +56,4 @@ class BusinessAnalysisState(TypedDict):
     # Workflow metadata
     current_step: str
     error: str
-    messages: List[str]
\ No newline at end of file
+    messages: Annotated[List[str], operator.add]
\ No newline at end of file
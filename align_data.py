@@ -14,10 +14,10 @@ def create_aligned_datasets():
     demo_sample = demo_df.head(3)
     print(f"Using first 3 records for alignment")
     
-    # Extract coordinates from demographics data
+    # Extract coordinates from demographics data (only the Lat-Long column is needed,
+    # so iterate it directly instead of building a Series per row)
     coordinates = []
-    for idx, row in demo_sample.iterrows():
-        lat_long_str = row['Lat-Long']
+    for idx, lat_long_str in demo_sample['Lat-Long'].items():
         try:
             coords = lat_long_str.replace('"', '').strip()
             if ',' in coords:
@@ -2,7 +2,7 @@
 
 import os
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import sys
 
 # Add the current directory to Python path
@@ -19,19 +19,27 @@ except ImportError:
 try:
     from fastapi import FastAPI, HTTPException
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import FileResponse
+    from fastapi.middleware.gzip import GZipMiddleware
+    from fastapi.responses import FileResponse, ORJSONResponse
     from pydantic import BaseModel
     import uvicorn
 except ImportError as e:
     print(f"Required dependencies not installed: {e}")
-    print("Please install them with: pip install fastapi uvicorn python-dotenv pydantic")
+    print("Please install them with: pip install fastapi uvicorn python-dotenv pydantic orjson")
     sys.exit(1)
 
-# Import the analyze_property function
+# Import the analyze_property function and its result cache controls
 try:
-    from main import analyze_property
+    from main import analyze_property, analysis_cache_stats, invalidate_cached_analyses
 except ImportError as e:
     print(f"Warning: Could not import analyze_property: {e}")
+    
+    def analysis_cache_stats() -> Dict[str, int]:
+        return {"hits": 0, "misses": 0, "size": 0}
+    
+    def invalidate_cached_analyses(area_name: Optional[str] = None) -> int:
+        return 0
+    
     def analyze_property(business_query: str) -> Dict[str, Any]:
         # Mock implementation for testing
         return {
@@ -93,7 +101,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Business Location Advisor API",
     description="AI-Powered Market Analysis for Opening a Business",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson serializes large nested payloads much faster
 )
 
 # Add CORS middleware
@@ -105,6 +114,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (analysis payloads are large and compress well)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 
 # Request/Response models
 class AnalysisRequest(BaseModel):
@@ -117,6 +129,21 @@ class AnalysisResponse(BaseModel):
     error: str = ""
 
 
+# Fields returned by /api/analyze and their fallbacks when the workflow omits them
+_RESPONSE_DEFAULTS = {
+    "area_name": "Unknown",
+    "city": "Unknown",
+    "latitude": 0.0,
+    "longitude": 0.0,
+    "business_type": "Unknown",
+    "nearby_businesses": [],
+    "sentiment_analysis": {},
+    "chain_brands": [],
+    "nearby_amenities": {},
+    "llm_recommendation": {},
+}
+
+
 @app.get("/")
 async def root():
     """Serve the business_advisor.html file."""
@@ -163,30 +190,11 @@ async def analyze_business(request: AnalysisRequest):
                 error=result["error"]
             )
         
-        # Format response
-        response_data = {
-            "area_name": result.get("area_name", "Unknown"),
-            "city": result.get("city", "Unknown"),
-            "latitude": result.get("latitude", 0.0),
-            "longitude": result.get("longitude", 0.0),
-            "business_type": result.get("business_type", "Unknown"),
-            
-            # Market metrics
-            "nearby_businesses": result.get("nearby_businesses", []),
-            "competitors_count": len(result.get("nearby_businesses", [])),
-            
-            # Sentiment analysis
-            "sentiment_analysis": result.get("sentiment_analysis", {}),
-            
-            # Chain brands
-            "chain_brands": result.get("chain_brands", []),
-            
-            # Amenities
-            "nearby_amenities": result.get("nearby_amenities", {}),
-            
-            # LLM recommendations
-            "llm_recommendation": result.get("llm_recommendation", {}),
-        }
+        # Format response: state values override the defaults for every response field
+        response_data = {**_RESPONSE_DEFAULTS, **{k: result[k] for k in _RESPONSE_DEFAULTS.keys() & result.keys()}}
+        
+        # Market metrics
+        response_data["competitors_count"] = len(response_data["nearby_businesses"])
         
         logger.info(f"Analysis completed successfully for: {request.query}")
         
@@ -208,14 +216,32 @@ async def get_status():
     return {
         "status": "running",
         "version": "1.0.0",
+        "analysis_cache": analysis_cache_stats(),
         "endpoints": {
             "analyze": "/api/analyze",
             "health": "/health",
-            "status": "/api/status"
+            "status": "/api/status",
+            "cache": "/api/cache"
         }
     }
 
 
+@app.delete("/api/cache")
+async def clear_analysis_cache(area_name: Optional[str] = None):
+    """
+    Evict cached analyses, e.g. after the data for an area was refreshed.
+    
+    Args:
+        area_name: Only evict analyses of this area; all if omitted
+        
+    Returns:
+        Number of evicted analyses
+    """
+    evicted = invalidate_cached_analyses(area_name)
+    logger.info(f"Evicted {evicted} cached analyses" + (f" for {area_name}" if area_name else ""))
+    return {"evicted": evicted}
+
+
 def start_server(host: str = "0.0.0.0", port: int = 8001, reload: bool = False):
     """
     Start the FastAPI server with Uvicorn.
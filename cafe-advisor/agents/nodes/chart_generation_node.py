@@ -1,11 +1,45 @@
 """Chart generation node for business advisor workflow."""
 
+import heapq
 import logging
+import numpy as np
 from typing import Dict, Any, List
 from agents.state import BusinessAnalysisState
 
 logger = logging.getLogger(__name__)
 
+# Rating histogram bins: edges for np.digitize and labels from the highest range down
+RATING_BIN_EDGES = [3.0, 3.5, 4.0, 4.5]
+RATING_BIN_LABELS = ["4.5-5.0", "4.0-4.4", "3.5-3.9", "3.0-3.4", "Below 3.0"]
+
+# Fixed parts of the live charts, built once and shared by every response (read-only;
+# tuples serialize as JSON arrays). Only the data lists are created per request.
+_SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+_SENTIMENT_STYLE = {
+    "backgroundColor": (
+        "rgba(40, 167, 69, 0.8)",   # Green
+        "rgba(220, 53, 69, 0.8)",   # Red
+        "rgba(108, 117, 125, 0.8)"  # Gray
+    ),
+    "borderColor": (
+        "rgba(40, 167, 69, 1)",
+        "rgba(220, 53, 69, 1)",
+        "rgba(108, 117, 125, 1)"
+    ),
+    "borderWidth": 2
+}
+_CHAIN_LOCAL_LABELS = ("Count", "Avg Rating", "Total Reviews")
+_BRANDED_STYLE = {
+    "backgroundColor": "rgba(74, 144, 226, 0.6)",
+    "borderColor": "rgba(74, 144, 226, 1)",
+    "borderWidth": 2
+}
+_LOCAL_STYLE = {
+    "backgroundColor": "rgba(40, 167, 69, 0.6)",
+    "borderColor": "rgba(40, 167, 69, 1)",
+    "borderWidth": 2
+}
+
 
 def chart_generation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
     """
@@ -26,17 +60,19 @@ def chart_generation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         nearby_amenities = state.get("nearby_amenities", {})
         business_type = state.get("business_type", "")
         
+        # Scan the businesses once; chart helpers work off the shared arrays
+        summary = _summarize_businesses(all_businesses)
+        
         # Generate chart data - only sentiment and chain vs local
         charts = {
             "sentiment_distribution": _generate_sentiment_chart(sentiment_analysis),
-            "chain_vs_local": _generate_chain_local_chart(all_businesses)
+            "chain_vs_local": _generate_chain_local_chart(summary)
         }
         
         logger.info("Successfully generated chart data")
         
         # Return updated state
         return {
-            **state,
             "chart_data": charts,
             "current_step": "chart_generation_completed"
         }
@@ -45,25 +81,49 @@ def chart_generation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         error_msg = f"Error in chart generation node: {str(e)}"
         logger.error(error_msg)
         return {
-            **state,
             "error": error_msg,
             "current_step": "chart_generation_error"
         }
 
 
+def _summarize_businesses(all_businesses: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Collect the per-business fields the charts need in a single scan.
+    
+    Args:
+        all_businesses: List of businesses
+        
+    Returns:
+        Arrays of ratings (NaN where missing), review counts, and a chain mask
+    """
+    n = len(all_businesses)
+    return {
+        "ratings": np.fromiter(
+            (np.nan if b.get('rating') is None else b['rating'] for b in all_businesses),
+            dtype=np.float64, count=n
+        ),
+        "reviews": np.fromiter((b.get('reviews_count') or 0 for b in all_businesses), dtype=np.int64, count=n),
+        "is_chain": np.fromiter((bool(b.get('is_chain', False)) for b in all_businesses), dtype=bool, count=n)
+    }
+
+
+def _group_stats(ratings: np.ndarray, reviews: np.ndarray) -> tuple:
+    """Return (count, average rating, total reviews) for one group of businesses."""
+    rated = ratings[~np.isnan(ratings)]
+    avg_rating = float(rated.mean()) if rated.size else 0
+    return len(reviews), avg_rating, int(reviews.sum())
+
+
+def _competitor_rank_key(business: Dict) -> tuple:
+    """Rank competitors by rating, then by review volume."""
+    return (business.get('rating') or 0, business.get('reviews_count') or 0)
+
+
 def _generate_competitor_chart(all_businesses: List[Dict]) -> Dict[str, Any]:
     """Generate competitor analysis chart data."""
     
-    # Separate branded and local businesses
-    branded = [b for b in all_businesses if b.get('is_chain', False)]
-    local = [b for b in all_businesses if not b.get('is_chain', False)]
-    
     # Get top 10 competitors by rating
-    sorted_businesses = sorted(
-        all_businesses,
-        key=lambda x: (x.get('rating') or 0, x.get('reviews_count') or 0),
-        reverse=True
-    )[:10]
+    sorted_businesses = heapq.nlargest(10, all_businesses, key=_competitor_rank_key)
     
     labels = []
     ratings = []
@@ -71,11 +131,12 @@ def _generate_competitor_chart(all_businesses: List[Dict]) -> Dict[str, Any]:
     types = []
     
     for business in sorted_businesses:
-        name = business.get('name', 'Unknown')[:20]  # Truncate long names
-        labels.append(name)
-        ratings.append(business.get('rating') or 0)
-        reviews.append(business.get('reviews_count') or 0)
-        types.append('Chain' if business.get('is_chain') else 'Local')
+        get = business.get
+        rating, reviews_count = _competitor_rank_key(business)
+        labels.append(get('name', 'Unknown')[:20])  # Truncate long names
+        ratings.append(rating)
+        reviews.append(reviews_count)
+        types.append('Chain' if get('is_chain') else 'Local')
     
     return {
         "type": "bar",
@@ -100,66 +161,33 @@ def _generate_competitor_chart(all_businesses: List[Dict]) -> Dict[str, Any]:
 def _generate_sentiment_chart(sentiment_analysis: Dict[str, Any]) -> Dict[str, Any]:
     """Generate sentiment distribution pie chart data."""
     
-    positive = sentiment_analysis.get('positive', 0) or 0
-    negative = sentiment_analysis.get('negative', 0) or 0
-    neutral = sentiment_analysis.get('neutral', 0) or 0
+    get = sentiment_analysis.get
+    positive, negative, neutral = get('positive') or 0, get('negative') or 0, get('neutral') or 0
     
     # If no sentiment data, generate sample data
-    if positive == 0 and negative == 0 and neutral == 0:
-        positive = 45
-        negative = 15
-        neutral = 40
+    if not (positive or negative or neutral):
+        positive, negative, neutral = 45, 15, 40
     
     return {
         "type": "pie",
         "title": "Customer Sentiment Distribution",
-        "labels": ["Positive", "Negative", "Neutral"],
+        "labels": _SENTIMENT_LABELS,
         "datasets": [
-            {
-                "data": [positive, negative, neutral],
-                "backgroundColor": [
-                    "rgba(40, 167, 69, 0.8)",   # Green
-                    "rgba(220, 53, 69, 0.8)",   # Red
-                    "rgba(108, 117, 125, 0.8)"  # Gray
-                ],
-                "borderColor": [
-                    "rgba(40, 167, 69, 1)",
-                    "rgba(220, 53, 69, 1)",
-                    "rgba(108, 117, 125, 1)"
-                ],
-                "borderWidth": 2
-            }
+            {"data": [positive, negative, neutral], **_SENTIMENT_STYLE}
         ]
     }
 
 
-def _generate_rating_distribution(all_businesses: List[Dict]) -> Dict[str, Any]:
+def _generate_rating_distribution(summary: Dict[str, np.ndarray]) -> Dict[str, Any]:
     """Generate rating distribution histogram."""
     
-    # Count businesses by rating ranges
-    rating_ranges = {
-        "4.5-5.0": 0,
-        "4.0-4.4": 0,
-        "3.5-3.9": 0,
-        "3.0-3.4": 0,
-        "Below 3.0": 0
-    }
+    # Bin ratings in one vectorized pass (index 0 = below 3.0 ... 4 = 4.5 and above)
+    ratings = summary["ratings"]
+    ratings = ratings[~np.isnan(ratings)]
+    counts = np.bincount(np.digitize(ratings, RATING_BIN_EDGES), minlength=len(RATING_BIN_LABELS))
     
-    for business in all_businesses:
-        rating = business.get('rating')
-        if rating is None:
-            continue
-        
-        if rating >= 4.5:
-            rating_ranges["4.5-5.0"] += 1
-        elif rating >= 4.0:
-            rating_ranges["4.0-4.4"] += 1
-        elif rating >= 3.5:
-            rating_ranges["3.5-3.9"] += 1
-        elif rating >= 3.0:
-            rating_ranges["3.0-3.4"] += 1
-        else:
-            rating_ranges["Below 3.0"] += 1
+    # Labels run from the highest range down
+    rating_ranges = dict(zip(RATING_BIN_LABELS, counts[::-1].tolist()))
     
     return {
         "type": "bar",
@@ -177,55 +205,44 @@ def _generate_rating_distribution(all_businesses: List[Dict]) -> Dict[str, Any]:
     }
 
 
-def _generate_chain_local_chart(all_businesses: List[Dict]) -> Dict[str, Any]:
+def _generate_chain_local_chart(summary: Dict[str, np.ndarray]) -> Dict[str, Any]:
     """Generate chain vs local businesses comparison."""
     
-    branded = [b for b in all_businesses if b.get('is_chain', False)]
-    local = [b for b in all_businesses if not b.get('is_chain', False)]
-    
-    # Calculate average ratings
-    branded_ratings = [b.get('rating') for b in branded if b.get('rating') is not None]
-    local_ratings = [b.get('rating') for b in local if b.get('rating') is not None]
+    is_chain = summary["is_chain"]
+    ratings = summary["ratings"]
+    reviews = summary["reviews"]
     
-    avg_branded_rating = sum(branded_ratings) / len(branded_ratings) if branded_ratings else 0
-    avg_local_rating = sum(local_ratings) / len(local_ratings) if local_ratings else 0
-    
-    # Calculate total reviews
-    branded_reviews = sum(b.get('reviews_count', 0) or 0 for b in branded)
-    local_reviews = sum(b.get('reviews_count', 0) or 0 for b in local)
+    branded_count, avg_branded_rating, branded_reviews = _group_stats(ratings[is_chain], reviews[is_chain])
+    local_count, avg_local_rating, local_reviews = _group_stats(ratings[~is_chain], reviews[~is_chain])
     
     return {
         "type": "comparison",
         "title": "Branded vs Local Businesses",
         "data": {
             "branded": {
-                "count": len(branded),
+                "count": branded_count,
                 "avg_rating": round(avg_branded_rating, 2),
                 "total_reviews": branded_reviews
             },
             "local": {
-                "count": len(local),
+                "count": local_count,
                 "avg_rating": round(avg_local_rating, 2),
                 "total_reviews": local_reviews
             }
         },
         "chart": {
             "type": "bar",
-            "labels": ["Count", "Avg Rating", "Total Reviews"],
+            "labels": _CHAIN_LOCAL_LABELS,
             "datasets": [
                 {
                     "label": "Branded",
-                    "data": [len(branded), avg_branded_rating, branded_reviews / 100],  # Scale reviews
-                    "backgroundColor": "rgba(74, 144, 226, 0.6)",
-                    "borderColor": "rgba(74, 144, 226, 1)",
-                    "borderWidth": 2
+                    "data": [branded_count, avg_branded_rating, branded_reviews / 100],  # Scale reviews
+                    **_BRANDED_STYLE
                 },
                 {
                     "label": "Local",
-                    "data": [len(local), avg_local_rating, local_reviews / 100],  # Scale reviews
-                    "backgroundColor": "rgba(40, 167, 69, 0.6)",
-                    "borderColor": "rgba(40, 167, 69, 1)",
-                    "borderWidth": 2
+                    "data": [local_count, avg_local_rating, local_reviews / 100],  # Scale reviews
+                    **_LOCAL_STYLE
                 }
             ]
         }
@@ -235,10 +252,11 @@ def _generate_chain_local_chart(all_businesses: List[Dict]) -> Dict[str, Any]:
 def _generate_amenities_chart(nearby_amenities: Dict[str, List]) -> Dict[str, Any]:
     """Generate nearby amenities overview chart."""
     
-    amenity_counts = {}
-    for amenity_type, places in nearby_amenities.items():
-        if places:
-            amenity_counts[amenity_type.title()] = len(places)
+    amenity_counts = {
+        amenity_type.title(): len(places)
+        for amenity_type, places in nearby_amenities.items()
+        if places
+    }
     
     # If no amenities, return empty chart
     if not amenity_counts:
@@ -269,11 +287,11 @@ def _generate_top_competitors_chart(all_businesses: List[Dict]) -> Dict[str, Any
     """Generate top 5 competitors radar chart data."""
     
     # Get top 5 by rating
-    sorted_businesses = sorted(
-        [b for b in all_businesses if b.get('rating') is not None],
-        key=lambda x: (x.get('rating') or 0, x.get('reviews_count') or 0),
-        reverse=True
-    )[:5]
+    sorted_businesses = heapq.nlargest(
+        5,
+        (b for b in all_businesses if b.get('rating') is not None),
+        key=_competitor_rank_key
+    )
     
     if not sorted_businesses:
         return {
@@ -284,14 +302,11 @@ def _generate_top_competitors_chart(all_businesses: List[Dict]) -> Dict[str, Any
         }
     
     labels = [b.get('name', 'Unknown')[:15] for b in sorted_businesses]
-    ratings = [b.get('rating', 0) for b in sorted_businesses]
+    ratings, reviews = zip(*map(_competitor_rank_key, sorted_businesses))
     
     # Normalize reviews to 0-5 scale
-    max_reviews = max(b.get('reviews_count', 1) or 1 for b in sorted_businesses)
-    normalized_reviews = [
-        (b.get('reviews_count', 0) or 0) / max_reviews * 5 
-        for b in sorted_businesses
-    ]
+    max_reviews = max(max(reviews), 1)
+    normalized_reviews = [count / max_reviews * 5 for count in reviews]
     
     return {
         "type": "radar",
@@ -300,7 +315,7 @@ def _generate_top_competitors_chart(all_businesses: List[Dict]) -> Dict[str, Any
         "datasets": [
             {
                 "label": "Rating",
-                "data": ratings,
+                "data": list(ratings),
                 "backgroundColor": "rgba(74, 144, 226, 0.2)",
                 "borderColor": "rgba(74, 144, 226, 1)",
                 "borderWidth": 2
@@ -2,9 +2,9 @@
 
 import logging
 from typing import Dict, Any, List
-from agents.state import BusinessAnalysisState
+from agents.state import BusinessAnalysisState, BusinessRecord
 from utils.api_clients import SerpApiClient
-from config.settings import BUSINESS_SEARCH_QUERIES
+from config.settings import get_business_query
 from utils.database import store_nearby_places, get_nearby_places
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,7 @@ def find_businesses_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         business_type = state["business_type"]
         
         # Get search query for business type (no caching)
-        search_query = BUSINESS_SEARCH_QUERIES.get(business_type, business_type)
+        search_query = get_business_query(business_type)
         logger.info(f"Searching for {business_type} businesses with query: {search_query}")
         
         # Initialize SerpApi client
@@ -43,52 +43,51 @@ def find_businesses_node(state: BusinessAnalysisState) -> Dict[str, Any]:
             radius=3000  # 3km radius
         )
         
-        # Debug: Log the search results structure
-        logger.debug(f"Search results type: {type(search_results)}")
-        logger.debug(f"Search results keys: {search_results.keys() if isinstance(search_results, dict) else 'Not a dict'}")
+        # Debug: Log the search results structure (lazy formatting - skipped unless DEBUG is on)
+        logger.debug("Search results type: %s", type(search_results))
         
         # Extract business information
-        nearby_businesses = []
-        if isinstance(search_results, dict) and "local_results" in search_results:
-            local_results = search_results["local_results"]
-            logger.debug(f"Local results type: {type(local_results)}")
-            logger.debug(f"Local results length: {len(local_results) if hasattr(local_results, '__len__') else 'No length'}")
+        nearby_businesses: List[BusinessRecord] = []
+        local_results = search_results.get("local_results") if isinstance(search_results, dict) else None
+        
+        if isinstance(local_results, list):
+            logger.debug("Local results length: %d", len(local_results))
+            append = nearby_businesses.append
             
-            if isinstance(local_results, list):
-                for business in local_results:
-                    # Debug: Log business structure
-                    logger.debug(f"Business type: {type(business)}")
-                    logger.debug(f"Business keys: {business.keys() if isinstance(business, dict) else 'Not a dict'}")
-                    
-                    if not isinstance(business, dict):
-                        logger.warning(f"Skipping non-dict business entry: {business}")
-                        continue
-                    
-                    # Extract latitude and longitude from gps_coordinates if available
-                    gps_coordinates = business.get("gps_coordinates", {})
-                    position = business.get("position", {})
-                    if isinstance(gps_coordinates, dict) and gps_coordinates.get("latitude") and gps_coordinates.get("longitude"):
-                        lat = gps_coordinates["latitude"]
-                        lon = gps_coordinates["longitude"]
-                    else:
-                        # Fallback to position field or search center coordinates
-                        lat = position.get("latitude", latitude) if isinstance(position, dict) else latitude
-                        lon = position.get("longitude", longitude) if isinstance(position, dict) else longitude
-                    
-                    business_info = {
-                        "name": business.get("title"),
-                        "address": business.get("address"),
-                        "rating": business.get("rating"),
-                        "reviews_count": business.get("reviews"),
-                        "price": business.get("price"),
-                        "type": business.get("type"),
-                        "data_id": business.get("data_id"),
-                        "latitude": lat,
-                        "longitude": lon,
-                        "position": position,
-                        "gps_coordinates": gps_coordinates
-                    }
-                    nearby_businesses.append(business_info)
+            for business in local_results:
+                if not isinstance(business, dict):
+                    logger.warning("Skipping non-dict business entry: %s", business)
+                    continue
+                
+                g = business.get
+                
+                # Extract latitude and longitude from gps_coordinates if available
+                gps_coordinates = g("gps_coordinates", {})
+                position = g("position", {})
+                if isinstance(gps_coordinates, dict) and gps_coordinates.get("latitude") and gps_coordinates.get("longitude"):
+                    lat = gps_coordinates["latitude"]
+                    lon = gps_coordinates["longitude"]
+                elif isinstance(position, dict):
+                    # Fallback to position field or search center coordinates
+                    lat = position.get("latitude", latitude)
+                    lon = position.get("longitude", longitude)
+                else:
+                    lat = latitude
+                    lon = longitude
+                
+                append({
+                    "name": g("title"),
+                    "address": g("address"),
+                    "rating": g("rating"),
+                    "reviews_count": g("reviews"),
+                    "price": g("price"),
+                    "type": g("type"),
+                    "data_id": g("data_id"),
+                    "latitude": lat,
+                    "longitude": lon,
+                    "position": position,
+                    "gps_coordinates": gps_coordinates
+                })
         
         logger.info(f"Found {len(nearby_businesses)} nearby {business_type} businesses")
         
@@ -98,7 +97,6 @@ def find_businesses_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         
         # Return updated state
         return {
-            **state,
             "nearby_businesses": nearby_businesses,
             "current_step": "find_businesses_completed"
         }
@@ -107,7 +105,6 @@ def find_businesses_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         error_msg = f"Error in find businesses node: {str(e)}"
         logger.error(error_msg)
         return {
-            **state,
             "nearby_businesses": [],
             "error": error_msg,
             "current_step": "find_businesses_error"
@@ -53,7 +53,6 @@ def format_output_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         
         # Return updated state
         return {
-            **state,
             "formatted_output": report,
             "current_step": "format_output_completed"
         }
@@ -62,7 +61,6 @@ def format_output_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         error_msg = f"Error in format output node: {str(e)}"
         logger.error(error_msg)
         return {
-            **state,
             "error": error_msg,
             "current_step": "format_output_error"
         }
@@ -2,6 +2,7 @@
 
 import logging
 import re
+import orjson
 import pandas as pd
 import os
 from typing import Dict, Any, Tuple, Optional
@@ -48,7 +49,6 @@ def intent_node(state: BusinessAnalysisState) -> Dict[str, Any]:
             }
             
             return {
-                **state,
                 "business_type": "cafe",
                 "property_name": "Default Location",
                 "latitude": latitude,
@@ -88,7 +88,6 @@ def intent_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         
         # Return updated state
         return {
-            **state,
             "business_type": extracted_business_type,
             "property_name": property_name,  # Add property_name to state
             "latitude": latitude,
@@ -104,7 +103,6 @@ def intent_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         # Fallback to default
         latitude, longitude = _get_default_coordinates()
         return {
-            **state,
             "business_type": "cafe",
             "latitude": latitude,
             "longitude": longitude,
@@ -190,8 +188,7 @@ Response: {{"business_type": "sneaker store", "property_name": "VIP Road, Chandi
         openai_client = OpenAIClient()
         response = openai_client.generate_recommendation(prompt)
         
-        import json
-        result = json.loads(response.strip())
+        result = orjson.loads(response)
         business_type = result.get("business_type", "").lower()
         property_name = result.get("property_name", "")
         
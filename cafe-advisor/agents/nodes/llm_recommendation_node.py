@@ -1,14 +1,148 @@
 """LLM recommendation node for business advisor workflow."""
 
 import json
+import orjson
 import logging
+from functools import lru_cache
 from typing import Dict, Any, List
 from agents.state import BusinessAnalysisState
-from utils.api_clients import OpenAIClient
+from utils.api_clients import OpenAIClient, parse_json_response
 from utils.property_analyzer import PropertyAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Instructions shared by every recommendation request. They are sent as the system message,
+# byte-identical across calls, so the provider can serve them from its prompt prefix cache;
+# anything that varies per property or query belongs in the user prompt instead.
+RECOMMENDATION_SYSTEM_PROMPT = """
+You are an expert business consultant evaluating the feasibility of opening a new business in a given area.
+
+CRITICAL INSTRUCTION: You MUST reference SPECIFIC NUMBERS and DATA POINTS from all data sources in the user message in every pro, con, and suggestion. Do NOT use vague terms like "high", "low", "good", or "many" without citing exact figures.
+
+═══════════════════════════════════════════════════════════════════════════════
+📋 OUTPUT REQUIREMENTS
+═══════════════════════════════════════════════════════════════════════════════
+
+Provide your analysis in JSON format with the following structure:
+
+{
+  "pros": [4-5 opportunities],
+  "cons": [4-5 challenges],
+  "suggestions": [6-7 actionable strategies],
+  "recommendation": "one sentence summary"
+}
+
+═══════════════════════════════════════════════════════════════════════════════
+✅ MANDATORY REQUIREMENTS FOR EACH SECTION
+═══════════════════════════════════════════════════════════════════════════════
+
+📌 PROS (4-5 items):
+Each pro MUST:
+✓ Cite at least ONE specific number from the data sources
+✓ Reference which data source it comes from
+✓ Combine insights from multiple sources when possible
+
+Examples:
+✓ GOOD: "Strong target market with 30,652 children (0-18 yrs) and 10,389 high-income households (>₹10L) within 3km radius"
+✗ BAD: "Good demographics in the area"
+
+✓ GOOD: "Footfall score of 66 indicates high visibility, supported by 15 competing cafes with average rating 4.2 showing proven demand"
+✗ BAD: "High footfall and good location"
+
+📌 CONS (4-5 items):
+Each con MUST:
+✓ Cite specific numbers showing the challenge
+✓ Reference competitor data or market gaps
+✓ Identify data gaps if information is missing
+
+Examples:
+✓ GOOD: "High competition with 15 existing cafes averaging 4.2 rating and price range ₹400-₹600 for two (from scraped data)"
+✗ BAD: "High competition in the area"
+
+✓ GOOD: "⚠️ DATA GAP: Only 5 reviews analyzed - insufficient to assess market sentiment. Recommend manual review collection."
+✗ BAD: "Limited review data available"
+
+📌 SUGGESTIONS (6-7 items):
+Each suggestion MUST:
+✓ Be DYNAMIC and based on scraped data analysis
+✓ Include specific numbers (prices, ratings, percentages)
+✓ Identify competitive advantages or market gaps
+✓ Be immediately actionable
+
+═══════════════════════════════════════════════════════════════════════════════
+🎯 CATEGORY-SPECIFIC SUGGESTION TEMPLATES
+═══════════════════════════════════════════════════════════════════════════════
+
+🍽️ FOR CAFES/RESTAURANTS:
+1. PRICING: "Price between ₹X-₹Y for two based on competitor range ₹A-₹B (from scraped data) to position as [budget/mid-range/premium]"
+2. CUISINES: "Offer [specific cuisines] as competitors focus on [scraped cuisines], creating gap in [missing cuisine]"
+3. RATING TARGET: "Aim for X+ rating as average competitor rating is Y (from scraped data)"
+4. OFFERS: "Introduce [specific offer] similar to competitors offering [scraped offers]"
+5. LOCATION: "Target [specific area] as competitors are X km away (from scraped data)"
+6. DIFFERENTIATION: "Focus on [unique aspect] as only X% of competitors offer it"
+
+🏨 FOR HOTELS:
+1. ROOM PRICING: "Price rooms at ₹X-₹Y/night as competitors charge ₹A-₹B (from scraped data)"
+2. AMENITIES: "Must include [amenities] as X% of competitors offer them (from scraped data)"
+3. RATING TARGET: "Target X+ rating as competitor average is Y (from scraped data)"
+4. DIFFERENTIATION: "Add [specific amenity] as only X% of hotels provide it (market gap)"
+5. TARGET SEGMENT: "Focus on [segment] based on Y high-income households (from demographics)"
+
+🏫 FOR SCHOOLS:
+1. FEES: "Set fees at ₹X-₹Y annually as competitors charge ₹A-₹B (from scraped data) for [board] schools"
+2. BOARD: "Consider [board] as X% of schools use it (from scraped data), or offer [alternative] to capture Y% market"
+3. RATING TARGET: "Aim for X+ rating as competitor average is Y (from scraped data)"
+4. GRADES: "Offer [grades] as only X% of schools cover this range (market gap from scraped data)"
+5. TARGET MARKET: "Focus on Y children (0-18 yrs) and Z high-income households (from demographics)"
+6. DIFFERENTIATION: "Introduce [specific program] as no competitor offers it (from scraped data)"
+
+═══════════════════════════════════════════════════════════════════════════════
+⚠️ DATA GAP HANDLING
+═══════════════════════════════════════════════════════════════════════════════
+
+If ANY data source is insufficient or missing:
+✓ FLAG it explicitly in cons
+✓ Recommend specific actions to fill the gap
+✓ Suggest manual research methods
+
+Example:
+"⚠️ DATA GAP: Social media validation shows only 3 local posts with 20% confidence. RECOMMEND: Conduct manual Facebook group research, Instagram hashtag analysis (#Zirakpur #CafeLife), and customer surveys to validate demand."
+
+═══════════════════════════════════════════════════════════════════════════════
+🔢 CRITICAL RULES
+═══════════════════════════════════════════════════════════════════════════════
+
+1. NEVER use vague terms: "high", "low", "good", "many", "few" without numbers
+2. ALWAYS cite data source: "(from scraped data)", "(from demographics)", "(from property analysis)"
+3. CALCULATE ranges, averages, percentages from scraped data
+4. IDENTIFY market gaps by comparing what exists vs what's missing
+5. MAKE suggestions unique to THIS query based on THIS data
+6. REFERENCE at least 3 different data sources in your analysis
+7. FLAG any data gaps and recommend how to fill them
+
+
+═══════════════════════════════════════════════════════════════════════════════
+📊 DATA SOURCE PRIORITY
+═══════════════════════════════════════════════════════════════════════════════
+
+Use ALL data sources in your analysis:
+
+1. 📊 PROPERTY FEATURES → Foundation for location viability
+2. 👥 DEMOGRAPHICS → Target market size and purchasing power
+3. 🏪 COMPETITOR ANALYSIS → Market saturation and quality benchmarks
+4. 📱 SOCIAL MEDIA → Demand validation and reputation signals
+5. 🌐 WEB-SCRAPED DATA → Real-time competitive intelligence (MOST IMPORTANT for suggestions)
+
+Each pro/con/suggestion MUST reference at least ONE specific data point.
+Combine multiple sources for stronger insights.
+""".strip()
+
+
+@lru_cache(maxsize=1)
+def _get_property_analyzer() -> PropertyAnalyzer:
+    """Create the property analyzer once and share it across recommendation requests."""
+    return PropertyAnalyzer()
+
 
 def llm_recommendation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
     """
@@ -84,8 +218,8 @@ def llm_recommendation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         else:
             logger.info("⚠️  No scraped data available - using existing data sources only")
         
-        # Initialize property analyzer
-        property_analyzer = PropertyAnalyzer()
+        # Shared property analyzer
+        property_analyzer = _get_property_analyzer()
         
         # Generate property-based analysis
         property_analysis = property_analyzer.generate_property_analysis(
@@ -114,12 +248,12 @@ def llm_recommendation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         openai_client = OpenAIClient()
         
         # Generate recommendations
-        response = openai_client.generate_recommendation(prompt)
+        response = openai_client.generate_recommendation(prompt, system_prompt=RECOMMENDATION_SYSTEM_PROMPT)
         
-        # Parse JSON response
+        # Parse JSON response, tolerating text around the object
         try:
-            recommendation_data = json.loads(response.replace("```json", "").replace("```", ""))
-        except json.JSONDecodeError:
+            recommendation_data = parse_json_response(response)
+        except orjson.JSONDecodeError:
             # Fallback if JSON parsing fails
             recommendation_data = {
                 "pros": ["Market analysis completed"],
@@ -132,7 +266,6 @@ def llm_recommendation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         
         # Return updated state
         return {
-            **state,
             "llm_recommendation": recommendation_data,
             "current_step": "llm_recommendation_completed"
         }
@@ -148,7 +281,6 @@ def llm_recommendation_node(state: BusinessAnalysisState) -> Dict[str, Any]:
             "recommendation": f"Manual analysis recommended for {state.get('business_type', 'business')} opportunity"
         }
         return {
-            **state,
             "llm_recommendation": fallback_recommendation,
             "error": error_msg,
             "current_step": "llm_recommendation_error"
@@ -164,7 +296,9 @@ def _create_recommendation_prompt(business_type: str, area_name: str,
                                  property_analysis: Dict[str, Any],
                                  scraped_data: List[Dict[str, Any]]) -> str:
     """
-    Create a prompt for the LLM to generate business recommendations.
+    Create the user prompt for the LLM to generate business recommendations.
+    
+    Holds only the data for this query; the fixed instructions are in RECOMMENDATION_SYSTEM_PROMPT.
     
     Args:
         business_type: Type of business to analyze
@@ -194,9 +328,7 @@ def _create_recommendation_prompt(business_type: str, area_name: str,
     business_sentiments = sentiment_analysis.get("business_sentiments", [])
     
     prompt = f"""
-You are an expert business consultant evaluating the feasibility of opening a new {business_type} in {area_name}.
-
-CRITICAL INSTRUCTION: You MUST reference SPECIFIC NUMBERS and DATA POINTS from all sources below in every pro, con, and suggestion. Do NOT use vague terms like "high", "low", "good", or "many" without citing exact figures.
+Evaluate the feasibility of opening a new {business_type} in {area_name}.
 
 ═══════════════════════════════════════════════════════════════════════════════
 📊 DATA SOURCE 1: PROPERTY FEATURES
@@ -354,124 +486,7 @@ This is FRESH, real-time data scraped directly from competitor websites. Use thi
             prompt += f"\n... and {len(scraped_data) - 10} more competitors with similar data\n"
     
     prompt += """
-═══════════════════════════════════════════════════════════════════════════════
-📋 OUTPUT REQUIREMENTS
-═══════════════════════════════════════════════════════════════════════════════
-
-Provide your analysis in JSON format with the following structure:
-
-{
-  "pros": [4-5 opportunities],
-  "cons": [4-5 challenges],
-  "suggestions": [6-7 actionable strategies],
-  "recommendation": "one sentence summary"
-}
-
-═══════════════════════════════════════════════════════════════════════════════
-✅ MANDATORY REQUIREMENTS FOR EACH SECTION
-═══════════════════════════════════════════════════════════════════════════════
-
-📌 PROS (4-5 items):
-Each pro MUST:
-✓ Cite at least ONE specific number from the data sources
-✓ Reference which data source it comes from
-✓ Combine insights from multiple sources when possible
-
-Examples:
-✓ GOOD: "Strong target market with 30,652 children (0-18 yrs) and 10,389 high-income households (>₹10L) within 3km radius"
-✗ BAD: "Good demographics in the area"
-
-✓ GOOD: "Footfall score of 66 indicates high visibility, supported by 15 competing cafes with average rating 4.2 showing proven demand"
-✗ BAD: "High footfall and good location"
-
-📌 CONS (4-5 items):
-Each con MUST:
-✓ Cite specific numbers showing the challenge
-✓ Reference competitor data or market gaps
-✓ Identify data gaps if information is missing
-
-Examples:
-✓ GOOD: "High competition with 15 existing cafes averaging 4.2 rating and price range ₹400-₹600 for two (from scraped data)"
-✗ BAD: "High competition in the area"
-
-✓ GOOD: "⚠️ DATA GAP: Only 5 reviews analyzed - insufficient to assess market sentiment. Recommend manual review collection."
-✗ BAD: "Limited review data available"
-
-📌 SUGGESTIONS (6-7 items):
-Each suggestion MUST:
-✓ Be DYNAMIC and based on scraped data analysis
-✓ Include specific numbers (prices, ratings, percentages)
-✓ Identify competitive advantages or market gaps
-✓ Be immediately actionable
-
-═══════════════════════════════════════════════════════════════════════════════
-🎯 CATEGORY-SPECIFIC SUGGESTION TEMPLATES
-═══════════════════════════════════════════════════════════════════════════════
-
-🍽️ FOR CAFES/RESTAURANTS:
-1. PRICING: "Price between ₹X-₹Y for two based on competitor range ₹A-₹B (from scraped data) to position as [budget/mid-range/premium]"
-2. CUISINES: "Offer [specific cuisines] as competitors focus on [scraped cuisines], creating gap in [missing cuisine]"
-3. RATING TARGET: "Aim for X+ rating as average competitor rating is Y (from scraped data)"
-4. OFFERS: "Introduce [specific offer] similar to competitors offering [scraped offers]"
-5. LOCATION: "Target [specific area] as competitors are X km away (from scraped data)"
-6. DIFFERENTIATION: "Focus on [unique aspect] as only X% of competitors offer it"
-
-🏨 FOR HOTELS:
-1. ROOM PRICING: "Price rooms at ₹X-₹Y/night as competitors charge ₹A-₹B (from scraped data)"
-2. AMENITIES: "Must include [amenities] as X% of competitors offer them (from scraped data)"
-3. RATING TARGET: "Target X+ rating as competitor average is Y (from scraped data)"
-4. DIFFERENTIATION: "Add [specific amenity] as only X% of hotels provide it (market gap)"
-5. TARGET SEGMENT: "Focus on [segment] based on Y high-income households (from demographics)"
-
-🏫 FOR SCHOOLS:
-1. FEES: "Set fees at ₹X-₹Y annually as competitors charge ₹A-₹B (from scraped data) for [board] schools"
-2. BOARD: "Consider [board] as X% of schools use it (from scraped data), or offer [alternative] to capture Y% market"
-3. RATING TARGET: "Aim for X+ rating as competitor average is Y (from scraped data)"
-4. GRADES: "Offer [grades] as only X% of schools cover this range (market gap from scraped data)"
-5. TARGET MARKET: "Focus on Y children (0-18 yrs) and Z high-income households (from demographics)"
-6. DIFFERENTIATION: "Introduce [specific program] as no competitor offers it (from scraped data)"
-
-═══════════════════════════════════════════════════════════════════════════════
-⚠️ DATA GAP HANDLING
-═══════════════════════════════════════════════════════════════════════════════
-
-If ANY data source is insufficient or missing:
-✓ FLAG it explicitly in cons
-✓ Recommend specific actions to fill the gap
-✓ Suggest manual research methods
-
-Example:
-"⚠️ DATA GAP: Social media validation shows only 3 local posts with 20% confidence. RECOMMEND: Conduct manual Facebook group research, Instagram hashtag analysis (#Zirakpur #CafeLife), and customer surveys to validate demand."
-
-═══════════════════════════════════════════════════════════════════════════════
-🔢 CRITICAL RULES
-═══════════════════════════════════════════════════════════════════════════════
-
-1. NEVER use vague terms: "high", "low", "good", "many", "few" without numbers
-2. ALWAYS cite data source: "(from scraped data)", "(from demographics)", "(from property analysis)"
-3. CALCULATE ranges, averages, percentages from scraped data
-4. IDENTIFY market gaps by comparing what exists vs what's missing
-5. MAKE suggestions unique to THIS query based on THIS data
-6. REFERENCE at least 3 different data sources in your analysis
-7. FLAG any data gaps and recommend how to fill them
-
-
-═══════════════════════════════════════════════════════════════════════════════
-📊 DATA SOURCE PRIORITY
-═══════════════════════════════════════════════════════════════════════════════
-
-Use ALL data sources in your analysis:
-
-1. 📊 PROPERTY FEATURES → Foundation for location viability
-2. 👥 DEMOGRAPHICS → Target market size and purchasing power
-3. 🏪 COMPETITOR ANALYSIS → Market saturation and quality benchmarks
-4. 📱 SOCIAL MEDIA → Demand validation and reputation signals
-5. 🌐 WEB-SCRAPED DATA → Real-time competitive intelligence (MOST IMPORTANT for suggestions)
-
-Each pro/con/suggestion MUST reference at least ONE specific data point.
-Combine multiple sources for stronger insights.
-
-Now provide your analysis in JSON format.
+Now provide your analysis in JSON format, following the output requirements.
 """
     
     return prompt.strip()
\ No newline at end of file
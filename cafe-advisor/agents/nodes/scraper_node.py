@@ -47,7 +47,6 @@ def scraper_node(state: BusinessAnalysisState) -> Dict[str, Any]:
             logger.warning(f"  primary_business: '{primary_business}'")
             logger.warning(f"  location: '{location}'")
             return {
-                **state,
                 "scraped_data": [],
                 "scraper_executed": False,
                 "current_step": "scraper_skipped"
@@ -60,7 +59,6 @@ def scraper_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         if not should_scrape:
             logger.info(f"Scraper not required for business type: {primary_business}")
             return {
-                **state,
                 "scraped_data": [],
                 "scraper_executed": False,
                 "current_step": "scraper_skipped"
@@ -100,7 +98,6 @@ def scraper_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         
         # Always return success - empty list is acceptable
         return {
-            **state,
             "scraped_data": scraped_data,
             "scraper_executed": True,
             "current_step": "scraper_completed"
@@ -112,7 +109,6 @@ def scraper_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         # Don't fail the workflow - return empty scraped data
         logger.info("Continuing workflow without scraped data")
         return {
-            **state,
             "scraped_data": [],
             "scraper_executed": False,
             "current_step": "scraper_completed"  # Still mark as completed
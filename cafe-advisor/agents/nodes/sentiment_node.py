@@ -1,6 +1,7 @@
 """Sentiment analysis node - FIXED."""
 
 import logging
+import numpy as np
 from typing import Dict, Any
 from agents.state import BusinessAnalysisState
 from utils.sentiment_analyzer import SentimentAnalyzer
@@ -17,7 +18,6 @@ def sentiment_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         if not reviews_data:
             logger.warning("No reviews to analyze")
             return {
-                **state,
                 "sentiment_analysis": {
                     "sentiment_summary": {
                         "positive_percentage": 0,
@@ -42,11 +42,13 @@ def sentiment_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         sentiment_results = analyzer.analyze_reviews_batch(valid_reviews)
         
         # Calculate summary
-        positive_count = sum(1 for r in sentiment_results if r.get('sentiment', {}).get('compound', 0) >= 0.05)
-        negative_count = sum(1 for r in sentiment_results if r.get('sentiment', {}).get('compound', 0) <= -0.05)
-        neutral_count = len(sentiment_results) - positive_count - negative_count
-        
         total = len(sentiment_results)
+        compounds = np.fromiter(
+            (r['sentiment']['compound'] for r in sentiment_results), dtype=np.float64, count=total
+        )
+        positive_count = int(np.count_nonzero(compounds >= 0.05))
+        negative_count = int(np.count_nonzero(compounds <= -0.05))
+        neutral_count = total - positive_count - negative_count
         
         sentiment_summary = {
             "positive_count": positive_count,
@@ -66,7 +68,6 @@ def sentiment_node(state: BusinessAnalysisState) -> Dict[str, Any]:
         logger.info(f"Sentiment analysis complete: {total} reviews analyzed")
         
         return {
-            **state,
             "sentiment_analysis": result,
             "current_step": "sentiment_completed"
         }
@@ -74,7 +75,6 @@ def sentiment_node(state: BusinessAnalysisState) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error in sentiment analysis: {e}")
         return {
-            **state,
             "sentiment_analysis": {
                 "sentiment_summary": {
                     "positive_percentage": 0,
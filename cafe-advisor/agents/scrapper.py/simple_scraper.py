@@ -2,6 +2,8 @@
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
@@ -10,6 +12,14 @@ load_dotenv()
 
 GOOGLE_PLACES_API_KEY = os.getenv('GOOGLE_PLACES_API_KEY', '')
 
+# Shared session so repeated searches reuse the pooled TLS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 
 def search_businesses(business_type: str, location: str, latitude: float = None, longitude: float = None) -> List[Dict[str, Any]]:
     """
@@ -45,7 +55,7 @@ def search_businesses(business_type: str, location: str, latitude: float = None,
     
     try:
         print(f"🔍 Searching Google Places: {query}")
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()
         
         data = response.json()
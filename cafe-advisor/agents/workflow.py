@@ -1,6 +1,9 @@
 """LangGraph workflow definition for business advisor."""
 
 import logging
+import os
+import sqlite3
+from functools import lru_cache
 from langgraph.graph import StateGraph, START, END
 from agents.state import BusinessAnalysisState
 from agents.nodes.geocode_node import geocode_node
@@ -8,17 +11,59 @@ from agents.nodes.intent_node import intent_node
 from agents.nodes.find_businesses_node import find_businesses_node
 from agents.nodes.extract_reviews_node import extract_reviews_node
 from agents.nodes.sentiment_node import sentiment_node
-from agents.nodes.chain_brand_node import chain_brand_node  # Now finds all businesses
+from agents.nodes.chain_brand_node import (  # Now finds all businesses
+    chain_brand_node,
+    dispatch_businesses,
+    enrich_business_node,
+    collect_businesses_node,
+)
 from agents.nodes.scraper_node import scraper_node  # NEW: Web scraper node
 from agents.nodes.llm_recommendation_node import llm_recommendation_node
 from agents.nodes.format_output_node import format_output_node
 from agents.nodes.find_amenities_node import find_amenities_node
 from agents.nodes.chart_generation_node import chart_generation_node
+from config.settings import CHECKPOINT_DB
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:
+    SqliteSaver = None
 
 logger = logging.getLogger(__name__)
 
-def create_workflow():
-    """Create and compile the LangGraph workflow."""
+
+@lru_cache(maxsize=1)
+def _create_checkpointer():
+    """Create the shared SQLite checkpointer, or None if it is unavailable."""
+    if SqliteSaver is None:
+        logger.warning("langgraph-checkpoint-sqlite not installed - runs will not be resumable")
+        return None
+    
+    try:
+        checkpoint_dir = os.path.dirname(CHECKPOINT_DB)
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        # Nodes and fan-out tasks run on worker threads
+        conn = sqlite3.connect(CHECKPOINT_DB, check_same_thread=False)
+        return SqliteSaver(conn)
+    except Exception as e:
+        logger.warning(f"Could not open checkpoint database {CHECKPOINT_DB}: {e}")
+        return None
+
+
+@lru_cache(maxsize=2)
+def create_workflow(checkpointed: bool = False):
+    """
+    Create and compile the LangGraph workflow.
+    
+    The compiled graph holds no per-run state (runs are separated by checkpoint
+    thread), so each variant is built once and shared by every analysis.
+    
+    Args:
+        checkpointed: Save each node's state to the checkpoint database, so a run
+            under a caller-supplied thread_id can be resumed; runs without one skip
+            that I/O
+    """
     
     # Create graph
     workflow = StateGraph(BusinessAnalysisState)
@@ -31,6 +76,8 @@ def create_workflow():
     workflow.add_node("extract_reviews", extract_reviews_node)
     workflow.add_node("sentiment_analysis", sentiment_node)
     workflow.add_node("all_businesses", chain_brand_node)  # Renamed to reflect its new function
+    workflow.add_node("enrich_business", enrich_business_node)  # Fan-out: one task per business
+    workflow.add_node("collect_businesses", collect_businesses_node)  # Fan-in
     workflow.add_node("scraper", scraper_node)  # NEW: Web scraper node
     workflow.add_node("llm_recommendation", llm_recommendation_node)
     workflow.add_node("chart_generation", chart_generation_node)  # NEW: Chart generation node
@@ -44,14 +91,16 @@ def create_workflow():
     workflow.add_edge("find_businesses", "extract_reviews")
     workflow.add_edge("extract_reviews", "sentiment_analysis")
     workflow.add_edge("sentiment_analysis", "all_businesses")
-    workflow.add_edge("all_businesses", "scraper")  # NEW: Run scraper after all_businesses
+    workflow.add_conditional_edges("all_businesses", dispatch_businesses, ["enrich_business", "collect_businesses"])
+    workflow.add_edge("enrich_business", "collect_businesses")
+    workflow.add_edge("collect_businesses", "scraper")  # NEW: Run scraper after all_businesses
     workflow.add_edge("scraper", "llm_recommendation")  # Pass scraped data to LLM
     workflow.add_edge("llm_recommendation", "chart_generation")  # NEW: Generate charts after recommendations
     workflow.add_edge("chart_generation", "format_output")  # Format output with chart data
     workflow.add_edge("format_output", END)
     
-    # Compile workflow
-    app = workflow.compile()
+    # Compile workflow (checkpointed so a failed run can resume without redoing geocode/scrape/LLM calls)
+    app = workflow.compile(checkpointer=_create_checkpointer() if checkpointed else None)
     
     logger.info("LangGraph workflow created and compiled")
     
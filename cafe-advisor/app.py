@@ -1,7 +1,9 @@
 """Flask API server for Business Advisor - replicates Streamlit functionality."""
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
+from flask_compress import Compress
+import orjson
 import logging
 import sys
 import os
@@ -22,6 +24,23 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__, static_folder='static', static_url_path='')
 CORS(app)  # Enable CORS for all routes
 
+# Compress JSON responses (chart data and business lists compress well)
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+Compress(app)
+
+
+def ojsonify(payload, status: int = 200):
+    """Serialize a JSON response with orjson (much faster than jsonify on large results)."""
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
 @app.route('/')
 def index():
     """Serve the main HTML page."""
@@ -63,11 +82,11 @@ def analyze():
         query = data.get('query', '').strip()
         
         if not query:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'data': None,
                 'error': 'Query is required'
-            }), 400
+            }, 400)
         
         logger.info(f"Received analysis request: {query}")
         
@@ -76,11 +95,11 @@ def analyze():
         
         # Check if analysis was successful
         if result.get('error'):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'data': None,
                 'error': result['error']
-            }), 500
+            }, 500)
         
         # Add final_report field from recommendation or formatted_output
         if 'final_report' not in result:
@@ -120,7 +139,7 @@ def analyze():
                 result['final_report'] = "Analysis complete. Please review the sections above for detailed insights."
         
         # Return successful response
-        return jsonify({
+        return ojsonify({
             'success': True,
             'data': result,
             'error': None
@@ -128,16 +147,16 @@ def analyze():
         
     except Exception as e:
         logger.error(f"Error in analyze endpoint: {str(e)}", exc_info=True)
-        return jsonify({
+        return ojsonify({
             'success': False,
             'data': None,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    return jsonify({
+    return ojsonify({
         'status': 'healthy',
         'service': 'Business Advisor API'
     })
@@ -146,6 +165,10 @@ if __name__ == '__main__':
     # Create static directory if it doesn't exist
     os.makedirs('static', exist_ok=True)
     
+    # Development server only - debug/reloader must be opted into with FLASK_DEV.
+    # Serve production traffic through gunicorn (see run_gunicorn.sh).
+    dev_mode = bool(os.getenv('FLASK_DEV'))
+    
     # Run Flask app
-    logger.info("Starting Flask API server on port 8080...")
-    app.run(host='0.0.0.0', port=8080, debug=True)
+    logger.info(f"Starting Flask development server on port 8080 (Debug: {dev_mode})...")
+    app.run(host='0.0.0.0', port=8080, debug=dev_mode, threaded=True)
@@ -4,6 +4,7 @@ Add Foursquare API key.
 """
 
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,15 +12,27 @@ load_dotenv()
 # Existing settings
 SERPAPI_KEY = os.getenv('SERPAPI_KEY')
 SERPAPI_BASE_URL = "https://serpapi.com"
+SERPAPI_TIMEOUT = 30  # seconds per request
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 OPENAI_MODEL = "gpt-4o-mini"  # Using GPT-4o-mini model
 REQUEST_DELAY = 0.5
 
+# LangGraph checkpoint store (lets an interrupted analysis resume from its last completed node)
+CHECKPOINT_DB = os.getenv('CHECKPOINT_DB', 'data/checkpoints.db')
+
+# In-process cache of completed analyses, keyed by normalized query
+ANALYSIS_CACHE_SIZE = 512
+ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', 3600))  # seconds
+
+# In-process cache of LLM recommendation responses, keyed by exact prompt
+RECOMMENDATION_CACHE_SIZE = 256
+RECOMMENDATION_CACHE_TTL = int(os.getenv('RECOMMENDATION_CACHE_TTL', 3600))  # seconds
+
 # NEW: Foursquare API key
 FOURSQUARE_API_KEY = os.getenv('FOURSQUARE_API_KEY')
 
-# Business search queries
-BUSINESS_SEARCH_QUERIES = {
+# Business search queries (read-only)
+BUSINESS_SEARCH_QUERIES = MappingProxyType({
     "cafe": "cafe coffee shop",
     "restaurant": "restaurant dining",
     "sneaker store": "sneaker store shoe shop",
@@ -36,19 +49,43 @@ BUSINESS_SEARCH_QUERIES = {
     "hotel": "hotel lodging",
     "jewellery shop": "jewellery jewelry store",
     "jewelry store": "jewellery jewelry store"
-}
+})
+
+# Spelling variants resolved to their canonical BUSINESS_SEARCH_QUERIES key
+_BUSINESS_TYPE_ALIASES = MappingProxyType({
+    "grocery shop": "grocery",
+    "grocery store": "grocery",
+    "jewelry store": "jewellery shop",
+    "jewelry shop": "jewellery shop",
+    "jewellery store": "jewellery shop"
+})
+
+
+def get_business_query(business_type: str) -> str:
+    """
+    Get the search query for a business type.
+    
+    Args:
+        business_type: Business type, in any case and either spelling
+    
+    Returns:
+        Search query, or the business type itself if it has none
+    """
+    key = business_type.strip().lower()
+    return BUSINESS_SEARCH_QUERIES.get(_BUSINESS_TYPE_ALIASES.get(key, key), business_type)
+
 
 # NEW: Amenity search queries for enhanced insights
 # Note: pharmacy has been intentionally excluded per project requirements
 # Police, fire_station, and transit have been removed per user request
-AMENITY_SEARCH_QUERIES = {
+AMENITY_SEARCH_QUERIES = MappingProxyType({
     "hospital": "hospitals medical centers",
     "clinic": "clinics healthcare centers",
     "school": "schools primary secondary",
     "university": "universities colleges higher education",
     "library": "public libraries",
     "park": "parks recreation areas"
-}
+})
 
 # Default search radius for amenities (in meters)
 AMENITY_SEARCH_RADIUS = 5000  # 5km
@@ -1,13 +1,15 @@
 """Script to read and display the dummy property variables CSV file."""
 
-import pandas as pd
+from utils.data_files import load_property_frame
+
+DEMOGRAPHICS_CSV_PATH = 'data/dummy_property_variables.csv'
 
 
 def read_demographics_data():
     """Read and display the demographics data from CSV file."""
     try:
         # Read the CSV file
-        df = pd.read_csv('data/dummy_property_variables.csv')
+        df = load_property_frame(DEMOGRAPHICS_CSV_PATH)
         print("=== DUMMY PROPERTY VARIABLES DATA ===")
         print(f"Total records: {len(df)}")
         print("\nColumn names:")
@@ -0,0 +1,39 @@
+#!/bin/bash
+
+# Research-Orra - Gunicorn Production Server Startup Script
+
+echo "🚀 Starting Research-Orra with Gunicorn..."
+echo "=========================================="
+echo ""
+
+# Activate virtual environment if it exists
+if [ -d "../venv" ]; then
+    echo "📦 Activating virtual environment..."
+    source ../venv/bin/activate
+elif [ -d "venv" ]; then
+    echo "📦 Activating virtual environment..."
+    source venv/bin/activate
+fi
+
+# Create static directory if it doesn't exist
+mkdir -p static
+
+# Requests spend most of their time waiting on SerpAPI / LLM calls,
+# so use threaded workers: one process per core, several threads each.
+WORKERS=${GUNICORN_WORKERS:-$(nproc 2>/dev/null || echo 2)}
+THREADS=${GUNICORN_THREADS:-8}
+PORT=${PORT:-8080}
+
+echo "🌐 Starting Gunicorn on http://0.0.0.0:${PORT} (${WORKERS} workers x ${THREADS} threads)"
+echo ""
+
+gunicorn app:app \
+    --workers "${WORKERS}" \
+    --worker-class gthread \
+    --threads "${THREADS}" \
+    --bind "0.0.0.0:${PORT}" \
+    --timeout 180 \
+    --access-logfile -
+
+echo ""
+echo "✅ Server stopped"
@@ -1,11 +1,117 @@
 """Build city-wide business database from SerpAPI."""
 
+import os
+import numpy as np
 import pandas as pd
-import time
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
 from utils.api_clients import SerpApiClient
-from geopy.geocoders import Nominatim
+from utils.rate_limiter import RateLimiter
 
-def build_city_database(city_name: str, city_lat: float, city_lon: float, output_path: str = "data/city_businesses.csv"):
+# Number of grid searches in flight at once
+MAX_CONCURRENT_SEARCHES = 10
+
+# SerpApi request budget shared by all workers (replaces the client's default REQUEST_DELAY pacing)
+MAX_SEARCHES_PER_SECOND = 5
+
+# Columns of the city business database
+BUSINESS_SCHEMA = pa.schema([
+    ('name', pa.string()),
+    ('lat', pa.float64()),
+    ('lon', pa.float64()),
+    ('address', pa.string()),
+    ('types', pa.string()),
+    ('rating', pa.float64()),
+    ('reviews', pa.int64())
+])
+
+
+def _search_grid_point(serp_client: SerpApiClient, query: str,
+                       search_lat: float, search_lon: float) -> List[Dict]:
+    """
+    Search one grid point for a query and return the businesses found.
+    
+    Args:
+        serp_client: Shared SerpApi client, paced by the script's rate limiter
+        query: Search query
+        search_lat: Grid point latitude
+        search_lon: Grid point longitude
+        
+    Returns:
+        List of business records (empty if SerpApi returned no local results)
+    """
+    results = serp_client.search_places(
+        query=query,
+        latitude=search_lat,
+        longitude=search_lon,
+        radius=2500  # 2.5km radius per grid point
+    )
+    
+    businesses = []
+    for result in results.get("local_results", []):
+        gps = result.get("gps_coordinates", {})
+        
+        businesses.append({
+            'name': result.get("title", ""),
+            'lat': gps.get("latitude", search_lat),
+            'lon': gps.get("longitude", search_lon),
+            'address': result.get("address", ""),
+            'types': result.get("type", ""),
+            'rating': result.get("rating"),
+            'reviews': result.get("reviews", 0)
+        })
+    
+    return businesses
+
+
+def _business_keys(businesses: List[Dict]) -> np.ndarray:
+    """
+    Key each business by its name and location (to 4 decimal places).
+    
+    Name and rounded coordinates are folded into a single uint64 key so duplicates can
+    be found with integer comparisons rather than hashing strings and floats per row.
+    
+    Args:
+        businesses: Business records with 'name', 'lat' and 'lon'
+        
+    Returns:
+        One key per business
+    """
+    lat_i = np.rint(np.array([b['lat'] for b in businesses], dtype=np.float64) * 1e4).astype(np.int64)
+    lon_i = np.rint(np.array([b['lon'] for b in businesses], dtype=np.float64) * 1e4).astype(np.int64)
+    
+    # Longitude spans +/-1.8M at this precision; offset it to pack both into one integer
+    coord_key = (lat_i * 3_600_001 + (lon_i + 1_800_000)).astype(np.uint64)
+    name_hash = pd.util.hash_array(np.array([b['name'] or '' for b in businesses], dtype=object))
+    return name_hash ^ (coord_key * np.uint64(0x9E3779B97F4A7C15))
+
+
+def _drop_seen_businesses(businesses: List[Dict], seen: set) -> List[Dict]:
+    """
+    Drop businesses already written (or repeated within the batch) and record the rest.
+    
+    Args:
+        businesses: Businesses from one grid search
+        seen: Keys of businesses kept so far; updated in place
+        
+    Returns:
+        First occurrence of each new business, in original order
+    """
+    keys = _business_keys(businesses)
+    _, first_idx = np.unique(keys, return_index=True)
+    
+    unique = []
+    for i in np.sort(first_idx).tolist():
+        key = int(keys[i])
+        if key not in seen:
+            seen.add(key)
+            unique.append(businesses[i])
+    return unique
+
+
+def build_city_database(city_name: str, city_lat: float, city_lon: float, output_path: str = "data/city_businesses.parquet"):
     """
     Build a database of all businesses in a city.
     
@@ -13,14 +119,16 @@ def build_city_database(city_name: str, city_lat: float, city_lon: float, output
         city_name: Name of the city
         city_lat: City center latitude
         city_lon: City center longitude
-        output_path: Where to save the database
+        output_path: Where to save the database (.parquet, or .csv for plain text)
     """
     print(f"Building business database for {city_name}...")
     
-    serp_client = SerpApiClient()
-    geolocator = Nominatim(user_agent="city_db_builder", timeout=5)
+    serp_client = SerpApiClient(rate_limiter=RateLimiter(MAX_SEARCHES_PER_SECOND, burst=MAX_CONCURRENT_SEARCHES))
     
-    all_businesses = []
+    # Results are de-duplicated and streamed to a staging Parquet file as they arrive rather than held in memory
+    staging_path = f"{output_path}.partial.parquet"
+    seen = set()
+    writer = pq.ParquetWriter(staging_path, BUSINESS_SCHEMA, compression="snappy")
     
     # Search in a grid pattern to cover the entire city
     # Adjust grid_size based on city size (e.g., 0.05 = ~5km)
@@ -29,60 +137,49 @@ def build_city_database(city_name: str, city_lat: float, city_lon: float, output
     
     search_queries = ['cafe', 'restaurant', 'pharmacy', 'retail shop', 'store']
     
-    for query in search_queries:
-        print(f"\nSearching for: {query}")
+    # Every (query, grid point) search is independent I/O, so fan them out over a thread pool
+    offsets = np.arange(-2, 3) * grid_size  # 5x5 grid
+    lat_grid, lon_grid = np.meshgrid(city_lat + offsets, city_lon + offsets, indexing='ij')
+    grid_points = list(zip(lat_grid.ravel().tolist(), lon_grid.ravel().tolist()))
+    
+    tasks = [
+        (query, search_lat, search_lon)
+        for query in search_queries
+        for search_lat, search_lon in grid_points
+    ]
+    
+    with writer, ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SEARCHES) as executor:
+        futures = {
+            executor.submit(_search_grid_point, serp_client, query, search_lat, search_lon): (query, search_lat, search_lon)
+            for query, search_lat, search_lon in tasks
+        }
         
-        for lat_offset in range(-2, 3):  # 5x5 grid
-            for lon_offset in range(-2, 3):
-                search_lat = city_lat + (lat_offset * grid_size)
-                search_lon = city_lon + (lon_offset * grid_size)
-                
-                print(f"  Grid point ({search_lat:.4f}, {search_lon:.4f})...", end=" ")
-                
-                try:
-                    results = serp_client.search_places(
-                        query=query,
-                        latitude=search_lat,
-                        longitude=search_lon,
-                        radius=2500  # 2.5km radius per grid point
-                    )
-                    
-                    if "local_results" in results:
-                        for result in results["local_results"]:
-                            gps = result.get("gps_coordinates", {})
-                            
-                            business = {
-                                'name': result.get("title", ""),
-                                'lat': gps.get("latitude", search_lat),
-                                'lon': gps.get("longitude", search_lon),
-                                'address': result.get("address", ""),
-                                'types': result.get("type", ""),
-                                'rating': result.get("rating"),
-                                'reviews': result.get("reviews", 0)
-                            }
-                            
-                            all_businesses.append(business)
-                        
-                        print(f"Found {len(results['local_results'])} businesses")
-                    else:
-                        print("No results")
-                    
-                    time.sleep(1)  # Rate limiting
-                
-                except Exception as e:
-                    print(f"Error: {e}")
-    
-    # Create DataFrame and remove duplicates
-    df = pd.DataFrame(all_businesses)
-    
-    # Remove duplicates based on name and approximate location
-    df['lat_rounded'] = df['lat'].round(4)
-    df['lon_rounded'] = df['lon'].round(4)
-    df = df.drop_duplicates(subset=['name', 'lat_rounded', 'lon_rounded'])
-    df = df.drop(columns=['lat_rounded', 'lon_rounded'])
-    
-    # Save to CSV
-    df.to_csv(output_path, index=False)
+        for future in as_completed(futures):
+            query, search_lat, search_lon = futures[future]
+            label = f"  {query} @ ({search_lat:.4f}, {search_lon:.4f})"
+            
+            try:
+                businesses = future.result()
+            except Exception as e:
+                print(f"{label}... Error: {e}")
+                continue
+            
+            if businesses:
+                unique = _drop_seen_businesses(businesses, seen)
+                if unique:
+                    writer.write_batch(pa.RecordBatch.from_pylist(unique, schema=BUSINESS_SCHEMA))
+                print(f"{label}... Found {len(businesses)} businesses ({len(unique)} new)")
+            else:
+                print(f"{label}... No results")
+    
+    # The staging file already holds the de-duplicated database as compressed Parquet
+    if output_path.endswith(".csv"):
+        df = pd.read_parquet(staging_path)
+        df.to_csv(output_path, index=False)
+        os.remove(staging_path)
+    else:
+        os.replace(staging_path, output_path)
+        df = pd.read_parquet(output_path)
     
     print(f"\n✅ Database created: {len(df)} unique businesses")
     print(f"📁 Saved to: {output_path}")
@@ -96,5 +193,5 @@ if __name__ == "__main__":
         city_name="Chandigarh",
         city_lat=30.7333,
         city_lon=76.7794,
-        output_path="data/chandigarh_businesses.csv"
+        output_path="data/chandigarh_businesses.parquet"
     )
\ No newline at end of file
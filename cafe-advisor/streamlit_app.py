@@ -3,9 +3,11 @@
 import streamlit as st
 import pandas as pd
 import os
+import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple, Optional
 from main import analyze_property
+from utils.city_chain_detector import brand_group_key
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +22,9 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+# Streamlit clears any element a rerun does not emit, so the style block has to be
+# re-sent every run; it is kept as a single module-level constant.
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -108,15 +112,55 @@ st.markdown("""
         color: #000000 !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Analysis pipeline steps: (icon, display name, workflow step)
+WORKFLOW_STEPS = (
+    ("💭", "Understanding Intent", "intent"),
+    ("🗺️", "Geocoding", "geocode"),
+    ("🔍", "Finding Businesses", "find_businesses"),
+    ("📝", "Extracting Reviews", "extract_reviews"),
+    ("😊", "Sentiment Analysis", "sentiment_analysis"),
+    ("🏪", "Chain Brands", "chain_brands"),
+    ("🤖", "LLM Recommendations", "llm_recommendation"),
+    ("📊", "Formatting Results", "format_output")
+)
+
+_STEP_INDEX = {step_name: i for i, (_, _, step_name) in enumerate(WORKFLOW_STEPS)}
+
+# Rendered cell per step, indexed by status: 0 = active, 1 = done, 2 = pending
+_STEP_MARKDOWN = tuple(
+    (
+        f"### {icon}\n**{name}**\n🔵 Active",
+        f"### {icon}\n**{name}**\n✅ Done",
+        f"### {icon}\n**{name}**\n⚪ Pending"
+    )
+    for icon, name, _ in WORKFLOW_STEPS
+)
+
+
+class BusinessView(NamedTuple):
+    """Display fields of a business, resolved once with their defaults."""
+    name: str
+    original_name: str
+    types: str
+    area_name: str
+    distance: float
+    lat: float
+    lon: float
+    rating: Optional[float]
+    reviews_count: int
+
 
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-@st.cache_data
+@st.cache_resource
 def load_property_data():
-    """Load property data."""
+    """Load property data (shared read-only across sessions, never mutate the result)."""
     try:
         # Get absolute path relative to this file
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -125,7 +169,12 @@ def load_property_data():
         if not os.path.exists(csv_path):
             csv_path = "data/property_project_lat_long.csv"
         
-        df = pd.read_csv(csv_path)
+        # Only the coordinates and names are used; repeated names are stored as categories
+        df = pd.read_csv(
+            csv_path,
+            usecols=['latitude', 'longitude', 'project_name', 'brand_name'],
+            dtype={'project_name': 'category', 'brand_name': 'category'}
+        )
         
         # Remove invalid coordinates and duplicates
         df = df.dropna(subset=['latitude', 'longitude'])
@@ -165,29 +214,157 @@ def display_property_info(latitude: float, longitude: float):
 
 def display_workflow_progress(step):
     """Display current workflow step."""
-    steps = [
-        ("💭", "Understanding Intent", "intent"),
-        ("🗺️", "Geocoding", "geocode"),
-        ("🔍", "Finding Businesses", "find_businesses"),
-        ("📝", "Extracting Reviews", "extract_reviews"),
-        ("😊", "Sentiment Analysis", "sentiment_analysis"),
-        ("🏪", "Chain Brands", "chain_brands"),
-        ("🤖", "LLM Recommendations", "llm_recommendation"),
-        ("📊", "Formatting Results", "format_output")
+    st.markdown('<div class="sub-header">🔄 Analysis Pipeline</div>', unsafe_allow_html=True)
+    
+    cols = st.columns(len(WORKFLOW_STEPS))
+    
+    # Position of the active step (an unknown step counts as the last one, with none active)
+    active_idx = _STEP_INDEX.get(step)
+    current_idx = len(WORKFLOW_STEPS) - 1 if active_idx is None else active_idx
+    
+    for i, markdown in enumerate(_STEP_MARKDOWN):
+        status = 0 if i == active_idx else 1 if i < current_idx else 2
+        cols[i].markdown(markdown[status])
+
+
+def _business_sort_keys(all_businesses):
+    """
+    Extract the sort/group keys for all businesses in one pass.
+    
+    Entry i describes all_businesses[i]; missing values are treated as 0.
+    """
+    sort_keys = []
+    for b in all_businesses:
+        brand = b.get('brand', b.get('name', 'Unknown'))
+        sort_keys.append((
+            float(b.get('rating') or 0),
+            float(b.get('reviews_count') or 0),
+            float(b.get('positive_percentage') or 0),
+            bool(b.get('is_chain', False)),
+            brand,
+            b.get('chain_key') or brand_group_key(brand or '')
+        ))
+    return sort_keys
+
+
+def _business_view(business) -> BusinessView:
+    """Resolve the display fields of a business dict once, with their defaults."""
+    get = business.get
+    name = get('name', 'Unknown')
+    return BusinessView(
+        name=name,
+        original_name=get('original_name', name),
+        types=get('types', 'Business'),
+        area_name=get('area_name', 'Unknown'),
+        distance=get('distance', 0),
+        lat=get('lat', 0),
+        lon=get('lon', 0),
+        rating=get('rating'),
+        reviews_count=get('reviews_count') or 0
+    )
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=16)
+def _prepare_business_listing(sort_keys_json: str) -> Dict[str, Any]:
+    """
+    Compute the display order of a result's businesses (cached per result, so reruns skip it).
+    
+    Args:
+        sort_keys_json: JSON dump of _business_sort_keys (hashable cache key)
+        
+    Returns:
+        Positions into the business list: branded groups, ranked locals, and top competitors
+    """
+    rank_frame = pd.DataFrame.from_records(
+        json.loads(sort_keys_json),
+        columns=['rating', 'reviews_count', 'positive_percentage', 'is_chain', 'brand', 'chain_key']
+    )
+    is_chain = rank_frame['is_chain'].to_numpy(dtype=bool)
+    
+    return {
+        # Brands in order of first appearance, grouped on the integer brand key
+        "branded_groups": [
+            (group['brand'].iat[0], group.index.tolist())
+            for _, group in rank_frame[is_chain].groupby('chain_key', sort=False)
+        ],
+        # Locals by rating, then reviews (ties keep the original order)
+        "local_order": rank_frame[~is_chain].sort_values(
+            ['rating', 'reviews_count'], ascending=False, kind='stable'
+        ).index.tolist(),
+        "most_rated": rank_frame.nlargest(1, ['rating', 'positive_percentage']).index.tolist(),
+        "most_reviewed": rank_frame.nlargest(1, ['reviews_count', 'rating']).index.tolist()
+    }
+
+
+def _business_listing(all_businesses) -> Dict[str, Any]:
+    """Return the cached display order for a list of businesses."""
+    return _prepare_business_listing(json.dumps(_business_sort_keys(all_businesses), default=str))
+
+
+def _location_markdown(name: str, business: BusinessView, rating_mark: str = "", reviews_mark: str = "") -> str:
+    """
+    Build the detail block for one business as a single markdown string.
+    
+    Args:
+        name: Name shown in the block heading
+        business: Display fields of the business
+        rating_mark: Suffix appended to the rating line
+        reviews_mark: Suffix appended to the reviews line
+        
+    Returns:
+        Markdown for the heading, detail list, and trailing divider
+    """
+    lines = [
+        f"📍 **{name}**",
+        "",
+        f"- 📍 Area: {business.area_name}",
+        f"- 🚶 Distance: {business.distance:.2f} km",
+        f"- 🌍 Coordinates: ({business.lat:.6f}, {business.lon:.6f})"
     ]
+    if business.rating is not None:
+        lines.append(f"- ⭐ Rating: {business.rating}/5.0{rating_mark}")
+    if business.reviews_count > 0:
+        lines.append(f"- 💬 Reviews: {business.reviews_count}{reviews_mark}")
+    lines += ["", "---"]
+    return "\n".join(lines)
+
+
+def _display_business_listing(all_businesses, listing):
+    """Display branded stores grouped by brand, then local businesses ranked by rating and reviews."""
     
-    st.markdown('<div class="sub-header">🔄 Analysis Pipeline</div>', unsafe_allow_html=True)
+    views = [_business_view(b) for b in all_businesses]
     
-    cols = st.columns(len(steps))
+    # Display branded businesses, grouped by brand in order of first appearance
+    if listing["branded_groups"]:
+        st.markdown('<div class="sub-header">🏢 Branded Stores</div>', unsafe_allow_html=True)
+        for brand_name, positions in listing["branded_groups"]:
+            locations = [views[i] for i in positions]
+            with st.expander(f"**{brand_name}** ({len(locations)} location{'s' if len(locations) > 1 else ''})", expanded=False):
+                # One markdown element per expander instead of one per line
+                st.markdown("\n\n".join(_location_markdown(loc.original_name, loc) for loc in locations))
     
-    for i, (icon, name, step_name) in enumerate(steps):
-        with cols[i]:
-            if step == step_name:
-                st.markdown(f"### {icon}\n**{name}**\n🔵 Active")
-            elif steps.index((icon, name, step_name)) < steps.index([s for s in steps if s[2] == step][0] if step in [s[2] for s in steps] else steps[-1]):
-                st.markdown(f"### {icon}\n**{name}**\n✅ Done")
-            else:
-                st.markdown(f"### {icon}\n**{name}**\n⚪ Pending")
+    # Display non-branded businesses with highlighting for top-rated/most reviewed
+    if listing["local_order"]:
+        st.markdown('<div class="sub-header">🏪 Local Businesses</div>', unsafe_allow_html=True)
+        
+        # Sorted by rating and reviews count to highlight top businesses
+        for i in listing["local_order"]:
+            business = views[i]
+            
+            # Highlight top-rated businesses
+            is_top_rated = (business.rating or 0) >= 4.0
+            is_most_reviewed = business.reviews_count >= 50
+            
+            highlight = is_top_rated or is_most_reviewed
+            name_display = f"**{business.name}**" if highlight else business.name
+            
+            with st.expander(f"{name_display} ({business.types})", expanded=False):
+                st.markdown(_location_markdown(
+                    business.name,
+                    business,
+                    rating_mark=" ⭐" if is_top_rated else "",
+                    reviews_mark=" 💬" if is_most_reviewed else ""
+                ))
 
 
 def display_analysis_results(result):
@@ -218,63 +395,7 @@ def display_analysis_results(result):
         if all_businesses:
             st.markdown('<div class="sub-header">🏪 All Businesses Near You</div>', unsafe_allow_html=True)
             
-            # Separate branded and non-branded businesses
-            branded_businesses = [b for b in all_businesses if b.get('is_chain', False)]
-            non_branded_businesses = [b for b in all_businesses if not b.get('is_chain', False)]
-            
-            # Group by brand for branded businesses
-            from collections import defaultdict
-            brand_groups = defaultdict(list)
-            for business in branded_businesses:
-                brand_name = business.get('brand', business.get('name', 'Unknown'))
-                brand_groups[brand_name].append(business)
-            
-            # Display branded businesses
-            if brand_groups:
-                st.markdown('<div class="sub-header">🏢 Branded Stores</div>', unsafe_allow_html=True)
-                for brand_name, locations in brand_groups.items():
-                    with st.expander(f"**{brand_name}** ({len(locations)} location{'s' if len(locations) > 1 else ''})", expanded=False):
-                        for loc in locations:
-                            st.markdown(f"📍 **{loc.get('original_name', loc.get('name', 'Unknown'))}**")
-                            st.markdown(f"- 📍 Area: {loc.get('area_name', 'Unknown')}")
-                            st.markdown(f"- 🚶 Distance: {loc.get('distance', 0):.2f} km")
-                            st.markdown(f"- 🌍 Coordinates: ({loc.get('lat', 0):.6f}, {loc.get('lon', 0):.6f})")
-                            if 'rating' in loc and loc['rating'] is not None:
-                                st.markdown(f"- ⭐ Rating: {loc['rating']}/5.0")
-                            if 'reviews_count' in loc and loc['reviews_count'] > 0:
-                                st.markdown(f"- 💬 Reviews: {loc['reviews_count']}")
-                            st.markdown("---")
-            
-            # Display non-branded businesses
-            if non_branded_businesses:
-                st.markdown('<div class="sub-header">🏪 Local Businesses</div>', unsafe_allow_html=True)
-                # Sort by rating and reviews count to highlight top businesses
-                sorted_non_branded = sorted(
-                    non_branded_businesses, 
-                    key=lambda x: (x.get('rating', 0) or 0, x.get('reviews_count', 0) or 0), 
-                    reverse=True
-                )
-                
-                for business in sorted_non_branded:
-                    # Highlight top-rated businesses
-                    is_top_rated = (business.get('rating', 0) or 0) >= 4.0
-                    is_most_reviewed = (business.get('reviews_count', 0) or 0) >= 50
-                    
-                    highlight = is_top_rated or is_most_reviewed
-                    name_display = f"**{business.get('name', 'Unknown')}**" if highlight else business.get('name', 'Unknown')
-                    
-                    with st.expander(f"{name_display} ({business.get('types', 'Business')})", expanded=False):
-                        st.markdown(f"📍 **{business.get('name', 'Unknown')}**")
-                        st.markdown(f"- 📍 Area: {business.get('area_name', 'Unknown')}")
-                        st.markdown(f"- 🚶 Distance: {business.get('distance', 0):.2f} km")
-                        st.markdown(f"- 🌍 Coordinates: ({business.get('lat', 0):.6f}, {business.get('lon', 0):.6f})")
-                        if 'rating' in business and business['rating'] is not None:
-                            rating_star = "⭐" if is_top_rated else ""
-                            st.markdown(f"- ⭐ Rating: {business['rating']}/5.0 {rating_star}")
-                        if 'reviews_count' in business and business['reviews_count'] > 0:
-                            review_star = "💬" if is_most_reviewed else ""
-                            st.markdown(f"- 💬 Reviews: {business['reviews_count']} {review_star}")
-                        st.markdown("---")
+            _display_business_listing(all_businesses, _business_listing(all_businesses))
         else:
             st.info("No businesses found in this area.")
         return  # Exit early for branded store lookup
@@ -286,13 +407,16 @@ def display_analysis_results(result):
     if businesses:
         st.markdown('<div class="sub-header">📈 Market Overview</div>', unsafe_allow_html=True)
         
+        # One vectorized pass per metric; missing values count as 0
+        overview = pd.DataFrame(businesses, columns=['rating', 'reviews_analyzed']).fillna(0)
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric("🏪 Competitors Found", len(businesses))
         
         with col2:
-            avg_rating = sum(b.get('rating', 0) or 0 for b in businesses) / len(businesses)
+            avg_rating = overview['rating'].mean()
             st.metric("⭐ Avg Rating", f"{avg_rating:.2f}/5.0")
         
         with col3:
@@ -300,7 +424,7 @@ def display_analysis_results(result):
             st.metric("😊 Avg Sentiment", f"{avg_sentiment:.1f}%")
         
         with col4:
-            total_reviews = sum(b.get('reviews_analyzed', 0) for b in businesses)
+            total_reviews = int(overview['reviews_analyzed'].sum())
             st.metric("💬 Reviews Analyzed", total_reviews)
     
     # All Businesses
@@ -308,63 +432,8 @@ def display_analysis_results(result):
     if all_businesses:
         st.markdown('<div class="sub-header">🏪 All Businesses in Area</div>', unsafe_allow_html=True)
         
-        # Separate branded and non-branded businesses
-        branded_businesses = [b for b in all_businesses if b.get('is_chain', False)]
-        non_branded_businesses = [b for b in all_businesses if not b.get('is_chain', False)]
-        
-        # Group by brand for branded businesses
-        from collections import defaultdict
-        brand_groups = defaultdict(list)
-        for business in branded_businesses:
-            brand_name = business.get('brand', business.get('name', 'Unknown'))
-            brand_groups[brand_name].append(business)
-        
-        # Display branded businesses
-        if brand_groups:
-            st.markdown('<div class="sub-header">🏢 Branded Stores</div>', unsafe_allow_html=True)
-            for brand_name, locations in brand_groups.items():
-                with st.expander(f"**{brand_name}** ({len(locations)} location{'s' if len(locations) > 1 else ''})", expanded=False):
-                    for loc in locations:
-                        st.markdown(f"📍 **{loc.get('original_name', loc.get('name', 'Unknown'))}**")
-                        st.markdown(f"- 📍 Area: {loc.get('area_name', 'Unknown')}")
-                        st.markdown(f"- 🚶 Distance: {loc.get('distance', 0):.2f} km")
-                        st.markdown(f"- 🌍 Coordinates: ({loc.get('lat', 0):.6f}, {loc.get('lon', 0):.6f})")
-                        if 'rating' in loc and loc['rating'] is not None:
-                            st.markdown(f"- ⭐ Rating: {loc['rating']}/5.0")
-                        if 'reviews_count' in loc and loc['reviews_count'] > 0:
-                            st.markdown(f"- 💬 Reviews: {loc['reviews_count']}")
-                        st.markdown("---")
-        
-        # Display non-branded businesses with highlighting for top-rated/most reviewed
-        if non_branded_businesses:
-            st.markdown('<div class="sub-header">🏪 Local Businesses</div>', unsafe_allow_html=True)
-            # Sort by rating and reviews count to highlight top businesses
-            sorted_non_branded = sorted(
-                non_branded_businesses, 
-                key=lambda x: (x.get('rating', 0) or 0, x.get('reviews_count', 0) or 0), 
-                reverse=True
-            )
-            
-            for business in sorted_non_branded:
-                # Highlight top-rated businesses
-                is_top_rated = (business.get('rating', 0) or 0) >= 4.0
-                is_most_reviewed = (business.get('reviews_count', 0) or 0) >= 50
-                
-                highlight = is_top_rated or is_most_reviewed
-                name_display = f"**{business.get('name', 'Unknown')}**" if highlight else business.get('name', 'Unknown')
-                
-                with st.expander(f"{name_display} ({business.get('types', 'Business')})", expanded=False):
-                    st.markdown(f"📍 **{business.get('name', 'Unknown')}**")
-                    st.markdown(f"- 📍 Area: {business.get('area_name', 'Unknown')}")
-                    st.markdown(f"- 🚶 Distance: {business.get('distance', 0):.2f} km")
-                    st.markdown(f"- 🌍 Coordinates: ({business.get('lat', 0):.6f}, {business.get('lon', 0):.6f})")
-                    if 'rating' in business and business['rating'] is not None:
-                        rating_star = "⭐" if is_top_rated else ""
-                        st.markdown(f"- ⭐ Rating: {business['rating']}/5.0 {rating_star}")
-                    if 'reviews_count' in business and business['reviews_count'] > 0:
-                        review_star = "💬" if is_most_reviewed else ""
-                        st.markdown(f"- 💬 Reviews: {business['reviews_count']} {review_star}")
-                    st.markdown("---")
+        listing = _business_listing(all_businesses)
+        _display_business_listing(all_businesses, listing)
     
     # Add after the business analysis results section
     if result.get("nearby_amenities"):
@@ -440,18 +509,9 @@ def display_analysis_results(result):
     if all_businesses:
         st.markdown('<div class="sub-header">🏆 Top 3 Competitors</div>', unsafe_allow_html=True)
         
-        # Sort by rating (most rated) and reviews count (most reviewed)
-        most_rated = sorted(
-            all_businesses,
-            key=lambda x: (x.get('rating', 0) or 0, x.get('positive_percentage', 0) or 0),
-            reverse=True
-        )[:1]
-        
-        most_reviewed = sorted(
-            all_businesses,
-            key=lambda x: (x.get('reviews_count', 0) or 0, x.get('rating', 0) or 0),
-            reverse=True
-        )[:1]
+        # Most rated and most reviewed (ties keep the original order)
+        most_rated = [all_businesses[i] for i in listing["most_rated"]]
+        most_reviewed = [all_businesses[i] for i in listing["most_reviewed"]]
         
         # Combine and deduplicate
         top_competitors = list({b.get('name', ''): b for b in most_rated + most_reviewed}.values())[:2]
@@ -1,111 +1,114 @@
 """Template for business analysis reports."""
 
-# This template can be used to customize the output format for different business types
+from string import Template
 
-DEFAULT_TEMPLATE = """
-# {business_type.upper()} OPPORTUNITY ANALYSIS
-## Location: {area_name}
+# This template can be used to customize the output format for different business types.
+# Templates use ${field} placeholders; fill them with Template.safe_substitute().
+
+DEFAULT_TEMPLATE = Template("""
+# ${business_heading} OPPORTUNITY ANALYSIS
+## Location: ${area_name}
 
 ### PROPERTY DETAILS
-- Property ID: {property_id}
-- Coordinates: {latitude}, {longitude}
-- Area: {area_name}
+- Property ID: ${property_id}
+- Coordinates: ${latitude}, ${longitude}
+- Area: ${area_name}
 
 ### DEMOGRAPHIC PROFILE
-{demographics}
+${demographics}
 
 ### MARKET OVERVIEW
-- Competitor Count: {competitor_count}
-- Average Rating: {avg_rating}/5.0
-- Market Sentiment: {avg_sentiment} (scale: -1 to 1)
-- Positive Sentiment: {positive_pct}%
-- Negative Sentiment: {negative_pct}%
+- Competitor Count: ${competitor_count}
+- Average Rating: ${avg_rating}/5.0
+- Market Sentiment: ${avg_sentiment} (scale: -1 to 1)
+- Positive Sentiment: ${positive_pct}%
+- Negative Sentiment: ${negative_pct}%
 
 ### RECOMMENDATIONS
 #### PROS
-{pros}
+${pros}
 
 #### CONS
-{cons}
+${cons}
 
 #### SUGGESTIONS
-{suggestions}
+${suggestions}
 
 #### FINAL RECOMMENDATION
-{recommendation}
+${recommendation}
 
 ### TOP COMPETITORS
-{top_competitors}
-"""
+${top_competitors}
+""")
 
-CAFE_TEMPLATE = """
+CAFE_TEMPLATE = Template("""
 # CAFE OPPORTUNITY ANALYSIS
-## Location: {area_name}
+## Location: ${area_name}
 
 ### PROPERTY DETAILS
-- Property ID: {property_id}
-- Coordinates: {latitude}, {longitude}
-- Area: {area_name}
+- Property ID: ${property_id}
+- Coordinates: ${latitude}, ${longitude}
+- Area: ${area_name}
 
 ### DEMOGRAPHIC PROFILE
-{demographics}
+${demographics}
 
 ### MARKET OVERVIEW
-- Coffee Shops Count: {competitor_count}
-- Average Rating: {avg_rating}/5.0
-- Customer Sentiment: {avg_sentiment} (scale: -1 to 1)
-- Positive Reviews: {positive_pct}%
-- Negative Reviews: {negative_pct}%
+- Coffee Shops Count: ${competitor_count}
+- Average Rating: ${avg_rating}/5.0
+- Customer Sentiment: ${avg_sentiment} (scale: -1 to 1)
+- Positive Reviews: ${positive_pct}%
+- Negative Reviews: ${negative_pct}%
 
 ### RECOMMENDATIONS
 #### OPPORTUNITIES
-{pros}
+${pros}
 
 #### CHALLENGES
-{cons}
+${cons}
 
 #### BUSINESS STRATEGIES
-{suggestions}
+${suggestions}
 
 #### FINAL VERDICT
-{recommendation}
+${recommendation}
 
 ### TOP COFFEE SHOPS
-{top_competitors}
-"""
+${top_competitors}
+""")
 
-SNEAKER_STORE_TEMPLATE = """
+SNEAKER_STORE_TEMPLATE = Template("""
 # SNEAKER STORE OPPORTUNITY ANALYSIS
-## Location: {area_name}
+## Location: ${area_name}
 
 ### PROPERTY DETAILS
-- Property ID: {property_id}
-- Coordinates: {latitude}, {longitude}
-- Area: {area_name}
+- Property ID: ${property_id}
+- Coordinates: ${latitude}, ${longitude}
+- Area: ${area_name}
 
 ### DEMOGRAPHIC PROFILE
-{demographics}
+${demographics}
 
 ### MARKET OVERVIEW
-- Sneaker Stores Count: {competitor_count}
-- Average Rating: {avg_rating}/5.0
-- Customer Sentiment: {avg_sentiment} (scale: -1 to 1)
-- Positive Reviews: {positive_pct}%
-- Negative Reviews: {negative_pct}%
+- Sneaker Stores Count: ${competitor_count}
+- Average Rating: ${avg_rating}/5.0
+- Customer Sentiment: ${avg_sentiment} (scale: -1 to 1)
+- Positive Reviews: ${positive_pct}%
+- Negative Reviews: ${negative_pct}%
 
 ### RECOMMENDATIONS
 #### MARKET OPPORTUNITIES
-{pros}
+${pros}
 
 #### MARKET CHALLENGES
-{cons}
+${cons}
 
 #### BUSINESS STRATEGIES
-{suggestions}
+${suggestions}
 
 #### FINAL VERDICT
-{recommendation}
+${recommendation}
 
 ### TOP SNEAKER STORES
-{top_competitors}
-"""
\ No newline at end of file
+${top_competitors}
+""")
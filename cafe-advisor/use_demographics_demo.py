@@ -1,13 +1,26 @@
 """Demo script showing how to use demographics data with the Business Advisor system."""
 
-import pandas as pd
+import re
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from main import analyze_property
+from read_demographics import DEMOGRAPHICS_CSV_PATH
+from utils.data_files import load_property_frame
+
+# "lat, lon" in the Lat-Long column, optionally quoted
+_LAT_LONG_PATTERN = re.compile(r'"?\s*(-?\d+(?:\.\d*)?)\s*,\s*(-?\d+(?:\.\d*)?)\s*"?')
+
+# Property the demo analyses are run for (the first project in data/property_project_lat_long.csv)
+DEMO_PROPERTY_NAME = "NOBLE AURELLIA"
+
+# Demographic fields our system expects, each an int
+SYSTEM_DEMOGRAPHIC_FIELDS = ("population", "working_population", "income_level", "retail_shops", "foot_traffic")
 
 
 def load_demographics_data():
-    """Load demographics data from CSV file."""
+    """Load demographics data from CSV file, with system-format columns added."""
     try:
-        df = pd.read_csv('data/dummy_property_variables.csv')
+        df = add_system_format_columns(load_property_frame(DEMOGRAPHICS_CSV_PATH))
         print(f"Loaded {len(df)} property records with demographics data")
         return df
     except Exception as e:
@@ -15,10 +28,65 @@ def load_demographics_data():
         return None
 
 
+def _int_column(df, column):
+    """A CSV column as an int32 array, or zeros when the column is missing."""
+    if column not in df:
+        return np.zeros(len(df), dtype=np.int32)
+    return df[column].fillna(0).to_numpy(dtype=np.int32)
+
+
+def aggregate_demographics(df):
+    """
+    Compute every row's system-format demographics as one int32 block.
+    
+    Args:
+        df: Demographics DataFrame as read from the CSV
+        
+    Returns:
+        (N, 5) int32 array whose columns follow SYSTEM_DEMOGRAPHIC_FIELDS
+    """
+    working_population = _int_column(df, 'Population (18-60 Yrs)')
+    
+    block = np.empty((len(df), len(SYSTEM_DEMOGRAPHIC_FIELDS)), dtype=np.int32)
+    np.add(_int_column(df, 'Population (0-18 Yrs)'), working_population, out=block[:, 0])
+    block[:, 0] += _int_column(df, 'Population (Above 60 Yrs)')
+    block[:, 1] = working_population
+    block[:, 2] = _int_column(df, 'Household income above 10 LPA')
+    block[:, 3] = _int_column(df, 'Total Retail Shops')
+    block[:, 4] = _int_column(df, 'Overall Footfall Score')
+    return block
+
+
+def add_system_format_columns(df):
+    """
+    Map every row's demographics from CSV format to our system's format at once.
+    
+    Adds latitude and longitude plus one int32 column per
+    SYSTEM_DEMOGRAPHIC_FIELDS entry, computed as whole-column operations.
+    
+    Args:
+        df: Demographics DataFrame as read from the CSV
+        
+    Returns:
+        The same DataFrame with the system-format columns added
+    """
+    # Extract coordinates from the Lat-Long field in one regex pass; unparseable rows become 0.0
+    coords = df['Lat-Long'].astype(str).str.extract(_LAT_LONG_PATTERN).astype(float).fillna(0.0)
+    df['latitude'] = coords[0]
+    df['longitude'] = coords[1]
+    
+    # Map demographics to our system format
+    for field, values in zip(SYSTEM_DEMOGRAPHIC_FIELDS, aggregate_demographics(df).T):
+        df[field] = values
+    
+    return df
+
+
 def map_demographics_to_system_format(demographics_row):
     """
-    Map demographics data from CSV format to our system's format.
+    Read a row's demographics in our system's format.
     
+    The row must come from a DataFrame passed through add_system_format_columns.
     Our system expects:
     {
         "population": int,
@@ -28,35 +96,8 @@ def map_demographics_to_system_format(demographics_row):
         "foot_traffic": int
     }
     """
-    # Extract coordinates from the Lat-Long field
-    lat_long_str = demographics_row['Lat-Long']
-    try:
-        # Parse the coordinate string
-        coords = lat_long_str.replace('"', '').strip()
-        if ',' in coords:
-            lat, lon = coords.split(',')
-            latitude = float(lat.strip())
-            longitude = float(lon.strip())
-        else:
-            # Fallback if format is unexpected
-            latitude, longitude = 0.0, 0.0
-    except:
-        latitude, longitude = 0.0, 0.0
-    
-    # Map demographics to our system format
-    demographics = {
-        "population": (
-            int(demographics_row.get('Population (0-18 Yrs)', 0)) +
-            int(demographics_row.get('Population (18-60 Yrs)', 0)) +
-            int(demographics_row.get('Population (Above 60 Yrs)', 0))
-        ),
-        "working_population": int(demographics_row.get('Population (18-60 Yrs)', 0)),
-        "income_level": int(demographics_row.get('Household income above 10 LPA', 0)),
-        "retail_shops": int(demographics_row.get('Total Retail Shops', 0)),
-        "foot_traffic": int(demographics_row.get('Overall Footfall Score', 0))
-    }
-    
-    return latitude, longitude, demographics
+    demographics = {field: int(demographics_row[field]) for field in SYSTEM_DEMOGRAPHIC_FIELDS}
+    return float(demographics_row['latitude']), float(demographics_row['longitude']), demographics
 
 
 def demo_with_demographics():
@@ -88,14 +129,23 @@ def demo_with_demographics():
     
     # For this demo, we'll use the system's built-in data loading
     # which automatically creates sample data if needed
-    print("\nAnalyzing property for different business types:")
+    print(f"\nAnalyzing {DEMO_PROPERTY_NAME} for different business types:")
     
     business_types = ["cafe", "sneaker_store", "restaurant"]
     
-    for business_type in business_types:
+    # Analyses are dominated by network latency, so run them side by side and print in order
+    with ThreadPoolExecutor(max_workers=len(business_types)) as executor:
+        futures = {
+            business_type: executor.submit(
+                analyze_property, f"{business_type.replace('_', ' ')} in {DEMO_PROPERTY_NAME}"
+            )
+            for business_type in business_types
+        }
+    
+    for business_type, future in futures.items():
         print(f"\n--- {business_type.upper()} ANALYSIS ---")
         try:
-            result = analyze_property(property_index=0, business_type=business_type)
+            result = future.result()
             
             if "error" in result and result["error"]:
                 print(f"Error: {result['error']}")
@@ -1,18 +1,111 @@
 """API clients for business advisor system."""
 
+import hashlib
+import re
 import time
+import threading
+import orjson
 import requests
-from typing import Dict, Any, Optional, List
-from config.settings import SERPAPI_KEY, SERPAPI_BASE_URL, REQUEST_DELAY, OPENAI_API_KEY, OPENAI_MODEL
-from openai import OpenAI
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, Dict, Any, Optional, List
+from config.settings import SERPAPI_KEY, SERPAPI_BASE_URL, SERPAPI_TIMEOUT, REQUEST_DELAY, OPENAI_API_KEY, OPENAI_MODEL
+from config.settings import RECOMMENDATION_CACHE_SIZE, RECOMMENDATION_CACHE_TTL
+from utils.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Upper bound on concurrent amenity searches
+MAX_AMENITY_SEARCH_WORKERS = 8
+
+# Results on a full Google Maps page; a type with this many hits in the combined page needs no search of its own
+MAPS_RESULTS_PER_PAGE = 20
+
+# Brand classification responses kept per (model, prompt)
+BRAND_CLASSIFICATION_CACHE_SIZE = 4096
+
+# Seconds an idle OpenAI connection stays pooled (httpx defaults to 5). LLM calls are spaced
+# further apart than that, so a longer expiry keeps the TLS session warm between them.
+OPENAI_KEEPALIVE_EXPIRY = 60
+
+# Outermost JSON object in a response that wraps it in other text
+_JSON_OBJECT_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
+# Default process-wide SerpApi pacing: request starts are spaced REQUEST_DELAY apart, so
+# concurrent callers stay under the QPS cap while their round trips still overlap
+_serp_rate_limiter = RateLimiter(1 / max(REQUEST_DELAY, 0.001))
+
+
+class ApiError(Exception):
+    """Raised when a SerpApi or OpenAI call fails; the underlying error is chained as __cause__."""
+
+
+@lru_cache(maxsize=1)
+def _create_session() -> requests.Session:
+    """
+    Create the process-wide pooled HTTP session that retries transient failures.
+    
+    Shared by every SerpApiClient so keep-alive connections to SerpApi outlive
+    individual nodes and workflow runs.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    ))
+    return session
+
+
+@lru_cache(maxsize=1)
+def _create_openai_client() -> "OpenAI":
+    """
+    Create the process-wide OpenAI client.
+    
+    Shared by every OpenAIClient so its keep-alive connection pool is reused
+    instead of paying a fresh TCP and TLS handshake per client instance. The
+    OpenAI SDK is imported here, on first use, so importing this module (and
+    building the workflow) does not load it.
+    """
+    import httpx
+    from openai import OpenAI
+    
+    return OpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=httpx.Client(limits=httpx.Limits(
+            max_connections=32, max_keepalive_connections=16, keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY
+        ))
+    )
 
 
 class SerpApiClient:
     """Client for interacting with SerpApi."""
     
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize the client.
+        
+        Args:
+            rate_limiter: Limiter that paces this client's requests; defaults to the
+                process-wide limiter at one request per REQUEST_DELAY
+        """
         self.api_key = SERPAPI_KEY
         self.base_url = SERPAPI_BASE_URL
+        self.session = _create_session()
+        self.rate_limiter = rate_limiter or _serp_rate_limiter
+        
+        # Request URL and constant query parameters, built once per client
+        self.search_url = f"{self.base_url}/search"
+        self._places_params = {"engine": "google_maps", "api_key": self.api_key, "type": "search"}
+        self._reviews_params = {
+            "engine": "google_maps_reviews",
+            "api_key": self.api_key,
+            "sort_by": "newestFirst"  # Get newest reviews first
+        }
         
     def search_places(self, query: str, latitude: float, longitude: float, 
                      radius: int = 1000) -> Dict[str, Any]:
@@ -28,21 +121,18 @@ class SerpApiClient:
         Returns:
             Dictionary with search results
         """
-        params = {
-            "engine": "google_maps",
+        params = self._places_params | {
             "q": query,
-            "ll": f"@{latitude},{longitude},{radius}m",  # Correct format with radius
-            "api_key": self.api_key,
-            "type": "search"
+            "ll": f"@{latitude},{longitude},{radius}m"  # Correct format with radius
         }
         
         try:
-            time.sleep(REQUEST_DELAY)  # Rate limiting
-            response = requests.get(f"{self.base_url}/search", params=params)
+            self.rate_limiter.acquire()
+            response = self.session.get(self.search_url, params=params, timeout=SERPAPI_TIMEOUT)
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            raise Exception(f"Error searching places: {str(e)}")
+            return orjson.loads(response.content)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            raise ApiError(f"Error searching places: {e}") from e
     
     # NEW METHOD: Search for multiple amenities
     def search_amenities(self, amenity_types: List[str], latitude: float, 
@@ -50,6 +140,11 @@ class SerpApiClient:
         """
         Search for multiple amenity types near given coordinates.
         
+        One combined query is partitioned by each result's Maps type. A type keeps
+        those results only when the combined page clearly covers it: the page was the
+        last one (every match is on it) or the type alone filled a whole page. Every
+        other type gets the search of its own it would have had without the combined query.
+        
         Args:
             amenity_types: List of amenity types (e.g., ["hospital", "school"])
             latitude: Latitude of the location
@@ -59,9 +154,7 @@ class SerpApiClient:
         Returns:
             Dictionary mapping amenity types to their search results
         """
-        results = {}
-        
-        for amenity_type in amenity_types:
+        def search(amenity_type: str) -> List[Dict]:
             try:
                 search_results = self.search_places(
                     query=f"{amenity_type}s near me",
@@ -69,10 +162,45 @@ class SerpApiClient:
                     longitude=longitude,
                     radius=radius
                 )
-                results[amenity_type] = search_results.get("local_results", [])
+                return search_results.get("local_results", [])
             except Exception as e:
                 print(f"Error searching for {amenity_type}: {e}")
-                results[amenity_type] = []
+                return []
+        
+        results = {amenity_type: [] for amenity_type in amenity_types}
+        covered = set()
+        if len(results) > 1:
+            # Maps type name each amenity type is recognized by (e.g. "fire_station" is "fire station")
+            types_by_name = {amenity_type.replace("_", " ").lower(): amenity_type for amenity_type in results}
+            try:
+                combined = self.search_places(
+                    query=" OR ".join(f"{amenity_type}s" for amenity_type in results) + " near me",
+                    latitude=latitude,
+                    longitude=longitude,
+                    radius=radius
+                )
+                for place in combined.get("local_results", []):
+                    # Whole type names only, so "Parking lot" is no park and "Driving school" no school
+                    place_types = {
+                        " ".join(place_type.replace("_", " ").lower().split())
+                        for place_type in place.get("types") or [place.get("type") or ""]
+                    }
+                    for amenity_type in {types_by_name[name] for name in place_types if name in types_by_name}:
+                        results[amenity_type].append(place)
+                
+                last_page = not (combined.get("serpapi_pagination") or {}).get("next")
+                covered = {
+                    amenity_type for amenity_type, places in results.items()
+                    if places and (last_page or len(places) >= MAPS_RESULTS_PER_PAGE)
+                }
+            except Exception as e:
+                print(f"Error in combined amenity search: {e}")
+        
+        # Remaining searches are independent blocking HTTP calls, so run them concurrently
+        missing = [amenity_type for amenity_type in results if amenity_type not in covered]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(MAX_AMENITY_SEARCH_WORKERS, len(missing))) as executor:
+                results.update(zip(missing, executor.map(search, missing)))
         
         return results
     
@@ -87,59 +215,159 @@ class SerpApiClient:
         Returns:
             Dictionary with reviews data including 'reviews' and 'serpapi_pagination'
         """
-        params = {
-            "engine": "google_maps_reviews",
-            "data_id": data_id,
-            "api_key": self.api_key,
-            "sort_by": "newestFirst"  # Get newest reviews first
-        }
+        params = self._reviews_params | {"data_id": data_id}
         
         # Add pagination token if provided
         if next_page_token:
             params["next_page_token"] = next_page_token
         
         try:
-            time.sleep(REQUEST_DELAY)  # Rate limiting
-            response = requests.get(f"{self.base_url}/search", params=params)
+            self.rate_limiter.acquire()
+            response = self.session.get(self.search_url, params=params, timeout=SERPAPI_TIMEOUT)
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            raise Exception(f"Error fetching reviews: {str(e)}")
+            return orjson.loads(response.content)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            raise ApiError(f"Error fetching reviews: {e}") from e
+
+
+# Recommendation responses by (model, prompt) digest -> (timestamp, response), oldest first.
+# Prompts embed all of the analysis data, so an identical prompt means identical inputs.
+_recommendation_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+_recommendation_cache_lock = threading.Lock()
+
+
+def parse_json_response(response: str) -> Any:
+    """
+    Parse an LLM JSON response, tolerating text around the JSON object.
+    
+    JSON mode normally returns a bare object, which is parsed directly; otherwise the
+    outermost {...} block is parsed, so minor format drift does not cost a fallback.
+    
+    Args:
+        response: Response text from the LLM
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        orjson.JSONDecodeError: If the response holds no parseable JSON object
+    """
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
+        match = _JSON_OBJECT_PATTERN.search(response or "")
+        if match is None:
+            raise
+        return orjson.loads(match.group(0))
+
+
+def _recommendation_key(model: str, system_prompt: Optional[str], prompt: str) -> bytes:
+    """Cache key of a recommendation request."""
+    return hashlib.blake2b(f"{model}\0{system_prompt or ''}\0{prompt}".encode(), digest_size=16).digest()
+
+
+def _recommendation_messages(system_prompt: Optional[str], prompt: str) -> List[Dict[str, str]]:
+    """
+    Chat messages of a recommendation request.
+    
+    The system prompt always comes first so identical instructions form a stable prefix
+    that OpenAI's automatic prompt caching can reuse across requests; the per-request
+    data stays in the user message after it.
+    """
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _get_cached_recommendation(key: bytes) -> Optional[str]:
+    """Return a fresh cached recommendation response, if any."""
+    with _recommendation_cache_lock:
+        entry = _recommendation_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > RECOMMENDATION_CACHE_TTL:
+            del _recommendation_cache[key]
+            return None
+        _recommendation_cache.move_to_end(key)
+        return entry[1]
+
+
+def _store_cached_recommendation(key: bytes, response: str) -> None:
+    """Cache a recommendation response, evicting the least recently used entry when full."""
+    with _recommendation_cache_lock:
+        _recommendation_cache[key] = (time.monotonic(), response)
+        _recommendation_cache.move_to_end(key)
+        while len(_recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+            _recommendation_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=BRAND_CLASSIFICATION_CACHE_SIZE)
+def _classify_brands(model: str, prompt: str) -> str:
+    """
+    Run a brand classification prompt, memoized per (model, prompt).
+    
+    Classification runs at near-zero temperature, so a repeated prompt within a
+    batch or across properties is served without another API round trip. Failed
+    calls raise and are therefore not cached.
+    """
+    response = _create_openai_client().chat.completions.create(
+        messages=[
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ],
+        model=model,
+        temperature=0.1,  # Lower temperature for more consistent classifications
+        response_format={"type": "json_object"}
+    )
+    
+    return response.choices[0].message.content
 
 
 class OpenAIClient:
     """Client for interacting with OpenAI API."""
     
     def __init__(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
         self.model = OPENAI_MODEL
+    
+    @property
+    def client(self) -> "OpenAI":
+        """Shared OpenAI client, created on the first API call."""
+        return _create_openai_client()
         
-    def generate_recommendation(self, prompt: str) -> str:
+    def generate_recommendation(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """
         Generate business recommendations using OpenAI LLM.
         
         Args:
-            prompt: Prompt for the LLM
+            prompt: Prompt for the LLM, holding the request-specific data
+            system_prompt: Fixed instructions sent ahead of the prompt, if any
             
         Returns:
             Generated recommendation text
         """
+        # Repeated analyses of the same area and business type send the same prompt
+        cache_key = _recommendation_key(self.model, system_prompt, prompt)
+        cached = _get_cached_recommendation(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
+                messages=_recommendation_messages(system_prompt, prompt),
                 model=self.model,
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
             
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
         except Exception as e:
-            raise Exception(f"Error generating recommendation: {str(e)}")
+            raise ApiError(f"Error generating recommendation: {e}") from e
+        
+        if content:
+            _store_cached_recommendation(cache_key, content)
+        return content
     
     def generate_brand_classification(self, prompt: str) -> str:
         """
@@ -152,18 +380,6 @@ class OpenAIClient:
             Generated brand classification text
         """
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                model=self.model,
-                temperature=0.1,  # Lower temperature for more consistent classifications
-                response_format={"type": "json_object"}
-            )
-            
-            return response.choices[0].message.content
+            return _classify_brands(self.model, prompt)
         except Exception as e:
-            raise Exception(f"Error generating brand classification: {str(e)}")
\ No newline at end of file
+            raise ApiError(f"Error generating brand classification: {e}") from e
\ No newline at end of file
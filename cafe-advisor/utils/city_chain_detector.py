@@ -1,17 +1,167 @@
 """City-wide local chain detection system."""
 
+import bisect
+import hashlib
 import logging
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict, List, Any
-from collections import defaultdict
+import pickle
+from typing import Dict, List, Any, Optional
+from collections import Counter, defaultdict
+from functools import lru_cache
 import re
-from difflib import SequenceMatcher
-from math import radians, sin, cos, sqrt, atan2
+from difflib import SequenceMatcher, get_close_matches
+from utils.distance import EARTH_RADIUS_KM, haversine_term
 from utils.llm_brand_detector import LLMBrandDetector
 
+# Score all name pairs in one C call with RapidFuzz when it is installed
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
+
 logger = logging.getLogger(__name__)
 
+# Suffix of the on-disk copy of the chain index, stored next to the city database
+CHAIN_INDEX_CACHE_SUFFIX = ".chain_index.pkl"
+
+# Version of the chain index layout and name normalization; bump it whenever _normalize_name,
+# the branch patterns or the index format change, so stale on-disk copies are rebuilt
+CHAIN_INDEX_VERSION = 2
+
+# Minimum similarity ratio (0-1) for two normalized names to count as the same brand
+CHAIN_NAME_SIMILARITY = 0.85
+
+# Confidence of a city-chain match found only by name similarity; distinct shops can score
+# above CHAIN_NAME_SIMILARITY ("singh sweets" vs "singla sweets"), so such matches stay tentative
+SIMILAR_CHAIN_CONFIDENCE = 0.6
+
+# Two businesses closer than this (in degrees) on both axes are the same location
+_SAME_LOCATION_TOLERANCE = 0.0001
+
+# Result-chain matching compares int32 microdegrees: exact integer math, half the memory of float64
+_MICRODEGREES = 1_000_000
+_SAME_LOCATION_TOLERANCE_MICRODEGREES = round(_SAME_LOCATION_TOLERANCE * _MICRODEGREES)
+
+# Stands in for a missing coordinate; far outside any valid microdegree value, so it never matches
+_MISSING_MICRODEGREES = 2 ** 30
+
+# Businesses matched against the result-chain locations per vectorized comparison (bounds memory)
+_LOCATION_MATCH_CHUNK = 1024
+
+
+def _haversine_threshold(distance_km: float) -> float:
+    """Haversine term of a great-circle distance in kilometers."""
+    return np.sin(min(distance_km / (2 * EARTH_RADIUS_KM), np.pi / 2)) ** 2
+
+
+def _to_microdegrees(degrees) -> np.ndarray:
+    """Coordinates in degrees as int32 microdegrees, with missing values set to _MISSING_MICRODEGREES."""
+    microdegrees = np.rint(np.array(degrees, dtype=np.float64) * _MICRODEGREES)
+    microdegrees[np.isnan(microdegrees)] = _MISSING_MICRODEGREES
+    return microdegrees.astype(np.int32)
+
+
+def _similar_names(names: List[str], threshold: float) -> List[List[int]]:
+    """
+    Find, for every name, the other names whose similarity ratio reaches the threshold.
+    
+    With RapidFuzz the whole matrix is scored natively with fuzz.ratio, a normalized
+    Indel similarity. Without it, SequenceMatcher.ratio() is used, with each pair first
+    screened by its cheap upper bounds so the full ratio only runs on plausible pairs.
+    SequenceMatcher's matching-block heuristic is not an Indel distance and can score
+    a pair lower, so pairs near the threshold may match on one path and not the other.
+    
+    Args:
+        names: Normalized business names
+        threshold: Minimum similarity ratio (0-1)
+        
+    Returns:
+        Indices of the similar names per name, in ascending order
+    """
+    if process is not None and names:
+        scores = process.cdist(names, names, scorer=fuzz.ratio, score_cutoff=threshold * 100, workers=-1)
+        np.fill_diagonal(scores, 0)
+        return [np.flatnonzero(row).tolist() for row in scores]
+    
+    similar = [[] for _ in names]
+    matcher = SequenceMatcher(None)
+    for j, other in enumerate(names):
+        # SequenceMatcher caches its analysis of the second sequence, so reuse it per column
+        matcher.set_seq2(other)
+        for i, name in enumerate(names):
+            if i == j:
+                continue
+            matcher.set_seq1(name)
+            if (matcher.real_quick_ratio() >= threshold and
+                    matcher.quick_ratio() >= threshold and
+                    matcher.ratio() >= threshold):
+                similar[i].append(j)
+    return similar
+
+
+# Patterns stripped from business names to expose the core brand
+_BRANCH_PATTERNS = [
+    r'\s*-\s*.*',  # Everything after dash
+    r'\s*,\s*.*',  # Everything after comma
+    r'\s*#\d+',    # Branch numbers (#1, #2)
+    r'\s*\(.*\)',  # Content in parentheses
+    r'\s+branch\s*\d*',
+    r'\s+outlet\s*\d*',
+    r'\s+store\s*\d*',
+    r'\s+shop\s*\d*',
+    r'\s+sector\s+\d+',
+    r'\s+phase\s+\d+',
+    r'\s+scf\s+\d+',
+    r'\s+sco\s+\d+',
+    r'\s+block\s+\w+',
+    r'\s+mall.*',
+    r'\s+market.*',
+    r'\s+plaza.*',
+    r'\s+complex.*'
+]
+
+# Branch patterns compiled once; they are applied one after another, in list order, since
+# an earlier removal can change what a later pattern matches
+_BRANCH_REGEXES = [re.compile(pattern) for pattern in _BRANCH_PATTERNS]
+
+# Possessive apostrophes ("Sharma's" -> "sharma")
+_APOSTROPHE_PATTERN = re.compile(r"['\u2019]s?")
+
+# Distinct business names kept by the normalization cache; sized for a whole city database,
+# so building the chain index does not evict the names that queries look up afterwards
+NORMALIZED_NAME_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NORMALIZED_NAME_CACHE_SIZE)
+def _normalize_name(name: str) -> str:
+    """Cached brand-name normalization; the same names recur across the city index and every query."""
+    # Convert to lowercase
+    normalized = name.lower()
+    
+    # Remove possessive apostrophes
+    normalized = _APOSTROPHE_PATTERN.sub('', normalized)
+    
+    # Remove location/branch indicators
+    for regex in _BRANCH_REGEXES:
+        normalized = regex.sub('', normalized)
+    
+    # Clean whitespace and take first 2-3 meaningful words (core brand name)
+    return ' '.join(normalized.split()[:3])
+
+
+@lru_cache(maxsize=4096)
+def brand_group_key(brand: str) -> int:
+    """
+    Stable signed 64-bit key for grouping locations of the same brand (case-insensitive).
+    
+    Unlike hash(), the key is the same in every process, so it can be stored on results.
+    """
+    digest = hashlib.blake2b(brand.lower().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
 class CityChainDetector:
     """Detects local chains across the entire city using a master database."""
     
@@ -20,16 +170,22 @@ class CityChainDetector:
         Initialize with city-wide business database.
         
         Args:
-            city_database_path: Path to CSV with all city businesses
+            city_database_path: Path to Parquet or CSV with all city businesses
         """
         if city_database_path is None:
             # Get absolute path relative to project root
+            # Prefer the Parquet build output, falling back to the legacy CSV
             current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            city_database_path = os.path.join(current_dir, "data", "city_businesses.csv")
+            city_database_path = os.path.join(current_dir, "data", "city_businesses.parquet")
+            if not os.path.exists(city_database_path):
+                city_database_path = os.path.join(current_dir, "data", "city_businesses.csv")
         
         self.city_database_path = city_database_path
         self.city_businesses_df = self._load_city_database()
-        self.chain_cache = self._build_chain_index()
+        self.chain_cache = self._load_chain_index()
+        self.chain_infos = self._build_chain_infos(self.chain_cache)
+        self._sorted_chain_keys = sorted(self.chain_cache)
+        self._similar_chain_cache: Dict[str, Optional[str]] = {}
         self.llm_brand_detector = LLMBrandDetector()
         logger.info(f"City chain detector initialized with {len(self.city_businesses_df)} businesses")
     
@@ -37,7 +193,10 @@ class CityChainDetector:
         """Load city-wide business database."""
         if os.path.exists(self.city_database_path):
             try:
-                df = pd.read_csv(self.city_database_path)
+                if self.city_database_path.endswith(".parquet"):
+                    df = pd.read_parquet(self.city_database_path)
+                else:
+                    df = pd.read_csv(self.city_database_path)
                 logger.info(f"Loaded city database: {len(df)} businesses")
                 return df
             except Exception as e:
@@ -46,76 +205,184 @@ class CityChainDetector:
         logger.warning("No city database found - creating empty dataframe")
         return pd.DataFrame(columns=['name', 'lat', 'lon', 'address', 'types'])
     
+    def _load_chain_index(self) -> Dict[str, List[Dict]]:
+        """
+        Load the chain index from its on-disk copy, rebuilding it when the database changed.
+        
+        The copy is keyed by CHAIN_INDEX_VERSION and the database file's modification
+        time and size, so a restart reuses it until the city database is rebuilt or
+        the normalization changes.
+        
+        Returns:
+            {normalized_brand_name: [locations]}
+        """
+        if not os.path.exists(self.city_database_path):
+            return self._build_chain_index()
+        
+        stat = os.stat(self.city_database_path)
+        signature = (CHAIN_INDEX_VERSION, stat.st_mtime_ns, stat.st_size)
+        cache_path = self.city_database_path + CHAIN_INDEX_CACHE_SUFFIX
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, chain_index = pickle.load(f)
+            if cached_signature == signature:
+                logger.info(f"Loaded chain index for {len(chain_index)} local chains from {cache_path}")
+                return chain_index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable chain index cache {cache_path}: {e}")
+        
+        chain_index = self._build_chain_index()
+        
+        # Write to a temporary file first so concurrent workers never read a partial copy
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((signature, chain_index), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache chain index: {e}")
+        
+        return chain_index
+    
     def _build_chain_index(self) -> Dict[str, List[Dict]]:
         """
         Build an index of all chains in the city.
         Returns: {normalized_brand_name: [locations]}
         """
-        chain_index = defaultdict(list)
+        df = self.city_businesses_df
+        if 'name' not in df.columns:
+            return {}
         
-        for _, row in self.city_businesses_df.iterrows():
-            name = row.get('name', '')
-            if not name:
-                continue
-            
-            # Normalize the brand name
-            normalized = self._normalize_brand_name(name)
-            
-            chain_index[normalized].append({
-                'original_name': name,
-                'lat': row.get('lat'),
-                'lon': row.get('lon'),
-                'address': row.get('address', ''),
-                'types': row.get('types', '')
-            })
+        named = df[df['name'].notna() & (df['name'] != '')]
+        
+        # Normalize each distinct brand name once, then spread the results back over the rows
+        codes, unique_names = pd.factorize(named['name'].astype(str))
+        normalized = pd.Series(
+            np.array([_normalize_name(name) for name in unique_names.tolist()], dtype=object)[codes],
+            index=named.index
+        )
+        
+        locations = pd.DataFrame({
+            'original_name': named['name'],
+            'lat': named.get('lat'),
+            'lon': named.get('lon'),
+            'address': named.get('address', ''),
+            'types': named.get('types', '')
+        })
         
         # Filter to only businesses with 2+ locations (local chains)
+        is_chain = normalized.map(normalized.value_counts()) >= 2
         local_chains = {
-            brand: locations 
-            for brand, locations in chain_index.items() 
-            if len(locations) >= 2
+            brand: group.to_dict('records')
+            for brand, group in locations[is_chain].groupby(normalized[is_chain], sort=False)
         }
         
         logger.info(f"Found {len(local_chains)} local chains in city database")
         return local_chains
     
-    def check_if_chain(self, business_name: str) -> Dict[str, Any]:
+    @staticmethod
+    def _build_chain_infos(chain_index: Dict[str, List[Dict]]) -> Dict[str, Dict[str, Any]]:
         """
-        Check if a business is part of a local chain.
+        Build the check_if_chain answer for every chain once, instead of on every lookup.
         
         Args:
-            business_name: Name of the business
+            chain_index: {normalized_brand_name: [locations]}
             
         Returns:
-            Chain information if it's a local chain, None otherwise
+            {normalized_brand_name: chain information}
         """
-        normalized = self._normalize_brand_name(business_name)
-        
-        if normalized in self.chain_cache:
-            locations = self.chain_cache[normalized]
-            return {
+        return {
+            normalized: {
                 'is_local_chain': True,
                 'chain_name': normalized.title(),
                 'total_locations': len(locations),
                 'locations': locations,
-                'description': f"Local chain with {len(locations)} branches across the city"
+                'description': f"Local chain with {len(locations)} branches across the city",
+                'exact_match': True,
+                'match_confidence': 1.0
             }
+            for normalized, locations in chain_index.items()
+        }
+    
+    def check_if_chain(self, business_name: str) -> Dict[str, Any]:
+        """
+        Check if a business is part of a local chain.
+        
+        Args:
+            business_name: Name of the business
+            
+        Returns:
+            Chain information; exact_match tells an exact name match from a similar
+            spelling, which carries the lower match_confidence
+        """
+        normalized = self._normalize_brand_name(business_name)
+        chain_info = self.chain_infos.get(normalized)
+        if chain_info is not None:
+            # Copy, since callers store the result on their own business dicts
+            return dict(chain_info)
+        
+        # Near-miss spellings of a known chain ("Sharmas Cafe" vs "sharma cafe")
+        chain_info = self.chain_infos.get(self._find_similar_chain(normalized))
+        if chain_info is not None:
+            return {**chain_info, 'exact_match': False, 'match_confidence': SIMILAR_CHAIN_CONFIDENCE}
         
         return {
             'is_local_chain': False,
             'chain_name': None,
             'total_locations': 1,
-            'description': "Independent single-location business"
+            'description': "Independent single-location business",
+            'exact_match': False,
+            'match_confidence': 0.0
         }
     
-    def detect_chains_in_results(self, businesses: List[Dict], similarity_threshold: float = 0.85) -> Dict[str, List[Dict]]:
+    def _find_similar_chain(self, normalized: str) -> Optional[str]:
+        """
+        Find the city chain whose normalized name is most similar to a name without an exact match.
+        
+        Only chains starting with the same character are scored; the sorted key list
+        turns that bucket into a slice found by bisection. The chain index never changes
+        after start-up, so each name's answer is remembered and repeat lookups skip scoring.
+        
+        Args:
+            normalized: Normalized business name
+            
+        Returns:
+            Normalized name of the matching chain, or None
+        """
+        if not normalized:
+            return None
+        
+        if normalized in self._similar_chain_cache:
+            return self._similar_chain_cache[normalized]
+        
+        keys = self._sorted_chain_keys
+        first = normalized[0]
+        candidates = keys[bisect.bisect_left(keys, first):bisect.bisect_left(keys, chr(ord(first) + 1))]
+        
+        similar_chain = None
+        if candidates and process is not None:
+            match = process.extractOne(normalized, candidates, scorer=fuzz.ratio,
+                                       score_cutoff=CHAIN_NAME_SIMILARITY * 100)
+            similar_chain = match[0] if match else None
+        elif candidates:
+            matches = get_close_matches(normalized, candidates, n=1, cutoff=CHAIN_NAME_SIMILARITY)
+            similar_chain = matches[0] if matches else None
+        
+        if len(self._similar_chain_cache) < NORMALIZED_NAME_CACHE_SIZE:
+            self._similar_chain_cache[normalized] = similar_chain
+        return similar_chain
+    
+    def detect_chains_in_results(self, businesses: List[Dict], similarity_threshold: float = CHAIN_NAME_SIMILARITY) -> Dict[str, List[Dict]]:
         """
         Detect local chains within the search results themselves.
         This identifies businesses with same or similar names at different locations.
         
         Args:
             businesses: List of nearby businesses
-            similarity_threshold: Minimum similarity score for name matching (default: 0.85)
+            similarity_threshold: Minimum similarity score for name matching (default: CHAIN_NAME_SIMILARITY)
             
         Returns:
             Dictionary of detected local chains from the results
@@ -135,46 +402,51 @@ class CityChainDetector:
         result_chains = defaultdict(list)
         processed = set()
         
-        for normalized_name, group in name_groups.items():
-            if normalized_name in processed:
+        # Similarity between normalized names, computed for all pairs up front
+        normalized_names = list(name_groups)
+        similar_names = _similar_names(normalized_names, similarity_threshold)
+        
+        # Coordinates of each name group, extracted once instead of on every comparison
+        group_coords = [self._group_coordinates(name_groups[name]) for name in normalized_names]
+        
+        for index, normalized_name in enumerate(normalized_names):
+            if index in processed:
                 continue
             
             # Start with exact matches
+            group = name_groups[normalized_name]
             cluster = group.copy()
             cluster_names = [business.get('name', '') for business in group]
+            cluster_coords = group_coords[index]
             
             # Check for similar names
-            for other_normalized, other_group in name_groups.items():
-                if other_normalized == normalized_name or other_normalized in processed:
+            for other_index in similar_names[index]:
+                if other_index in processed:
                     continue
                 
-                # Calculate similarity between normalized names
-                similarity = SequenceMatcher(None, normalized_name, other_normalized).ratio()
+                other_group = name_groups[normalized_names[other_index]]
                 
-                if similarity >= similarity_threshold:
-                    # Check if locations are different (at least 0.5km apart)
-                    if self._are_different_locations(cluster, other_group):
-                        cluster.extend(other_group)
-                        cluster_names.extend([business.get('name', '') for business in other_group])
-                        processed.add(other_normalized)
+                # Check if locations are different (at least 0.5km apart)
+                if self._coordinates_far_apart(cluster_coords, group_coords[other_index]):
+                    cluster.extend(other_group)
+                    cluster_names.extend([business.get('name', '') for business in other_group])
+                    cluster_coords = np.concatenate((cluster_coords, group_coords[other_index]))
+                    processed.add(other_index)
             
             # Only consider as chain if there are at least 2 locations
             if len(cluster) >= 2:
-                # Use the most common name as the chain name
-                name_counts = defaultdict(int)
-                for name in cluster_names:
-                    if name:
-                        name_counts[name] += 1
+                # Use the most common name as the chain name (ties go to the first seen)
+                name_counts = Counter(name for name in cluster_names if name)
                 
                 if name_counts:
-                    chain_name = max(name_counts.items(), key=lambda x: x[1])[0]
+                    chain_name = name_counts.most_common(1)[0][0]
                     result_chains[chain_name] = cluster
                 else:
                     # Fallback to first business name
                     chain_name = cluster[0].get('name', normalized_name)
                     result_chains[chain_name] = cluster
             
-            processed.add(normalized_name)
+            processed.add(index)
         
         return dict(result_chains)
     
@@ -190,118 +462,278 @@ class CityChainDetector:
         Returns:
             True if groups are at different locations
         """
-        for b1 in group1:
-            for b2 in group2:
-                lat1 = b1.get('lat', 0)
-                lon1 = b1.get('lon', 0)
-                lat2 = b2.get('lat', 0)
-                lon2 = b2.get('lon', 0)
-                
-                # Skip if coordinates are missing
-                if not all([lat1, lon1, lat2, lon2]):
-                    continue
-                
-                distance = self._calculate_distance(lat1, lon1, lat2, lon2)
-                if distance >= min_distance_km:
-                    return True
-        return False
+        return self._coordinates_far_apart(
+            self._group_coordinates(group1), self._group_coordinates(group2), min_distance_km
+        )
     
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two coordinates in kilometers."""
-        R = 6371  # Earth's radius in kilometers
+    @staticmethod
+    def _coordinates_far_apart(coords1: np.ndarray, coords2: np.ndarray, min_distance_km: float = 0.5) -> bool:
+        """
+        Check if any point of one coordinate set is at least min_distance_km from a point of the other.
         
-        lat1_rad = radians(lat1)
-        lat2_rad = radians(lat2)
-        delta_lat = radians(lat2 - lat1)
-        delta_lon = radians(lon2 - lon1)
+        Args:
+            coords1: (N, 2) latitudes/longitudes in radians, as from _group_coordinates
+            coords2: (M, 2) latitudes/longitudes in radians
+            min_distance_km: Minimum distance to consider locations different
+            
+        Returns:
+            True if the sets contain locations that far apart
+        """
+        if not len(coords1) or not len(coords2):
+            return False
+        
+        # The latitude difference alone is a lower bound on the great-circle distance, so pairs
+        # that are far apart north-south settle the check without any trigonometry
+        lat_delta = np.abs(coords1[:, :1] - coords2[:, 0])
+        if (lat_delta * EARTH_RADIUS_KM >= min_distance_km).any():
+            return True
+        
+        # All pairs at once (rows are coords1, columns are coords2), compared in haversine
+        # terms so no pair needs the square roots and arctangent of a full distance
+        terms = haversine_term(
+            coords1[:, :1], coords1[:, 1:],
+            coords2[:, 0], coords2[:, 1]
+        )
+        return bool((terms >= _haversine_threshold(min_distance_km)).any())
+    
+    @staticmethod
+    def _group_coordinates(group: List[Dict]) -> np.ndarray:
+        """Coordinates (in radians) of the businesses in a group that have both lat and lon."""
+        coords = [
+            (b.get('lat', 0), b.get('lon', 0))
+            for b in group
+            if b.get('lat', 0) and b.get('lon', 0)
+        ]
+        return np.radians(np.array(coords, dtype=np.float64).reshape(-1, 2))
+    
+    def classify_brands(self, businesses: List[Dict], business_type: str = "business") -> List[Dict[str, Any]]:
+        """
+        Classify businesses as branded or local, all at once.
         
-        a = sin(delta_lat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
+        Businesses the city database proves to be chains skip the LLM; the rest are
+        classified in batched LLM requests.
         
-        return R * c
+        Args:
+            businesses: List of nearby businesses
+            business_type: Type of business for context
+            
+        Returns:
+            Brand classification per business, in input order
+        """
+        brand_infos = [self._classify_from_city_chain(business.get('name', '')) for business in businesses]
+        unclassified = [business for business, brand_info in zip(businesses, brand_infos) if brand_info is None]
+        
+        llm_brand_infos = iter(self.llm_brand_detector.batch_classify_brands(unclassified, business_type))
+        return [brand_info if brand_info is not None else next(llm_brand_infos) for brand_info in brand_infos]
     
-    def enrich_businesses_with_chain_data(self, businesses: List[Dict], business_type: str = "business") -> List[Dict]:
+    def enrich_business(self, business: Dict, business_type: str = "business",
+                        result_chain_info: Dict[str, Any] = None,
+                        brand_info: Dict[str, Any] = None) -> Dict:
         """
-        Enrich nearby businesses with city-wide chain information AND
-        detect chains within the results themselves.
+        Enrich a single business with LLM brand classification and chain data.
         
         Args:
-            businesses: List of nearby businesses
+            business: Business dictionary
             business_type: Type of business for context
+            result_chain_info: Entry from find_result_chains for this business
+            brand_info: Entry from classify_brands for this business (classified here if omitted)
             
         Returns:
-            Enriched businesses with chain data
+            Enriched business with chain data
         """
-        # First, detect chains within the current results
-        result_chains = self.detect_chains_in_results(businesses)
+        if brand_info is None:
+            brand_info = self._classify_from_city_chain(business.get('name', ''))
+        if brand_info is None:
+            brand_info = self.llm_brand_detector.identify_brand_status(
+                business.get('name', ''), business_type, business.get('area_name', '')
+            )
+        
+        classified_business = business.copy()
+        classified_business.pop('brand_info', None)
+        classified_business.update(brand_info)
+        
+        return self.apply_chain_data(classified_business, result_chain_info)
+    
+    def _classify_from_city_chain(self, business_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Brand classification for a business the city database knows as a chain, without the LLM.
         
-        # Use LLM to classify businesses as branded or local
-        llm_classified_businesses = self.llm_brand_detector.batch_identify_brands(businesses, business_type)
+        Only exact name matches qualify; a similar spelling may be a different shop, so
+        it is left to the LLM.
         
-        enriched = []
-        for business in llm_classified_businesses:
-            business_copy = business.copy()
+        Args:
+            business_name: Name of the business
             
-            # Check city-wide chain database
-            chain_info = self.check_if_chain(business.get('name', ''))
-            business_copy['city_chain_info'] = chain_info
+        Returns:
+            Classification in the LLM brand detector's format, or None if the name is no city chain
+        """
+        chain_info = self.check_if_chain(business_name)
+        if not chain_info['is_local_chain'] or not chain_info['exact_match']:
+            return None
+        
+        return {
+            "is_branded": True,
+            "brand_name": chain_info['chain_name'],
+            "confidence": 1.0,
+            "reasoning": f"Matches a local chain with {chain_info['total_locations']} locations in the city database",
+            "classification_type": "branded"
+        }
+    
+    def find_result_chains(self, businesses: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Detect chains within the search results and match each business to one.
+        
+        Args:
+            businesses: List of nearby businesses
             
-            # Check if it's part of a chain detected in current results
-            is_result_chain = False
-            result_chain_info = None
+        Returns:
+            Result chain information per business (None where it is not part of one)
+        """
+        result_chains = self.detect_chains_in_results(businesses)
+        location_index = self._build_location_index(result_chains)
+        
+        return self._match_result_chains(
+            location_index,
+            [business.get('lat', 0) for business in businesses],
+            [business.get('lon', 0) for business in businesses]
+        )
+    
+    def apply_chain_data(self, business: Dict, result_chain_info: Dict[str, Any] = None) -> Dict:
+        """
+        Combine city-wide, in-results, and LLM chain signals for one business.
+        
+        Args:
+            business: Business dictionary already carrying LLM brand classification
+            result_chain_info: Entry from find_result_chains for this business
             
-            for chain_name, chain_locations in result_chains.items():
-                # Check if this business is part of this chain
-                for loc in chain_locations:
-                    # Match by coordinates
-                    if (abs(loc.get('lat', 0) - business.get('lat', 0)) < 0.0001 and
-                        abs(loc.get('lon', 0) - business.get('lon', 0)) < 0.0001):
-                        is_result_chain = True
-                        result_chain_info = {
-                            'is_result_chain': True,
-                            'chain_name': chain_name,
-                            'total_result_locations': len(chain_locations),
-                            'description': f"Found {len(chain_locations)} locations of this business nearby"
-                        }
-                        break
-                
-                if is_result_chain:
-                    break
+        Returns:
+            Enriched copy of the business
+        """
+        business_copy = business.copy()
+        
+        # Check city-wide chain database; a similar spelling stays tentative metadata in
+        # city_chain_info and never makes the business part of that chain
+        chain_info = self.check_if_chain(business.get('name', ''))
+        business_copy['city_chain_info'] = chain_info
+        city_chain = chain_info if chain_info.get('exact_match') else None
+        
+        # Check if it's part of a chain detected in current results
+        is_result_chain = result_chain_info is not None
+        
+        business_copy['result_chain_info'] = result_chain_info
+        
+        # Use LLM classification as primary source, fallback to rule-based detection
+        is_branded = business.get('is_branded', False)
+        brand_name = business.get('brand_name', business.get('name', ''))
+        confidence = business.get('confidence', 0.5)
+        
+        # Mark as chain if either database, results, or LLM indicate it's a chain
+        if ((city_chain is not None and city_chain['is_local_chain']) or is_result_chain or is_branded):
+            business_copy['is_local_chain'] = True
+            business_copy['is_chain'] = True  # For compatibility with Streamlit app
+            business_copy['local_chain_name'] = (
+                (city_chain.get('chain_name') if city_chain else None) or 
+                (result_chain_info.get('chain_name') if result_chain_info else brand_name)
+            )
+            business_copy['total_locations'] = (
+                (city_chain.get('total_locations', 1) if city_chain else 1) +
+                (result_chain_info.get('total_result_locations', 0) if result_chain_info else 1)
+            )
+            business_copy['brand_classification_confidence'] = confidence
+            business_copy['brand_classification_reasoning'] = business.get('reasoning', '')
+        else:
+            business_copy['is_local_chain'] = False
+            business_copy['is_chain'] = False  # For compatibility with Streamlit app
+            business_copy['local_chain_name'] = business.get('name', '')
+            business_copy['total_locations'] = 1
+            business_copy['brand_classification_confidence'] = confidence
+            business_copy['brand_classification_reasoning'] = business.get('reasoning', '')
+        
+        # Integer grouping key so displays can group locations without comparing strings
+        business_copy['chain_key'] = brand_group_key(business.get('brand', business.get('name', 'Unknown')) or '')
+        
+        return business_copy
+    
+    def _build_location_index(self, result_chains: Dict[str, List[Dict]]) -> Dict[str, Any]:
+        """
+        Lay out result-chain locations as parallel int32 microdegree arrays, in chain order,
+        so every business can be matched against all of them in one vectorized comparison.
+        
+        Args:
+            result_chains: Chains detected within the search results
             
-            business_copy['result_chain_info'] = result_chain_info
+        Returns:
+            {'lat': latitudes, 'lon': longitudes (microdegrees), 'chain': chain position per location,
+             'chain_infos': result chain information per chain}
+        """
+        chain_infos = []
+        lats = []
+        lons = []
+        chains = []
+        
+        for order, (chain_name, chain_locations) in enumerate(result_chains.items()):
+            chain_infos.append({
+                'is_result_chain': True,
+                'chain_name': chain_name,
+                'total_result_locations': len(chain_locations),
+                'description': f"Found {len(chain_locations)} locations of this business nearby"
+            })
+            for loc in chain_locations:
+                lat = loc.get('lat', 0)
+                lon = loc.get('lon', 0)
+                # Locations without coordinates can never match a business
+                if lat is None or lon is None or lat != lat or lon != lon:
+                    continue
+                lats.append(lat)
+                lons.append(lon)
+                chains.append(order)
+        
+        return {
+            'lat': _to_microdegrees(lats),
+            'lon': _to_microdegrees(lons),
+            'chain': np.array(chains, dtype=np.intp),
+            'chain_infos': chain_infos
+        }
+    
+    def _match_result_chains(self, location_index: Dict[str, Any], lats: List[float],
+                             lons: List[float]) -> List[Dict[str, Any]]:
+        """
+        Find, for each coordinate, the first result chain with a location there.
+        
+        Args:
+            location_index: Arrays built by _build_location_index
+            lats: Business latitudes
+            lons: Business longitudes
             
-            # Use LLM classification as primary source, fallback to rule-based detection
-            is_branded = business.get('is_branded', False)
-            brand_name = business.get('brand_name', business.get('name', ''))
-            confidence = business.get('confidence', 0.5)
+        Returns:
+            Result chain information per coordinate (None where no chain has a location there)
+        """
+        chain_infos = location_index['chain_infos']
+        if not chain_infos:
+            return [None] * len(lats)
+        
+        matches = []
+        for start in range(0, len(lats), _LOCATION_MATCH_CHUNK):
+            lat = _to_microdegrees(lats[start:start + _LOCATION_MATCH_CHUNK])[:, None]
+            lon = _to_microdegrees(lons[start:start + _LOCATION_MATCH_CHUNK])[:, None]
             
-            # Mark as chain if either database, results, or LLM indicate it's a chain
-            if (chain_info['is_local_chain'] or is_result_chain or is_branded):
-                business_copy['is_local_chain'] = True
-                business_copy['is_chain'] = True  # For compatibility with Streamlit app
-                business_copy['local_chain_name'] = (
-                    chain_info.get('chain_name') or 
-                    (result_chain_info.get('chain_name') if result_chain_info else brand_name)
-                )
-                business_copy['total_locations'] = (
-                    chain_info.get('total_locations', 1) +
-                    (result_chain_info.get('total_result_locations', 0) if result_chain_info else 1)
-                )
-                business_copy['brand_classification_confidence'] = confidence
-                business_copy['brand_classification_reasoning'] = business.get('reasoning', '')
-            else:
-                business_copy['is_local_chain'] = False
-                business_copy['is_chain'] = False  # For compatibility with Streamlit app
-                business_copy['local_chain_name'] = business.get('name', '')
-                business_copy['total_locations'] = 1
-                business_copy['brand_classification_confidence'] = confidence
-                business_copy['brand_classification_reasoning'] = business.get('reasoning', '')
+            # Rows are businesses, columns are chain locations
+            same_location = ((np.abs(location_index['lat'] - lat) < _SAME_LOCATION_TOLERANCE_MICRODEGREES) &
+                             (np.abs(location_index['lon'] - lon) < _SAME_LOCATION_TOLERANCE_MICRODEGREES))
             
-            enriched.append(business_copy)
-        
-        return enriched
+            # Locations are laid out in chain order, so the first match is the earliest chain
+            first = same_location.argmax(axis=1)
+            found = same_location[np.arange(len(first)), first]
+            chains = location_index['chain'][first]
+            matches.extend(
+                dict(chain_infos[chain]) if is_match else None
+                for chain, is_match in zip(chains.tolist(), found.tolist())
+            )
+        
+        return matches
     
-    def _normalize_brand_name(self, name: str) -> str:
+    @staticmethod
+    def _normalize_brand_name(name: str) -> str:
         """
         Normalize business name to detect chains.
         
@@ -313,45 +745,7 @@ class CityChainDetector:
         if not name:
             return ""
         
-        # Convert to lowercase
-        normalized = name.lower()
-        
-        # Remove possessive apostrophes
-        normalized = normalized.replace("'s", "").replace("'", "")
-        
-        # Remove location/branch indicators
-        patterns = [
-            r'\s*-\s*.*',  # Everything after dash
-            r'\s*,\s*.*',  # Everything after comma
-            r'\s*#\d+',    # Branch numbers (#1, #2)
-            r'\s*\(.*\)',  # Content in parentheses
-            r'\s+branch\s*\d*',
-            r'\s+outlet\s*\d*',
-            r'\s+store\s*\d*',
-            r'\s+shop\s*\d*',
-            r'\s+sector\s+\d+',
-            r'\s+phase\s+\d+',
-            r'\s+scf\s+\d+',
-            r'\s+sco\s+\d+',
-            r'\s+block\s+\w+',
-            r'\s+mall.*',
-            r'\s+market.*',
-            r'\s+plaza.*',
-            r'\s+complex.*'
-        ]
-        
-        for pattern in patterns:
-            normalized = re.sub(pattern, '', normalized, flags=re.IGNORECASE)
-        
-        # Clean whitespace
-        normalized = ' '.join(normalized.split()).strip()
-        
-        # Take first 2-3 meaningful words (core brand name)
-        words = normalized.split()
-        if len(words) > 3:
-            normalized = ' '.join(words[:3])
-        
-        return normalized
+        return _normalize_name(name)
     
     def get_chain_statistics(self) -> Dict[str, Any]:
         """Get statistics about chains in the city."""
@@ -0,0 +1,66 @@
+"""Exact-coordinate lookups over a table of property locations."""
+
+from math import floor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Coordinate match tolerance for property lookups (about 10cm)
+COORDINATE_TOLERANCE = 0.000001
+
+
+def _grid_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    """Return the tolerance-sized grid cell containing a coordinate."""
+    return floor(latitude / COORDINATE_TOLERANCE), floor(longitude / COORDINATE_TOLERANCE)
+
+
+class CoordinateIndex:
+    """Finds the table row at a coordinate, within COORDINATE_TOLERANCE."""
+    
+    def __init__(self, latitudes, longitudes):
+        """
+        Index the coordinates of every row once.
+        
+        Args:
+            latitudes: Latitude per row (NaN where unknown)
+            longitudes: Longitude per row (NaN where unknown)
+        """
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        
+        # Tolerance-sized cells, so a lookup probes a few rows instead of the whole table
+        self._grid_index: Dict[Tuple[int, int], List[int]] = {}
+        
+        # Callers usually pass coordinates taken from the table, which a single hash probe finds
+        self._exact_index: Dict[Tuple[float, float], int] = {}
+        for i, (lat, lon) in enumerate(zip(self.latitudes.tolist(), self.longitudes.tolist())):
+            if lat != lat or lon != lon:  # NaN coordinates can never match
+                continue
+            self._grid_index.setdefault(_grid_cell(lat, lon), []).append(i)
+            self._exact_index.setdefault((lat, lon), i)
+    
+    def find(self, latitude: float, longitude: float) -> Optional[int]:
+        """
+        Find the first row at a coordinate.
+        
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+        
+        Returns:
+            Row position, or None if no row lies within the tolerance
+        """
+        match = self._exact_index.get((float(latitude), float(longitude)))
+        if match is not None:
+            return match
+        
+        # Any match lies in the target's grid cell or one of its neighbours
+        cell_lat, cell_lon = _grid_cell(latitude, longitude)
+        matches = [
+            i
+            for d_lat in (-1, 0, 1)
+            for d_lon in (-1, 0, 1)
+            for i in self._grid_index.get((cell_lat + d_lat, cell_lon + d_lon), ())
+            if abs(self.latitudes[i] - latitude) < COORDINATE_TOLERANCE
+            and abs(self.longitudes[i] - longitude) < COORDINATE_TOLERANCE
+        ]
+        return min(matches) if matches else None
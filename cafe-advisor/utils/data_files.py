@@ -0,0 +1,62 @@
+"""Shared helpers for reading the project's tabular data files."""
+
+import logging
+import os
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Use PyArrow's multithreaded CSV parser (and Parquet copies of CSVs) when it is installed
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# pandas CSV engine to read with
+CSV_ENGINE = "pyarrow" if PYARROW_AVAILABLE else "c"
+
+# Column types of the property (demographics) CSV. Lat-Long repeats across properties, so it is
+# dictionary-encoded (category); the affluence ratio stays float64 so its values reach the LLM
+# prompts unrounded.
+PROPERTY_DTYPES = {
+    'Lat-Long': 'category',
+    'Household income above 5 LPA': 'int32',
+    'Household income above 10 LPA': 'int32',
+    'Household income above 20 LPA': 'int32',
+    'Population (0-18 Yrs)': 'int32',
+    'Population (18-60 Yrs)': 'int32',
+    'Population (Above 60 Yrs)': 'int32',
+    'Total Retail Shops': 'int32',
+    'Total Brands Density': 'int32',
+    'Affluence Indicator': 'float64',
+    'Overall Footfall Score': 'int32',
+    'Branded Footfall Score': 'int32'
+}
+
+
+def load_property_frame(csv_path: str) -> pd.DataFrame:
+    """
+    Read the property CSV, or its Parquet copy when that is up to date.
+    
+    The first read parses the CSV and saves a Parquet copy next to it; later reads
+    load the typed, columnar copy until the CSV changes.
+    
+    Args:
+        csv_path: Path to the property CSV
+        
+    Returns:
+        Property DataFrame
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    if (PYARROW_AVAILABLE and os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        return pd.read_parquet(parquet_path)
+    
+    df = pd.read_csv(csv_path, engine=CSV_ENGINE, usecols=list(PROPERTY_DTYPES), dtype=PROPERTY_DTYPES)
+    if PYARROW_AVAILABLE:
+        try:
+            df.to_parquet(parquet_path, index=False)
+        except OSError as e:
+            logger.warning(f"Could not cache property data as Parquet: {e}")
+    return df
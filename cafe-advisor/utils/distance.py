@@ -0,0 +1,42 @@
+"""Great-circle distance helpers shared by the workflow nodes and chain detection."""
+
+import numpy as np
+
+# Mean Earth radius used for all distance calculations
+EARTH_RADIUS_KM = 6371
+
+
+def haversine_term(lat1_rad, lon1_rad, lat2_rad, lon2_rad) -> np.ndarray:
+    """
+    Haversine of the central angle between points given in radians (0 to 1).
+    
+    It grows monotonically with distance, so threshold checks can compare it against the
+    term of the threshold distance instead of converting every pair to kilometers. The
+    result is clipped to [0, 1], since rounding can push near-antipodal pairs just past 1.
+    """
+    a = (np.sin((lat2_rad - lat1_rad) / 2) ** 2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin((lon2_rad - lon1_rad) / 2) ** 2)
+    return np.clip(a, 0.0, 1.0)
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in kilometers between points given in degrees.
+    
+    Inputs broadcast like NumPy arrays, so one call can measure from a point to many
+    targets in a single vectorized pass.
+    
+    Args:
+        lat1: Latitude(s) of the origin
+        lon1: Longitude(s) of the origin
+        lat2: Latitude(s) of the targets
+        lon2: Longitude(s) of the targets
+    
+    Returns:
+        Distance to each target in kilometers
+    """
+    a = haversine_term(
+        np.radians(np.asarray(lat1, dtype=np.float64)), np.radians(np.asarray(lon1, dtype=np.float64)),
+        np.radians(np.asarray(lat2, dtype=np.float64)), np.radians(np.asarray(lon2, dtype=np.float64))
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
@@ -1,15 +1,65 @@
 """Geocoding utility using geopy."""
 
-import time
+from functools import lru_cache
 from geopy.geocoders import Nominatim
 from typing import Dict, Any, Optional
+from utils.rate_limiter import RateLimiter
+
+
+# Reverse-geocode results are cached per ~11m cell (coordinates rounded to 4 decimals)
+COORDINATE_PRECISION = 4
+GEOCODE_CACHE_SIZE = 4096
+
+# Nominatim's usage policy allows 1 request per second, shared by every thread in the process
+_nominatim_rate_limiter = RateLimiter(1)
+
+
+@lru_cache(maxsize=1)
+def _get_geolocator() -> Nominatim:
+    """Return the process-wide Nominatim client."""
+    return Nominatim(user_agent="business-advisor")
+
+
+@lru_cache(maxsize=GEOCODE_CACHE_SIZE)
+def _reverse_geocode_cell(latitude: float, longitude: float) -> Dict[str, Any]:
+    """
+    Reverse geocode a rounded coordinate (cached; failures are not cached).
+    
+    Args:
+        latitude: Latitude rounded to COORDINATE_PRECISION
+        longitude: Longitude rounded to COORDINATE_PRECISION
+        
+    Returns:
+        Dictionary with address information
+    """
+    # Waits only if another request went out less than a second ago
+    _nominatim_rate_limiter.acquire()
+    location = _get_geolocator().reverse(f"{latitude}, {longitude}")
+    
+    if location and location.raw:
+        address = location.raw.get('address', {})
+        return {
+            'area_name': Geocoder._extract_area_name(address),
+            'city': address.get('city') or address.get('town') or address.get('village'),
+            'state': address.get('state'),
+            'country': address.get('country'),
+            'full_address': location.address
+        }
+    else:
+        return {
+            'area_name': 'Unknown',
+            'city': 'Unknown',
+            'state': 'Unknown',
+            'country': 'Unknown',
+            'full_address': 'Unknown'
+        }
 
 
 class Geocoder:
     """Wrapper for geopy geocoding functionality."""
     
     def __init__(self):
-        self.geolocator = Nominatim(user_agent="business-advisor")
+        self.geolocator = _get_geolocator()
         
     def reverse_geocode(self, latitude: float, longitude: float) -> Dict[str, Any]:
         """
@@ -23,30 +73,16 @@ class Geocoder:
             Dictionary with address information
         """
         try:
-            time.sleep(1)  # Rate limiting
-            location = self.geolocator.reverse(f"{latitude}, {longitude}")
-            
-            if location and location.raw:
-                address = location.raw.get('address', {})
-                return {
-                    'area_name': self._extract_area_name(address),
-                    'city': address.get('city') or address.get('town') or address.get('village'),
-                    'state': address.get('state'),
-                    'country': address.get('country'),
-                    'full_address': location.address
-                }
-            else:
-                return {
-                    'area_name': 'Unknown',
-                    'city': 'Unknown',
-                    'state': 'Unknown',
-                    'country': 'Unknown',
-                    'full_address': 'Unknown'
-                }
+            # Copy so callers cannot modify the cached entry
+            return dict(_reverse_geocode_cell(
+                round(latitude, COORDINATE_PRECISION),
+                round(longitude, COORDINATE_PRECISION)
+            ))
         except Exception as e:
             raise Exception(f"Error in reverse geocoding: {str(e)}")
             
-    def _extract_area_name(self, address: Dict[str, Any]) -> str:
+    @staticmethod
+    def _extract_area_name(address: Dict[str, Any]) -> str:
         """
         Extract area name from address components.
         
@@ -1,17 +1,109 @@
 """LLM-based brand detection for identifying branded vs local businesses."""
 
 import logging
-from typing import Dict, Any, List
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, TypedDict
+import orjson
 from utils.api_clients import OpenAIClient
+from utils.database import get_brand_classifications, store_brand_classifications
 
 logger = logging.getLogger(__name__)
 
+# Number of classification requests sent to the LLM at once
+MAX_BRAND_WORKERS = 8
+
+# Classifications remembered per detector (chain names repeat across searches)
+BRAND_CACHE_SIZE = 4096
+
+# Businesses classified per LLM request in batch mode
+BRAND_BATCH_SIZE = 25
+
+# Well-known chains recognized without an LLM call: name fragment (lower-case, no apostrophes) -> brand
+KNOWN_BRANDS = {
+    "starbucks": "Starbucks",
+    "cafe coffee day": "Cafe Coffee Day",
+    "ccd": "Cafe Coffee Day",
+    "barista": "Barista",
+    "costa coffee": "Costa Coffee",
+    "chaayos": "Chaayos",
+    "third wave coffee": "Third Wave Coffee",
+    "blue tokai": "Blue Tokai",
+    "tim hortons": "Tim Hortons",
+    "dunkin": "Dunkin'",
+    "mcdonalds": "McDonald's",
+    "kfc": "KFC",
+    "burger king": "Burger King",
+    "dominos": "Domino's",
+    "pizza hut": "Pizza Hut",
+    "subway": "Subway",
+    "haldirams": "Haldiram's",
+    "bikanervala": "Bikanervala",
+    "nike": "Nike",
+    "adidas": "Adidas",
+    "puma": "Puma",
+    "reebok": "Reebok",
+    "skechers": "Skechers",
+    "bata": "Bata",
+    "woodland": "Woodland",
+    "apollo pharmacy": "Apollo Pharmacy",
+    "medplus": "MedPlus",
+    "lenskart": "Lenskart",
+    "dmart": "DMart",
+    "big bazaar": "Big Bazaar",
+    "reliance trends": "Reliance Trends",
+    "reliance fresh": "Reliance Fresh"
+}
+
+# Single alternation over the lexicon, longest fragments first so "cafe coffee day" wins over shorter overlaps
+_KNOWN_BRAND_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(fragment) for fragment in sorted(KNOWN_BRANDS, key=len, reverse=True)) + r")\b"
+)
+
+
+class BrandClassification(TypedDict):
+    """Brand classification returned for each business."""
+    
+    is_branded: bool
+    brand_name: str
+    confidence: float
+    reasoning: str
+    classification_type: str
+
+
+def _match_known_brand(business_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Classify a business whose name contains a well-known chain, without calling the LLM.
+    
+    Args:
+        business_name: Name of the business
+    
+    Returns:
+        Brand classification, or None if the name matches no known chain
+    """
+    match = _KNOWN_BRAND_PATTERN.search(business_name.lower().replace("'", "").replace("\u2019", ""))
+    if match is None:
+        return None
+    
+    brand_name = KNOWN_BRANDS[match.group(0)]
+    return {
+        "is_branded": True,
+        "brand_name": brand_name,
+        "confidence": 0.98,
+        "reasoning": f"Name contains the well-known chain {brand_name}",
+        "classification_type": "branded"
+    }
+
+
 class LLMBrandDetector:
     """Uses LLM to intelligently identify branded vs local businesses."""
     
     def __init__(self):
         """Initialize the LLM brand detector."""
         self.openai_client = OpenAIClient()
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
         logger.info("LLM Brand Detector initialized")
     
     def identify_brand_status(self, business_name: str, business_type: str = "business", 
@@ -27,6 +119,23 @@ class LLMBrandDetector:
         Returns:
             Dictionary with brand classification and confidence
         """
+        # Well-known chains are recognized by name alone
+        known_brand = _match_known_brand(business_name)
+        if known_brand is not None:
+            return known_brand
+        
+        # The classification depends on the brand, not the branch, so repeats are served from cache
+        cache_key = (business_name.lower(), business_type)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Classifications from earlier runs are kept in the database
+        stored = get_brand_classifications([cache_key[0]], business_type).get(cache_key[0])
+        if stored is not None:
+            self._remember(cache_key, stored)
+            return dict(stored)
+        
         try:
             # Create prompt for LLM
             prompt = self._create_brand_identification_prompt(
@@ -37,7 +146,20 @@ class LLMBrandDetector:
             response = self.openai_client.generate_brand_classification(prompt)
             
             # Parse response
-            return self._parse_brand_response(response)
+            brand_info = self._parse_brand_response(response)
+            if brand_info is None:
+                # Not cached or stored, so the name is classified again next time
+                return {
+                    "is_branded": False,
+                    "brand_name": "",
+                    "confidence": 0.5,
+                    "reasoning": "Error in parsing response",
+                    "classification_type": "local"
+                }
+            
+            self._remember(cache_key, brand_info)
+            store_brand_classifications({cache_key[0]: brand_info}, business_type)
+            return dict(brand_info)
             
         except Exception as e:
             logger.error(f"Error in LLM brand detection for {business_name}: {e}")
@@ -62,23 +184,167 @@ class LLMBrandDetector:
         Returns:
             List of businesses with brand classification added
         """
-        classified_businesses = []
+        return [
+            {**business, **brand_info}
+            for business, brand_info in zip(businesses, self.batch_classify_brands(businesses, business_type))
+        ]
+    
+    def batch_classify_brands(self, businesses: List[Dict],
+                              business_type: str = "business") -> List[BrandClassification]:
+        """
+        Classify multiple businesses as branded or local, several per LLM request.
         
-        for business in businesses:
-            business_name = business.get('name', '')
-            location_context = business.get('area_name', '')
+        Args:
+            businesses: List of business dictionaries
+            business_type: Type of business for context
             
-            # Get brand classification
-            brand_info = self.identify_brand_status(
-                business_name, business_type, location_context
-            )
+        Returns:
+            Brand classification per business, in input order
+        """
+        # Classify each distinct name once, with the first business as its location context
+        first_by_key = {}
+        for business in businesses:
+            first_by_key.setdefault(business.get('name', '').lower(), business)
+        
+        brand_infos = {}
+        pending = []
+        for key, business in first_by_key.items():
+            brand_info = _match_known_brand(business.get('name', ''))
+            if brand_info is None:
+                brand_info = self._get_cached((key, business_type))
+            if brand_info is not None:
+                brand_infos[key] = brand_info
+            else:
+                pending.append(business)
+        
+        # Names classified in earlier runs are read from the database in one query
+        if pending:
+            stored = get_brand_classifications([business.get('name', '').lower() for business in pending], business_type)
+            for key, brand_info in stored.items():
+                self._remember((key, business_type), brand_info)
+                brand_infos[key] = dict(brand_info)
+            pending = [business for business in pending if business.get('name', '').lower() not in stored]
+        
+        # Uncached names go to the LLM several per request, with requests sent concurrently
+        batches = [pending[i:i + BRAND_BATCH_SIZE] for i in range(0, len(pending), BRAND_BATCH_SIZE)]
+        
+        def classify(batch: List[Dict]) -> List[Dict[str, Any]]:
+            return self._classify_batch(batch, business_type)
+        
+        with ThreadPoolExecutor(max_workers=MAX_BRAND_WORKERS) as executor:
+            for batch, batch_infos in zip(batches, executor.map(classify, batches)):
+                for business, brand_info in zip(batch, batch_infos):
+                    brand_infos[business.get('name', '').lower()] = brand_info
+        
+        # Copies, since businesses sharing a name would otherwise share one dict
+        return [dict(brand_infos[business.get('name', '').lower()]) for business in businesses]
+    
+    def _classify_batch(self, batch: List[Dict], business_type: str) -> List[Dict[str, Any]]:
+        """
+        Classify several businesses with a single LLM request.
+        
+        Businesses missing from the answer (or the whole batch, if the request fails)
+        are classified one at a time instead.
+        
+        Args:
+            batch: Businesses with distinct names
+            business_type: Type of business for context
+        
+        Returns:
+            Brand classification per business, in batch order
+        """
+        classifications = {}
+        try:
+            prompt = self._create_batch_prompt(batch, business_type)
+            response = self.openai_client.generate_brand_classification(prompt)
             
-            # Add classification to business
-            business_copy = business.copy()
-            business_copy.update(brand_info)
-            classified_businesses.append(business_copy)
+            for item in orjson.loads(response).get("classifications", []):
+                try:
+                    classifications[int(item["id"])] = self._coerce_classification(item)
+                except (KeyError, TypeError, ValueError):
+                    continue
+        except Exception as e:
+            logger.error(f"Error in batch LLM brand detection: {e}")
+        
+        results = []
+        classified = {}
+        for i, business in enumerate(batch):
+            business_name = business.get('name', '')
+            brand_info = classifications.get(i)
+            if brand_info is None:
+                brand_info = self.identify_brand_status(
+                    business_name, business_type, business.get('area_name', '')
+                )
+            else:
+                self._remember((business_name.lower(), business_type), brand_info)
+                classified[business_name.lower()] = brand_info
+                brand_info = dict(brand_info)
+            results.append(brand_info)
         
-        return classified_businesses
+        store_brand_classifications(classified, business_type)
+        return results
+    
+    def _get_cached(self, cache_key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a remembered classification, or None."""
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        return dict(cached) if cached is not None else None
+    
+    def _remember(self, cache_key: Tuple[str, str], brand_info: Dict[str, Any]):
+        """Remember a classification, evicting the oldest entry when the cache is full."""
+        with self._cache_lock:
+            if len(self._cache) >= BRAND_CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[cache_key] = brand_info
+    
+    def _create_batch_prompt(self, batch: List[Dict], business_type: str) -> str:
+        """
+        Create a prompt for LLM to classify several businesses at once.
+        
+        Args:
+            batch: Businesses to classify; their list positions are used as ids
+            business_type: Type of business
+        
+        Returns:
+            Formatted prompt string
+        """
+        entries = [
+            {"id": i, "name": business.get('name', ''), "location": business.get('area_name', '')}
+            for i, business in enumerate(batch)
+        ]
+        prompt = f"""
+You are an expert business analyst specializing in identifying branded chains vs local independent businesses.
+
+For each {business_type} below, determine if it's a branded chain (part of a larger franchise/chain) or a local independent business:
+
+{orjson.dumps(entries, option=orjson.OPT_INDENT_2).decode()}
+
+For each business:
+1. Determine if it is a branded chain or a local independent business
+2. If it's a branded chain, identify the brand name
+3. Provide a confidence score (0.0 to 1.0) in your classification
+4. Explain your reasoning in 1-2 sentences
+
+Examples of branded chains: CCD (Cafe Coffee Day), Starbucks, McDonald's, Skechers, Nike
+Examples of local independent businesses: Sharma's Cafe, Mohali Book Corner, Family Shoe Store
+
+Respond in JSON format with a "classifications" array holding one object per business, using its id:
+
+RESPONSE FORMAT:
+{{
+  "classifications": [
+    {{
+      "id": 0,
+      "is_branded": true/false,
+      "brand_name": "brand name if branded, or original name if local",
+      "confidence": 0.0-1.0,
+      "reasoning": "explanation",
+      "classification_type": "branded/local"
+    }}
+  ]
+}}
+"""
+        return prompt.strip()
     
     def _create_brand_identification_prompt(self, business_name: str, 
                                           business_type: str, 
@@ -139,7 +405,7 @@ RESPONSE FORMAT:
 """
         return prompt.strip()
     
-    def _parse_brand_response(self, response: str) -> Dict[str, Any]:
+    def _parse_brand_response(self, response: str) -> Optional[BrandClassification]:
         """
         Parse the LLM response for brand classification.
         
@@ -147,35 +413,22 @@ RESPONSE FORMAT:
             response: LLM response string
             
         Returns:
-            Parsed brand classification dictionary
+            Parsed brand classification dictionary, or None if the response could not be parsed
         """
         try:
-            import json
-            
-            # Clean and parse JSON response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]  # Remove ```json
-            if response.endswith("```"):
-                response = response[:-3]  # Remove ```
-            
-            parsed = json.loads(response)
-            
-            # Ensure all required fields are present
-            return {
-                "is_branded": bool(parsed.get("is_branded", False)),
-                "brand_name": str(parsed.get("brand_name", "")),
-                "confidence": float(parsed.get("confidence", 0.5)),
-                "reasoning": str(parsed.get("reasoning", "No reasoning provided")),
-                "classification_type": str(parsed.get("classification_type", "local"))
-            }
+            # Requests use JSON mode, so the response is a bare JSON object
+            return self._coerce_classification(orjson.loads(response))
         except Exception as e:
             logger.error(f"Error parsing brand response: {e}")
-            # Return default classification
-            return {
-                "is_branded": False,
-                "brand_name": "",
-                "confidence": 0.5,
-                "reasoning": "Error in parsing response",
-                "classification_type": "local"
-            }
\ No newline at end of file
+            return None
+    
+    @staticmethod
+    def _coerce_classification(parsed: Dict[str, Any]) -> BrandClassification:
+        """Ensure all required classification fields are present with the right types."""
+        return {
+            "is_branded": bool(parsed.get("is_branded", False)),
+            "brand_name": str(parsed.get("brand_name", "")),
+            "confidence": float(parsed.get("confidence", 0.5)),
+            "reasoning": str(parsed.get("reasoning", "No reasoning provided")),
+            "classification_type": str(parsed.get("classification_type", "local"))
+        }
@@ -1,17 +1,50 @@
 """Sentiment analysis utility using VADER."""
 
 import logging
-from typing import Dict, Any, List
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Distinct review texts whose VADER scores are remembered across batches
+SENTIMENT_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=1)
+def _create_vader_analyzer() -> SentimentIntensityAnalyzer:
+    """
+    Create the process-wide VADER analyzer.
+    
+    Constructing one reads and parses the lexicon and emoji files, so every
+    SentimentAnalyzer shares a single instance; polarity_scores keeps no state
+    between calls.
+    """
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=SENTIMENT_CACHE_SIZE)
+def _polarity_scores(text: str) -> Tuple[float, float, float, float]:
+    """
+    Score one text with the process's VADER analyzer, memoized per text.
+    
+    Scores depend only on the text, so reviews seen in earlier batches are not
+    scored again.
+    
+    Returns:
+        Tuple of (compound, pos, neu, neg)
+    """
+    scores = _create_vader_analyzer().polarity_scores(text)
+    return scores["compound"], scores["pos"], scores["neu"], scores["neg"]
+
+
 class SentimentAnalyzer:
     """VADER-based sentiment analyzer for reviews."""
     
     def __init__(self):
         """Initialize VADER sentiment analyzer."""
-        self.analyzer = SentimentIntensityAnalyzer()
+        self.analyzer = _create_vader_analyzer()
         logger.info("VADER sentiment analyzer initialized")
     
     def analyze_reviews_batch(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -33,17 +66,17 @@ class SentimentAnalyzer:
             if not text or len(text) < 10:
                 continue
             
-            # Analyze sentiment
-            scores = self.analyzer.polarity_scores(text)
+            # Analyze sentiment; scraped reviews often repeat verbatim, so repeats come from the memo
+            compound, pos, neu, neg = _polarity_scores(text)
             
             # Add sentiment to review
             review_with_sentiment = review.copy()
             review_with_sentiment["sentiment"] = {
-                "compound": scores["compound"],
-                "pos": scores["pos"],
-                "neu": scores["neu"],
-                "neg": scores["neg"],
-                "label": self._get_sentiment_label(scores["compound"])
+                "compound": compound,
+                "pos": pos,
+                "neu": neu,
+                "neg": neg,
+                "label": self._get_sentiment_label(compound)
             }
             
             analyzed_reviews.append(review_with_sentiment)
@@ -69,26 +102,15 @@ class SentimentAnalyzer:
                 "total_reviews": 0
             }
         
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-        compound_scores = []
-        
-        for review in reviews:
-            sentiment = review.get("sentiment", {})
-            compound = sentiment.get("compound", 0)
-            compound_scores.append(compound)
-            
-            label = sentiment.get("label", "neutral")
-            if label == "positive":
-                positive_count += 1
-            elif label == "negative":
-                negative_count += 1
-            else:
-                neutral_count += 1
-        
         total = len(reviews)
-        avg_compound = sum(compound_scores) / total if compound_scores else 0
+        compound_scores = np.fromiter(
+            (review.get("sentiment", {}).get("compound", 0) for review in reviews), dtype=np.float64, count=total
+        )
+        
+        # Label codes 0 = positive, 1 = negative, 2 = neutral, using the _get_sentiment_label thresholds
+        labels = np.where(compound_scores >= 0.05, 0, np.where(compound_scores <= -0.05, 1, 2))
+        positive_count, negative_count, neutral_count = np.bincount(labels, minlength=3).tolist()
+        avg_compound = float(compound_scores.mean())
         
         return {
             "average_sentiment": avg_compound,
@@ -1,6 +1,12 @@
 """Main execution script."""
 
+import logging
 import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from types import MappingProxyType
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -11,16 +17,85 @@ except ImportError:
 from typing import Dict, Any, List, Optional
 from agents.workflow import create_workflow
 from agents.state import BusinessAnalysisState
+from config.settings import ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_TTL
+from utils.api_clients import ApiError
 
-def run_business_analysis(user_query: str):
-    """Run complete business analysis."""
-    
-    # Initialize workflow
-    workflow = create_workflow()
+logger = logging.getLogger(__name__)
+
+# Shared read-only stand-in for missing result sections
+_EMPTY = MappingProxyType({})
+
+# Completed analyses by normalized query -> (timestamp, result), oldest first
+_analysis_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+_analysis_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (case and whitespace insensitive)."""
+    return " ".join(query.lower().split())
+
+
+def _get_cached_analysis(key: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh cached analysis for a normalized query, if any."""
+    with _analysis_cache_lock:
+        entry = _analysis_cache.get(key)
+        if entry is None:
+            _analysis_cache_stats["misses"] += 1
+            return None
+        if time.monotonic() - entry[0] > ANALYSIS_CACHE_TTL:
+            del _analysis_cache[key]
+            _analysis_cache_stats["misses"] += 1
+            return None
+        _analysis_cache.move_to_end(key)
+        _analysis_cache_stats["hits"] += 1
+        # Shallow copy so callers can add fields without touching the cached entry
+        return dict(entry[1])
+
+
+def _store_cached_analysis(key: str, result: Dict[str, Any]) -> None:
+    """Cache a completed analysis, evicting the least recently used entry when full."""
+    with _analysis_cache_lock:
+        _analysis_cache[key] = (time.monotonic(), dict(result))
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+
+def invalidate_cached_analyses(area_name: Optional[str] = None) -> int:
+    """
+    Evict cached analyses, e.g. after the data for an area was refreshed.
     
-    # Create initial state
-    initial_state: BusinessAnalysisState = {
-        "business_query": user_query,
+    Args:
+        area_name: Only evict analyses of this area (case-insensitive); all if omitted
+        
+    Returns:
+        Number of evicted analyses
+    """
+    with _analysis_cache_lock:
+        if area_name is None:
+            evicted = list(_analysis_cache)
+        else:
+            area = area_name.strip().lower()
+            evicted = [
+                key for key, (_, result) in _analysis_cache.items()
+                if str(result.get("area_name") or "").strip().lower() == area
+            ]
+        for key in evicted:
+            del _analysis_cache[key]
+    return len(evicted)
+
+
+def analysis_cache_stats() -> Dict[str, int]:
+    """Hit and miss counts of the analysis cache, plus its current size."""
+    with _analysis_cache_lock:
+        return {**_analysis_cache_stats, "size": len(_analysis_cache)}
+
+
+def _initial_state(business_query: str) -> BusinessAnalysisState:
+    """Build a fresh initial state for a query (new containers each call, since nodes may mutate them)."""
+    return {
+        "business_query": business_query,
         "business_type": "",
         "demographic_data": {},
         "latitude": 0.0,
@@ -38,75 +113,143 @@ def run_business_analysis(user_query: str):
         "error": "",
         "messages": []
     }
+
+
+def _delete_checkpoints(checkpointer, thread_id: str) -> bool:
+    """
+    Delete every checkpoint of a thread, so finished runs do not accumulate on disk.
     
-    # Run workflow
-    print("🚀 Starting business analysis...\n")
-    result = workflow.invoke(initial_state)
+    Returns:
+        Whether the checkpoints were deleted
+    """
+    try:
+        delete_thread = getattr(checkpointer, "delete_thread", None)
+        if delete_thread is not None:
+            delete_thread(thread_id)
+            return True
+        
+        # Older SqliteSaver releases have no delete_thread
+        with checkpointer.conn:
+            for table in ("checkpoints", "writes"):
+                checkpointer.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+        return True
+    except Exception as e:
+        logger.warning(f"Could not delete checkpoints of thread {thread_id}: {e}")
+        return False
+
+
+def _invoke_workflow(workflow, initial_state: BusinessAnalysisState, thread_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the workflow, under a checkpoint thread when the caller names one.
+    
+    Passing the thread_id of a run that stopped part-way resumes it from the
+    last completed node instead of starting over. A thread whose run already
+    finished has nothing to resume, so its old checkpoints are cleared and the
+    query starts over, rather than running on top of the old state (whose list
+    reducers would append to it). Checkpoints are deleted once they are not
+    needed for a resume, i.e. after a successful run. Without a thread_id the
+    run is not checkpointed at all.
+    
+    Args:
+        workflow: Compiled LangGraph workflow (checkpointed when thread_id is given)
+        initial_state: State to start a fresh run with
+        thread_id: Checkpoint thread to resume or record the run under
+        
+    Returns:
+        Final workflow state
+    """
+    checkpointer = workflow.checkpointer
+    if not thread_id or checkpointer is None:
+        return workflow.invoke(initial_state)
+    
+    config = {"configurable": {"thread_id": thread_id}}
+    snapshot = workflow.get_state(config)
+    resume = bool(snapshot.next)
+    if not resume and snapshot.values and not _delete_checkpoints(checkpointer, thread_id):
+        # The old state could not be cleared, so start over on a new thread instead
+        config = {"configurable": {"thread_id": uuid.uuid4().hex}}
+    
+    # A failed run on the caller's thread keeps its checkpoints so it can be resumed
+    keep_checkpoints = True
+    try:
+        result = workflow.invoke(None if resume else initial_state, config)
+        keep_checkpoints = bool(result.get("error"))
+        return result
+    finally:
+        if not keep_checkpoints or config["configurable"]["thread_id"] != thread_id:
+            _delete_checkpoints(checkpointer, config["configurable"]["thread_id"])
+
+
+def run_business_analysis(user_query: str, thread_id: Optional[str] = None):
+    """Run complete business analysis."""
     
-    # Print results
-    print("\n" + "="*60)
-    print("📊 BUSINESS ANALYSIS COMPLETE")
-    print("="*60)
+    # Initialize workflow (compiled once per process; checkpointed only when a thread is named)
+    workflow = create_workflow(checkpointed=thread_id is not None)
     
-    print(f"\n📍 Location: {result.get('area_name', 'N/A')}, {result.get('city', 'N/A')}")
-    print(f"🏪 Business Type: {result.get('business_type', 'N/A')}")
+    # Create initial state
+    initial_state = _initial_state(user_query)
     
-    print(f"\n👥 Demographics:")
-    demographics = result.get('demographics', {}) or {}
-    print(f"   Population: {demographics.get('population', 'N/A') if demographics else 'N/A'}")
+    # Run workflow
+    print("🚀 Starting business analysis...\n")
+    result = _invoke_workflow(workflow, initial_state, thread_id)
     
-    nearby_businesses = result.get('nearby_businesses', []) or []
-    print(f"\n🏪 Competition: {len(nearby_businesses)} competitors")
+    # Print results (collected and written in one call)
+    demographics = result.get('demographics') or _EMPTY
+    social_validation = result.get('social_validation') or _EMPTY
     
-    print(f"\n📱 Social Media Validation:")
-    social_validation = result.get('social_validation', {}) or {}
+    lines = [
+        "\n" + "="*60,
+        "📊 BUSINESS ANALYSIS COMPLETE",
+        "="*60,
+        f"\n📍 Location: {result.get('area_name', 'N/A')}, {result.get('city', 'N/A')}",
+        f"🏪 Business Type: {result.get('business_type', 'N/A')}",
+        "\n👥 Demographics:",
+        f"   Population: {demographics.get('population', 'N/A')}",
+        f"\n🏪 Competition: {len(result.get('nearby_businesses') or ())} competitors",
+        "\n📱 Social Media Validation:"
+    ]
     if social_validation:
-        print(f"   {social_validation.get('assessment', 'N/A')}")
-        print(f"   Local Posts: {social_validation.get('total_local_posts', 0)}")
-        print(f"   Confidence: {social_validation.get('confidence_score', 0)}%")
+        lines += [
+            f"   {social_validation.get('assessment', 'N/A')}",
+            f"   Local Posts: {social_validation.get('total_local_posts', 0)}",
+            f"   Confidence: {social_validation.get('confidence_score', 0)}%"
+        ]
     else:
-        print("   N/A")
-    
-    print(f"\n💡 Final Recommendation:")
-    print(result.get('recommendation', 'N/A'))
+        lines.append("   N/A")
+    lines += ["\n💡 Final Recommendation:", str(result.get('recommendation', 'N/A'))]
+    print("\n".join(lines))
     
     return result
 
 
-def analyze_property(business_query: str) -> Dict[str, Any]:
+def analyze_property(business_query: str, thread_id: Optional[str] = None) -> Dict[str, Any]:
     """Analyze property for business opportunity - interface for Streamlit app."""
+    # Repeat queries are served from the cache; resuming a specific thread always runs the workflow
+    cache_key = _normalize_query(business_query)
+    if thread_id is None:
+        cached = _get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+    
     try:
-        # Initialize workflow
-        workflow = create_workflow()
+        # Initialize workflow (compiled once per process; checkpointed only when a thread is named)
+        workflow = create_workflow(checkpointed=thread_id is not None)
         
         # Create initial state
-        initial_state: BusinessAnalysisState = {
-            "business_query": business_query,
-            "business_type": "",
-            "demographic_data": {},
-            "latitude": 0.0,
-            "longitude": 0.0,
-            "area_name": "",
-            "nearby_businesses": [],
-            "reviews_data": [],
-            "sentiment_analysis": {},
-            "llm_recommendation": {},
-            "chain_brands": [],
-            "nearby_amenities": {},
-            "chart_data": {},
-            "query_type": "business_analysis",
-            "current_step": "initialized",
-            "error": "",
-            "messages": []
-        }
+        initial_state = _initial_state(business_query)
         
         # Run workflow
-        result = workflow.invoke(initial_state)
+        result = _invoke_workflow(workflow, initial_state, thread_id)
+        
+        # Only cache successful runs so failures are retried
+        if not result.get("error"):
+            _store_cached_analysis(cache_key, result)
         
         # Return result
         return result
         
-    except Exception as e:
+    # Expected failures become an error result; anything else is a bug and propagates
+    except (ApiError, KeyError, ValueError) as e:
         return {
             "error": str(e)
         }
@@ -14,10 +14,12 @@ setup(
         "serpapi>=0.1.5",
         "vaderSentiment>=3.3.2",
         "pandas>=2.0.0",
+        "pyarrow>=14.0.0",
         "geopy>=2.4.0",
         "python-dotenv>=1.0.0",
         "groq>=0.5.0",
         "requests>=2.31.0",
+        "orjson>=3.9.0",
         "typing_extensions>=4.8.0"
     ],
     python_requires=">=3.10",
@@ -1,9 +1,15 @@
 """SQLite database utilities for storing reviews and nearby places data."""
 
+import atexit
+import math
+import operator
 import sqlite3
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import weakref
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Set, Union
 import os
 
 logger = logging.getLogger(__name__)
@@ -12,6 +18,157 @@ logger = logging.getLogger(__name__)
 SERP_API_DB = "data/serp_api_data.db"
 NEARBY_PLACES_DB = "data/nearby_places.db"
 
+# Applied to every connection: WAL lets readers run alongside a writer, and NORMAL
+# sync only fsyncs at checkpoints, which is safe in WAL mode
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=1073741824",  # Map up to 1 GiB so reads come straight from the page cache
+    "PRAGMA busy_timeout=5000"
+)
+
+# Prepared statements kept per connection by the sqlite3 module (default 128)
+_CACHED_STATEMENTS = 256
+
+# Insert statements shared by the store_* helpers, so every batch reuses the same prepared statement
+_INSERT_REVIEW_SQL = """
+    INSERT OR IGNORE INTO reviews
+    (business_name, business_id, review_text, rating, review_date, reviewer_name, latitude, longitude)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_PLACE_SQL = """
+    INSERT OR IGNORE INTO places
+    (name, address, rating, reviews_count, place_type, business_id, latitude, longitude, price_level, vicinity)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Review and place dictionary keys in insert-column order, with the value used when a key is missing.
+# Rows are built as getter({**defaults, **record}): one dict merge and one C-level tuple fetch
+# instead of a dict.get() call per column.
+_REVIEW_DEFAULTS = {"snippet": "", "rating": 0, "date": "", "source": ""}
+_review_values = operator.itemgetter(*_REVIEW_DEFAULTS)
+
+_PLACE_DEFAULTS = {
+    "name": "",
+    "address": "",
+    "rating": 0,
+    "reviews_count": 0,
+    "type": "",
+    "data_id": "",
+    "latitude": 0,
+    "longitude": 0,
+    "price": "",
+    "vicinity": ""
+}
+_place_row = operator.itemgetter(*_PLACE_DEFAULTS)
+
+# Amenities carry their type under amenity_type
+_amenity_row = operator.itemgetter(*("amenity_type" if field == "type" else field for field in _PLACE_DEFAULTS))
+
+# Names looked up per query when reading brand classifications (below SQLite's variable limit)
+_BRAND_LOOKUP_CHUNK = 500
+
+
+def _close_connections(connections: Dict[str, sqlite3.Connection]):
+    """Close a thread's connections."""
+    for conn in connections.values():
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    connections.clear()
+
+
+class _ThreadConnections:
+    """
+    One thread's connections, keyed by database path.
+    
+    Held only by the thread-local below, so it is collected when its thread exits
+    and the finalizer closes the connections; short-lived worker threads therefore
+    do not leave connections open.
+    """
+    
+    __slots__ = ("connections", "finalizer", "__weakref__")
+    
+    def __init__(self):
+        self.connections: Dict[str, sqlite3.Connection] = {}
+        self.finalizer = weakref.finalize(self, _close_connections, self.connections)
+
+
+# One connection per thread and database, reused across calls
+_local = threading.local()
+
+# Connection holders of live threads, closed at interpreter exit
+_thread_connections: "weakref.WeakSet[_ThreadConnections]" = weakref.WeakSet()
+_connections_lock = threading.Lock()
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Get this thread's connection to one of the databases, opening it on first use.
+    
+    Connections are created with tuned PRAGMAs and kept open until their thread
+    exits, so callers must not close them.
+    
+    Args:
+        db_path: Path to the database file
+    
+    Returns:
+        SQLite connection
+    """
+    holder = getattr(_local, "holder", None)
+    if holder is None:
+        holder = _local.holder = _ThreadConnections()
+        with _connections_lock:
+            _thread_connections.add(holder)
+    
+    conn = holder.connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        holder.connections[db_path] = conn
+    return conn
+
+
+@atexit.register
+def _close_all():
+    """Close every pooled connection at interpreter exit."""
+    with _connections_lock:
+        holders = list(_thread_connections)
+    for holder in holders:
+        holder.finalizer()
+
+
+def _bbox(latitude: float, longitude: float, radius: float) -> tuple:
+    """
+    Bounding box of a search radius, as query parameters.
+    
+    A degree of longitude shrinks with cos(latitude), so the longitude span is widened
+    accordingly instead of reusing the latitude span.
+    
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius: Search radius in meters
+    
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon)
+    """
+    lat_delta = radius / 111000
+    lon_delta = radius / (111000 * max(math.cos(math.radians(latitude)), 1e-6))
+    return (
+        latitude - lat_delta,
+        latitude + lat_delta,
+        longitude - lon_delta,
+        longitude + lon_delta
+    )
+
+
 def init_databases():
     """Initialize both databases with required tables."""
     try:
@@ -30,9 +187,58 @@ def init_databases():
         raise
 
 
+def _create_location_rtree(cursor: sqlite3.Cursor, table: str):
+    """
+    Create an R*Tree index over a table's coordinates, kept in sync by triggers.
+    
+    A b-tree on (latitude, longitude) can only range-scan latitude and then filters
+    longitude row by row; the R*Tree prunes on both axes at once. business_id is
+    carried as an auxiliary column, so lookups that only need it never read the table.
+    
+    Args:
+        cursor: Cursor on the table's database
+        table: Table with id, latitude, longitude and business_id columns
+    """
+    # Indexes built before business_id was carried along are rebuilt
+    cursor.execute("SELECT sql FROM sqlite_master WHERE name = ?", (f"{table}_rtree",))
+    existing = cursor.fetchone()
+    if existing is not None and "+business_id" not in existing[0]:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_rtree_insert")
+        cursor.execute(f"DROP TABLE {table}_rtree")
+    
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table}_rtree
+        USING rtree(id, min_lat, max_lat, min_lon, max_lon, +business_id)
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_rtree_insert AFTER INSERT ON {table}
+        WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+        BEGIN
+            INSERT INTO {table}_rtree
+            VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude, new.business_id);
+        END
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_rtree_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM {table}_rtree WHERE id = old.id;
+        END
+    """)
+    
+    # Index rows stored before the R*Tree existed
+    cursor.execute(f"""
+        INSERT INTO {table}_rtree
+        SELECT id, latitude, latitude, longitude, longitude, business_id FROM {table}
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        AND id NOT IN (SELECT id FROM {table}_rtree)
+    """)
+
+
 def _init_serp_api_db():
     """Initialize SerpAPI database with reviews table."""
-    conn = sqlite3.connect(SERP_API_DB)
+    conn = _get_conn(SERP_API_DB)
     cursor = conn.cursor()
     
     # Create reviews table
@@ -64,13 +270,58 @@ def _init_serp_api_db():
         ON reviews(business_id)
     """)
     
+    # Spatial index used by the radius queries
+    _create_location_rtree(cursor, "reviews")
+    
+    _create_brand_classification_table(cursor)
+    _create_property_analysis_table(cursor)
+    
     conn.commit()
-    conn.close()
+
+
+def _create_brand_classification_table(cursor: sqlite3.Cursor):
+    """Create the table of LLM brand classifications, keyed by lower-cased name and business type."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS brand_classifications (
+            business_name TEXT NOT NULL,
+            business_type TEXT NOT NULL,
+            classification TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (business_name, business_type)
+        ) WITHOUT ROWID
+    """)
+
+
+@lru_cache(maxsize=1)
+def _ensure_brand_classification_table():
+    """Create the brand classification table on first use, once per process."""
+    conn = _get_conn(SERP_API_DB)
+    with conn:
+        _create_brand_classification_table(conn.cursor())
+
+
+def _create_property_analysis_table(cursor: sqlite3.Cursor):
+    """Create the table of LLM property analyses, keyed by a hash of the analysis inputs."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS property_analyses (
+            analysis_key TEXT PRIMARY KEY,
+            analysis TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+    """)
+
+
+@lru_cache(maxsize=1)
+def _ensure_property_analysis_table():
+    """Create the property analysis table on first use, once per process."""
+    conn = _get_conn(SERP_API_DB)
+    with conn:
+        _create_property_analysis_table(conn.cursor())
 
 
 def _init_nearby_places_db():
     """Initialize nearby places database with places table."""
-    conn = sqlite3.connect(NEARBY_PLACES_DB)
+    conn = _get_conn(NEARBY_PLACES_DB)
     cursor = conn.cursor()
     
     # Create places table
@@ -103,8 +354,10 @@ def _init_nearby_places_db():
         ON places(place_type)
     """)
     
+    # Spatial index used by the radius queries
+    _create_location_rtree(cursor, "places")
+    
     conn.commit()
-    conn.close()
 
 
 def store_serp_reviews(business_name: str, business_id: str, reviews: List[Dict], 
@@ -120,32 +373,71 @@ def store_serp_reviews(business_name: str, business_id: str, reviews: List[Dict]
         longitude: Longitude of the business
     """
     try:
-        conn = sqlite3.connect(SERP_API_DB)
-        cursor = conn.cursor()
-        
-        for review in reviews:
-            cursor.execute("""
-                INSERT OR IGNORE INTO reviews 
-                (business_name, business_id, review_text, rating, review_date, reviewer_name, latitude, longitude)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                business_name,
-                business_id,
-                review.get("snippet", ""),
-                review.get("rating", 0),
-                review.get("date", ""),
-                review.get("source", ""),
-                latitude,
-                longitude
-            ))
-        
-        conn.commit()
-        conn.close()
+        rows = [
+            (business_name, business_id, *_review_values({**_REVIEW_DEFAULTS, **review}), latitude, longitude)
+            for review in reviews
+        ]
+        
+        # One transaction for the whole batch: a single commit instead of one per row
+        conn = _get_conn(SERP_API_DB)
+        with conn:
+            conn.executemany(_INSERT_REVIEW_SQL, rows)
         logger.info(f"Stored {len(reviews)} reviews for {business_name}")
     except Exception as e:
         logger.error(f"Error storing reviews for {business_name}: {e}")
 
 
+def iter_serp_reviews(latitude: float, longitude: float, radius: float = 3000,
+                      business_id: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream SerpAPI reviews from the database within a radius, one row at a time.
+    
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius: Search radius in meters (default: 3000)
+        business_id: Optional filter by business ID
+        
+    Yields:
+        Review dictionaries
+    """
+    cursor = _get_conn(SERP_API_DB).cursor()
+    
+    # Build query with optional business_id filter
+    if business_id:
+        cursor.execute("""
+            SELECT business_name, business_id, review_text AS snippet, rating, review_date AS date,
+                   reviewer_name AS source, latitude, longitude
+            FROM reviews
+            WHERE id IN (
+                SELECT id FROM reviews_rtree
+                WHERE max_lat >= ? AND min_lat <= ?
+                AND max_lon >= ? AND min_lon <= ?
+                AND business_id = ?
+            )
+        """, (
+            *_bbox(latitude, longitude, radius),
+            business_id
+        ))
+    else:
+        cursor.execute("""
+            SELECT business_name, business_id, review_text AS snippet, rating, review_date AS date,
+                   reviewer_name AS source, latitude, longitude
+            FROM reviews
+            WHERE id IN (
+                SELECT id FROM reviews_rtree
+                WHERE max_lat >= ? AND min_lat <= ?
+                AND max_lon >= ? AND min_lon <= ?
+            )
+        """, (
+            *_bbox(latitude, longitude, radius),
+        ))
+    
+    # Columns are aliased to the review dictionary keys
+    for row in cursor:
+        yield dict(row)
+
+
 def get_serp_reviews(latitude: float, longitude: float, radius: float = 3000, business_id: Optional[str] = None) -> List[Dict]:
     """
     Get SerpAPI reviews from the database within a radius.
@@ -160,54 +452,7 @@ def get_serp_reviews(latitude: float, longitude: float, radius: float = 3000, bu
         List of review dictionaries
     """
     try:
-        conn = sqlite3.connect(SERP_API_DB)
-        cursor = conn.cursor()
-        
-        # Build query with optional business_id filter
-        if business_id:
-            cursor.execute("""
-                SELECT business_name, business_id, review_text, rating, review_date, reviewer_name, latitude, longitude
-                FROM reviews 
-                WHERE latitude BETWEEN ? AND ? 
-                AND longitude BETWEEN ? AND ?
-                AND business_id = ?
-            """, (
-                latitude - radius/111000,  # Approximate conversion
-                latitude + radius/111000,
-                longitude - radius/111000,
-                longitude + radius/111000,
-                business_id
-            ))
-        else:
-            cursor.execute("""
-                SELECT business_name, business_id, review_text, rating, review_date, reviewer_name, latitude, longitude
-                FROM reviews 
-                WHERE latitude BETWEEN ? AND ? 
-                AND longitude BETWEEN ? AND ?
-            """, (
-                latitude - radius/111000,  # Approximate conversion
-                latitude + radius/111000,
-                longitude - radius/111000,
-                longitude + radius/111000
-            ))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        reviews = []
-        for row in rows:
-            reviews.append({
-                "business_name": row[0],
-                "business_id": row[1],
-                "snippet": row[2],
-                "rating": row[3],
-                "date": row[4],
-                "source": row[5],
-                "latitude": row[6],
-                "longitude": row[7]
-            })
-        
-        return reviews
+        return list(iter_serp_reviews(latitude, longitude, radius, business_id))
     except Exception as e:
         logger.error(f"Error retrieving reviews: {e}")
         return []
@@ -223,35 +468,71 @@ def store_nearby_places(places: List[Dict], latitude: float, longitude: float):
         longitude: Longitude of the search center
     """
     try:
-        conn = sqlite3.connect(NEARBY_PLACES_DB)
-        cursor = conn.cursor()
-        
-        for place in places:
-            cursor.execute("""
-                INSERT OR IGNORE INTO places 
-                (name, address, rating, reviews_count, place_type, business_id, latitude, longitude, price_level, vicinity)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                place.get("name", ""),
-                place.get("address", ""),
-                place.get("rating", 0),
-                place.get("reviews_count", 0),
-                place.get("type", ""),
-                place.get("data_id", ""),
-                place.get("latitude", 0),
-                place.get("longitude", 0),
-                place.get("price", ""),
-                place.get("vicinity", "")
-            ))
+        rows = [_place_row({**_PLACE_DEFAULTS, **place}) for place in places]
         
-        conn.commit()
-        conn.close()
+        conn = _get_conn(NEARBY_PLACES_DB)
+        with conn:
+            conn.executemany(_INSERT_PLACE_SQL, rows)
         logger.info(f"Stored {len(places)} nearby places")
     except Exception as e:
         logger.error(f"Error storing nearby places: {e}")
 
 
-def get_nearby_places(latitude: float, longitude: float, radius: float = 3000, place_type: Optional[str] = None) -> List[Dict]:
+def iter_nearby_places(latitude: float, longitude: float, radius: float = 3000,
+                       place_type: Optional[Union[str, List[str]]] = None) -> Iterator[Dict]:
+    """
+    Stream nearby places from the database within a radius, one row at a time.
+    
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius: Search radius in meters (default: 3000)
+        place_type: Optional filter by exact place type, or a list of accepted types
+        
+    Yields:
+        Place dictionaries
+    """
+    cursor = _get_conn(NEARBY_PLACES_DB).cursor()
+    
+    # Build query with optional place type filter (exact matches can use idx_places_type)
+    if place_type:
+        place_types = [place_type] if isinstance(place_type, str) else list(place_type)
+        placeholders = ", ".join("?" * len(place_types))
+        cursor.execute(f"""
+            SELECT name, address, rating, reviews_count, place_type AS type, business_id AS data_id,
+                   latitude, longitude, price_level AS price, vicinity
+            FROM places
+            WHERE id IN (
+                SELECT id FROM places_rtree
+                WHERE max_lat >= ? AND min_lat <= ?
+                AND max_lon >= ? AND min_lon <= ?
+            )
+            AND place_type IN ({placeholders})
+        """, (
+            *_bbox(latitude, longitude, radius),
+            *place_types
+        ))
+    else:
+        cursor.execute("""
+            SELECT name, address, rating, reviews_count, place_type AS type, business_id AS data_id,
+                   latitude, longitude, price_level AS price, vicinity
+            FROM places
+            WHERE id IN (
+                SELECT id FROM places_rtree
+                WHERE max_lat >= ? AND min_lat <= ?
+                AND max_lon >= ? AND min_lon <= ?
+            )
+        """, (
+            *_bbox(latitude, longitude, radius),
+        ))
+    
+    # Columns are aliased to the place dictionary keys
+    for row in cursor:
+        yield dict(row)
+
+
+def get_nearby_places(latitude: float, longitude: float, radius: float = 3000,
+                      place_type: Optional[Union[str, List[str]]] = None) -> List[Dict]:
     """
     Get nearby places from the database within a radius.
     
@@ -259,62 +540,13 @@ def get_nearby_places(latitude: float, longitude: float, radius: float = 3000, p
         latitude: Center latitude
         longitude: Center longitude
         radius: Search radius in meters (default: 3000)
-        place_type: Optional filter by place type
+        place_type: Optional filter by exact place type, or a list of accepted types
         
     Returns:
         List of place dictionaries
     """
     try:
-        conn = sqlite3.connect(NEARBY_PLACES_DB)
-        cursor = conn.cursor()
-        
-        # Build query with optional place type filter
-        if place_type:
-            cursor.execute("""
-                SELECT name, address, rating, reviews_count, place_type, business_id, latitude, longitude, price_level, vicinity
-                FROM places 
-                WHERE latitude BETWEEN ? AND ? 
-                AND longitude BETWEEN ? AND ?
-                AND place_type LIKE ?
-            """, (
-                latitude - radius/111000,
-                latitude + radius/111000,
-                longitude - radius/111000,
-                longitude + radius/111000,
-                f"%{place_type}%"
-            ))
-        else:
-            cursor.execute("""
-                SELECT name, address, rating, reviews_count, place_type, business_id, latitude, longitude, price_level, vicinity
-                FROM places 
-                WHERE latitude BETWEEN ? AND ? 
-                AND longitude BETWEEN ? AND ?
-            """, (
-                latitude - radius/111000,
-                latitude + radius/111000,
-                longitude - radius/111000,
-                longitude + radius/111000
-            ))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        places = []
-        for row in rows:
-            places.append({
-                "name": row[0],
-                "address": row[1],
-                "rating": row[2],
-                "reviews_count": row[3],
-                "type": row[4],
-                "data_id": row[5],
-                "latitude": row[6],
-                "longitude": row[7],
-                "price": row[8],
-                "vicinity": row[9]
-            })
-        
-        return places
+        return list(iter_nearby_places(latitude, longitude, radius, place_type))
     except Exception as e:
         logger.error(f"Error retrieving nearby places: {e}")
         return []
@@ -332,30 +564,13 @@ def store_amenities(amenities: List[Dict], latitude: float, longitude: float):
         longitude: Longitude of the search center
     """
     try:
-        conn = sqlite3.connect(NEARBY_PLACES_DB)
-        cursor = conn.cursor()
+        # Amenities without coordinates are placed at the search center
+        defaults = {**_PLACE_DEFAULTS, "amenity_type": "", "latitude": latitude, "longitude": longitude}
+        rows = [_amenity_row({**defaults, **amenity}) for amenity in amenities]
         
-        for amenity in amenities:
-            cursor.execute("""
-                INSERT OR IGNORE INTO places
-                (name, address, rating, reviews_count, place_type, business_id, 
-                 latitude, longitude, price_level, vicinity)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                amenity.get("name", ""),
-                amenity.get("address", ""),
-                amenity.get("rating", 0),
-                amenity.get("reviews_count", 0),
-                amenity.get("amenity_type", ""),  # Use amenity_type
-                amenity.get("data_id", ""),
-                amenity.get("latitude", latitude),
-                amenity.get("longitude", longitude),
-                amenity.get("price", ""),
-                amenity.get("vicinity", "")
-            ))
-        
-        conn.commit()
-        conn.close()
+        conn = _get_conn(NEARBY_PLACES_DB)
+        with conn:
+            conn.executemany(_INSERT_PLACE_SQL, rows)
         logger.info(f"Stored {len(amenities)} amenities")
         
     except Exception as e:
@@ -378,48 +593,35 @@ def get_amenities_by_type(latitude: float, longitude: float,
         Dictionary mapping amenity types to their lists of places
     """
     try:
-        conn = sqlite3.connect(NEARBY_PLACES_DB)
+        conn = _get_conn(NEARBY_PLACES_DB)
         cursor = conn.cursor()
         
-        results = {}
+        # Every requested type appears in the result, even when nothing is cached for it
+        results = {amenity_type: [] for amenity_type in amenity_types}
+        if not results:
+            return results
+        
+        # One query for all types; rows come back grouped by type, best rated first
+        placeholders = ", ".join("?" * len(results))
+        cursor.execute(f"""
+            SELECT name, address, rating, reviews_count, place_type AS amenity_type, business_id AS data_id,
+                   latitude, longitude, price_level AS price, vicinity
+            FROM places
+            WHERE id IN (
+                SELECT id FROM places_rtree
+                WHERE max_lat >= ? AND min_lat <= ?
+                AND max_lon >= ? AND min_lon <= ?
+            )
+            AND place_type IN ({placeholders})
+            ORDER BY place_type, rating DESC
+        """, (
+            *_bbox(latitude, longitude, radius),
+            *results
+        ))
         
-        for amenity_type in amenity_types:
-            cursor.execute("""
-                SELECT name, address, rating, reviews_count, place_type, business_id, 
-                       latitude, longitude, price_level, vicinity
-                FROM places
-                WHERE latitude BETWEEN ? AND ?
-                AND longitude BETWEEN ? AND ?
-                AND place_type = ?
-                ORDER BY rating DESC
-            """, (
-                latitude - radius/111000,
-                latitude + radius/111000,
-                longitude - radius/111000,
-                longitude + radius/111000,
-                amenity_type
-            ))
-            
-            rows = cursor.fetchall()
-            
-            places = []
-            for row in rows:
-                places.append({
-                    "name": row[0],
-                    "address": row[1],
-                    "rating": row[2],
-                    "reviews_count": row[3],
-                    "amenity_type": row[4],
-                    "data_id": row[5],
-                    "latitude": row[6],
-                    "longitude": row[7],
-                    "price": row[8],
-                    "vicinity": row[9]
-                })
-            
-            results[amenity_type] = places
+        for row in cursor:
+            results[row["amenity_type"]].append(dict(row))
         
-        conn.close()
         return results
         
     except Exception as e:
@@ -427,35 +629,150 @@ def get_amenities_by_type(latitude: float, longitude: float,
         return {}
 
 
+def get_brand_classifications(business_names: List[str], business_type: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Get stored LLM brand classifications.
+    
+    Args:
+        business_names: Lower-cased business names
+        business_type: Type of business the classifications were made for
+        
+    Returns:
+        Dictionary of business name to classification, for the names that have one
+    """
+    try:
+        _ensure_brand_classification_table()
+        conn = _get_conn(SERP_API_DB)
+        
+        classifications = {}
+        for i in range(0, len(business_names), _BRAND_LOOKUP_CHUNK):
+            chunk = business_names[i:i + _BRAND_LOOKUP_CHUNK]
+            cursor = conn.execute(f"""
+                SELECT business_name, classification
+                FROM brand_classifications
+                WHERE business_type = ? AND business_name IN ({",".join("?" * len(chunk))})
+            """, (business_type, *chunk))
+            classifications.update((name, json.loads(classification)) for name, classification in cursor)
+        
+        return classifications
+    except Exception as e:
+        logger.error(f"Error retrieving brand classifications: {e}")
+        return {}
+
+
+def store_brand_classifications(classifications: Dict[str, Dict[str, Any]], business_type: str):
+    """
+    Store LLM brand classifications so later runs skip the LLM for these names.
+    
+    Args:
+        classifications: Dictionary of lower-cased business name to classification
+        business_type: Type of business the classifications were made for
+    """
+    if not classifications:
+        return
+    
+    try:
+        _ensure_brand_classification_table()
+        conn = _get_conn(SERP_API_DB)
+        with conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO brand_classifications (business_name, business_type, classification)
+                VALUES (?, ?, ?)
+            """, [
+                (name, business_type, json.dumps(classification))
+                for name, classification in classifications.items()
+            ])
+    except Exception as e:
+        logger.error(f"Error storing brand classifications: {e}")
+
+
+def get_property_analyses(analysis_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get stored LLM property analyses.
+    
+    Args:
+        analysis_keys: Hashes of the analysis inputs
+        
+    Returns:
+        Dictionary of analysis key to analysis, for the keys that have one
+    """
+    try:
+        _ensure_property_analysis_table()
+        conn = _get_conn(SERP_API_DB)
+        
+        analyses = {}
+        for i in range(0, len(analysis_keys), _BRAND_LOOKUP_CHUNK):
+            chunk = analysis_keys[i:i + _BRAND_LOOKUP_CHUNK]
+            cursor = conn.execute(f"""
+                SELECT analysis_key, analysis
+                FROM property_analyses
+                WHERE analysis_key IN ({",".join("?" * len(chunk))})
+            """, chunk)
+            analyses.update((key, json.loads(analysis)) for key, analysis in cursor)
+        
+        return analyses
+    except Exception as e:
+        logger.error(f"Error retrieving property analyses: {e}")
+        return {}
+
+
+def store_property_analyses(analyses: Dict[str, Dict[str, Any]]):
+    """
+    Store LLM property analyses so repeated queries skip the LLM.
+    
+    Args:
+        analyses: Dictionary of analysis key to analysis
+    """
+    if not analyses:
+        return
+    
+    try:
+        _ensure_property_analysis_table()
+        conn = _get_conn(SERP_API_DB)
+        with conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO property_analyses (analysis_key, analysis)
+                VALUES (?, ?)
+            """, [(key, json.dumps(analysis)) for key, analysis in analyses.items()])
+    except Exception as e:
+        logger.error(f"Error storing property analyses: {e}")
+
+
 def clear_database(db_path: str):
     """
     Clear all data from a database.
     
+    Tables are dropped and recreated rather than emptied with DELETE: the R*Tree
+    triggers rule out SQLite's truncate optimization, so a DELETE would visit and
+    journal every row, while a DROP only releases pages.
+    
     Args:
         db_path: Path to the database file
     """
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
         
-        # Get all table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        # Get all table names (R*Tree shadow tables go with their virtual table)
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE '%\\_rtree%' ESCAPE '\\' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\';")
         tables = cursor.fetchall()
         
-        # Clear all tables
-        for table in tables:
-            cursor.execute(f"DELETE FROM {table[0]}")
+        # Dropping a table also drops its triggers and indexes; its R*Tree goes first
+        with conn:
+            for (table,) in tables:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}_rtree")
+                cursor.execute(f"DROP TABLE {table}")
         
-        conn.commit()
-        conn.close()
+        # Recreate the empty schema
+        init_databases()
         logger.info(f"Cleared database: {db_path}")
     except Exception as e:
         logger.error(f"Error clearing database {db_path}: {e}")
 
 
-def get_cached_business_ids(latitude: float, longitude: float, radius: float = 3000) -> List[str]:
+def get_cached_business_ids(latitude: float, longitude: float, radius: float = 3000) -> Set[str]:
     """
-    Get list of cached business IDs from the database within a radius.
+    Get the cached business IDs from the database within a radius.
     
     Args:
         latitude: Center latitude
@@ -463,32 +780,27 @@ def get_cached_business_ids(latitude: float, longitude: float, radius: float = 3
         radius: Search radius in meters (default: 3000)
         
     Returns:
-        List of business IDs
+        Set of business IDs
     """
     try:
-        conn = sqlite3.connect(NEARBY_PLACES_DB)
+        conn = _get_conn(NEARBY_PLACES_DB)
         cursor = conn.cursor()
         
+        # Answered from the R*Tree alone, without reading places rows
         cursor.execute("""
             SELECT DISTINCT business_id
-            FROM places 
-            WHERE latitude BETWEEN ? AND ? 
-            AND longitude BETWEEN ? AND ?
+            FROM places_rtree
+            WHERE max_lat >= ? AND min_lat <= ?
+            AND max_lon >= ? AND min_lon <= ?
             AND business_id IS NOT NULL
         """, (
-            latitude - radius/111000,
-            latitude + radius/111000,
-            longitude - radius/111000,
-            longitude + radius/111000
+            *_bbox(latitude, longitude, radius),
         ))
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [row[0] for row in rows if row[0]]
+        return {row[0] for row in cursor if row[0]}
     except Exception as e:
         logger.error(f"Error retrieving cached business IDs: {e}")
-        return []
+        return set()
 
 
 def check_connection() -> bool:
@@ -500,16 +812,14 @@ def check_connection() -> bool:
     """
     try:
         # Test SerpAPI database
-        conn1 = sqlite3.connect(SERP_API_DB)
+        conn1 = _get_conn(SERP_API_DB)
         cursor1 = conn1.cursor()
         cursor1.execute("SELECT 1")
-        conn1.close()
         
         # Test Nearby Places database
-        conn2 = sqlite3.connect(NEARBY_PLACES_DB)
+        conn2 = _get_conn(NEARBY_PLACES_DB)
         cursor2 = conn2.cursor()
         cursor2.execute("SELECT 1")
-        conn2.close()
         
         return True
     except Exception as e:
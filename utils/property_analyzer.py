@@ -1,14 +1,120 @@
 """Property analyzer for generating pros, cons, and suggestions based on property features."""
 
+import numpy as np
 import pandas as pd
-import json
+import hashlib
 import logging
+import orjson
 import os
-from typing import Dict, Any, Optional, List
-from utils.api_clients import OpenAIClient
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+from utils.api_clients import OpenAIClient, parse_json_response
+from utils.coordinate_index import CoordinateIndex
+from utils.data_files import load_property_frame
+from utils.database import get_property_analyses, store_property_analyses
 
 logger = logging.getLogger(__name__)
 
+# Property columns sent to the LLM; the row's Lat-Long only identifies it and carries no signal
+PROPERTY_PROMPT_FEATURES = (
+    'Household income above 5 LPA',
+    'Household income above 10 LPA',
+    'Household income above 20 LPA',
+    'Population (0-18 Yrs)',
+    'Population (18-60 Yrs)',
+    'Population (Above 60 Yrs)',
+    'Total Retail Shops',
+    'Total Brands Density',
+    'Affluence Indicator',
+    'Overall Footfall Score',
+    'Branded Footfall Score'
+)
+
+# Single-location analysis prompt, rendered once: the prefix takes (business_type, area_name), the
+# property features JSON goes between the two parts, and the suffix takes (business_type, business_type)
+PROPERTY_PROMPT_PREFIX = """You are a business consultant expert in evaluating market opportunities. Analyze the feasibility of opening a %s at the location "%s" based on the detailed property features provided.
+
+PROPERTY FEATURES:
+"""
+
+PROPERTY_PROMPT_SUFFIX = """
+
+INSTRUCTIONS:
+Based on these property features, provide a detailed analysis for opening a %s at this location. Focus on how these specific demographic and market characteristics affect the business opportunity.
+
+Provide your analysis in JSON format with the following keys:
+1. "pros" - List 4-5 specific opportunities/benefits based on the property features
+2. "cons" - List 4-5 specific challenges/risk factors based on the property features
+3. "suggestions" - List 6-7 actionable strategies to maximize success given these property features
+4. "recommendation" - One sentence summary recommendation
+
+RESPONSE FORMAT:
+{
+  "pros": ["specific opportunity 1 based on property features", "specific opportunity 2 based on property features", ...],
+  "cons": ["specific challenge 1 based on property features", "specific challenge 2 based on property features", ...],
+  "suggestions": ["actionable strategy 1 based on property features", "actionable strategy 2 based on property features", ...],
+  "recommendation": "one sentence summary recommendation based on property features"
+}
+
+Be specific and data-driven in your analysis. Reference the actual property feature values in your response. For example:
+- Instead of "High income area", say "Area has X households with income above 10 LPA"
+- Instead of "High foot traffic", say "Area has a footfall score of X"
+- Instead of "Young population", say "Area has X people in 18-60 age group"
+
+Focus on how these specific characteristics make this location suitable or challenging for a %s."""
+
+def _build_coordinate_index(df: pd.DataFrame) -> CoordinateIndex:
+    """
+    Parse every property's coordinates once and index them.
+    
+    Args:
+        df: Property data with a "lat, lon" Lat-Long column
+        
+    Returns:
+        Coordinate index over the rows of df
+    """
+    if df.empty or 'Lat-Long' not in df:
+        return CoordinateIndex(np.empty(0), np.empty(0))
+    
+    coords = df['Lat-Long'].astype(str).str.extract(r'(-?\d+(?:\.\d*)?)\s*,\s*(-?\d+(?:\.\d*)?)').astype(float)
+    return CoordinateIndex(coords[0].to_numpy(dtype=np.float64), coords[1].to_numpy(dtype=np.float64))
+
+
+def _prompt_features(property_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the property features the analysis prompts include."""
+    return {feature: property_data[feature] for feature in PROPERTY_PROMPT_FEATURES if feature in property_data}
+
+
+def _analysis_key(model: str, business_type: str, area_name: str, property_data: Dict[str, Any]) -> str:
+    """Stable hash of everything a property analysis depends on."""
+    payload = orjson.dumps([model, business_type, area_name, property_data], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _load_property_table() -> Tuple[pd.DataFrame, CoordinateIndex, List[Dict[str, Any]]]:
+    """
+    Load property data and index its coordinates, once per process.
+    
+    Every PropertyAnalyzer shares the result. A failed load raises, so the next
+    analyzer retries it instead of a failure being cached.
+    
+    Returns:
+        Tuple of (property DataFrame, coordinate index, rows as dictionaries)
+    """
+    # Get the directory of this file and construct path relative to project root
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    csv_path = os.path.join(current_dir, "data", "dummy_property_variables.csv")
+    
+    if not os.path.exists(csv_path):
+        # Fallback to relative path
+        csv_path = "data/dummy_property_variables.csv"
+    
+    df = load_property_frame(csv_path)
+    logger.info(f"Loaded property data with {len(df)} records from {csv_path}")
+    # Rows converted once, so lookups return plain dictionaries without touching pandas
+    return df, _build_coordinate_index(df), df.to_dict(orient='records')
+
 
 class PropertyAnalyzer:
     """Analyzes property features from CSV to generate business recommendations."""
@@ -16,31 +122,14 @@ class PropertyAnalyzer:
     def __init__(self):
         """Initialize the property analyzer."""
         self.openai_client = OpenAIClient()
-        self.property_data = self._load_property_data()
-        logger.info("Property Analyzer initialized")
-    
-    def _load_property_data(self) -> pd.DataFrame:
-        """
-        Load property data from CSV.
-        
-        Returns:
-            DataFrame with property data
-        """
         try:
-            # Get the directory of this file and construct path relative to project root
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            csv_path = os.path.join(current_dir, "data", "dummy_property_variables.csv")
-            
-            if not os.path.exists(csv_path):
-                # Fallback to relative path
-                csv_path = "data/dummy_property_variables.csv"
-            
-            df = pd.read_csv(csv_path)
-            logger.info(f"Loaded property data with {len(df)} records from {csv_path}")
-            return df
+            self.property_data, self._coordinate_index, self._property_records = _load_property_table()
         except Exception as e:
             logger.error(f"Error loading property data: {e}")
-            return pd.DataFrame()
+            self.property_data = pd.DataFrame()
+            self._coordinate_index = _build_coordinate_index(self.property_data)
+            self._property_records = []
+        logger.info("Property Analyzer initialized")
     
     def find_property_by_coordinates(self, latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
         """
@@ -57,28 +146,15 @@ class PropertyAnalyzer:
             return None
             
         try:
-            # Look for matching coordinates
-            for _, row in self.property_data.iterrows():
-                lat_long_str = row['Lat-Long']
-                try:
-                    # Parse the coordinate string
-                    coords = lat_long_str.replace('"', '').strip()
-                    if ',' in coords:
-                        lat, lon = coords.split(',')
-                        lat_val = float(lat.strip())
-                        lon_val = float(lon.strip())
-                        
-                        # Check if coordinates match (with small tolerance)
-                        tolerance = 0.000001
-                        if abs(lat_val - latitude) < tolerance and abs(lon_val - longitude) < tolerance:
-                            # Convert row to dictionary
-                            property_info = row.to_dict()
-                            logger.info(f"Found property data for coordinates: {latitude}, {longitude}")
-                            return property_info
-                except Exception as parse_error:
-                    logger.debug(f"Error parsing coordinates {lat_long_str}: {parse_error}")
-                    continue
-                    
+            # Look for matching coordinates (with small tolerance)
+            match = self._coordinate_index.find(latitude, longitude)
+            
+            if match is not None:
+                # Copy of the first matching row, so callers cannot modify the shared record
+                property_info = dict(self._property_records[match])
+                logger.info(f"Found property data for coordinates: {latitude}, {longitude}")
+                return property_info
+            
             logger.info(f"No property data found for coordinates: {latitude}, {longitude}")
             return None
         except Exception as e:
@@ -107,18 +183,45 @@ class PropertyAnalyzer:
                 # Return fallback analysis if no property data found
                 return self._generate_fallback_analysis(business_type, area_name)
             
+            return self._analyze_property(business_type, area_name, property_data)
+                
+        except Exception as e:
+            logger.error(f"Error generating property analysis: {e}")
+            return self._generate_fallback_analysis(business_type, area_name)
+    
+    def _analyze_property(self, business_type: str, area_name: str,
+                          property_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze a single location whose property data has already been found.
+        
+        Args:
+            business_type: Type of business to analyze
+            area_name: Name of the area
+            property_data: Property data from CSV
+            
+        Returns:
+            Dictionary with pros, cons, suggestions, and recommendation
+        """
+        try:
+            # The analysis depends only on these inputs, so a stored one is reused
+            analysis_key = _analysis_key(self.openai_client.model, business_type, area_name, property_data)
+            stored = get_property_analyses([analysis_key]).get(analysis_key)
+            if stored is not None:
+                return stored
+            
             # Create prompt for LLM
             prompt = self._create_property_analysis_prompt(business_type, area_name, property_data)
             
             # Generate analysis using LLM
             response = self.openai_client.generate_recommendation(prompt)
             
-            # Parse JSON response
+            # Parse JSON response, tolerating text around the object
             try:
-                analysis_data = json.loads(response.replace("```json", "").replace("```", ""))
+                analysis_data = parse_json_response(response)
                 logger.info(f"Generated property analysis for {business_type} in {area_name}")
+                store_property_analyses({analysis_key: analysis_data})
                 return analysis_data
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Error parsing LLM response as JSON")
                 return self._generate_fallback_analysis(business_type, area_name)
                 
@@ -139,38 +242,11 @@ class PropertyAnalyzer:
         Returns:
             Formatted prompt string
         """
-        prompt = f"""
-You are a business consultant expert in evaluating market opportunities. Analyze the feasibility of opening a {business_type} at the location "{area_name}" based on the detailed property features provided.
-
-PROPERTY FEATURES:
-{json.dumps(property_data, indent=2)}
-
-INSTRUCTIONS:
-Based on these property features, provide a detailed analysis for opening a {business_type} at this location. Focus on how these specific demographic and market characteristics affect the business opportunity.
-
-Provide your analysis in JSON format with the following keys:
-1. "pros" - List 4-5 specific opportunities/benefits based on the property features
-2. "cons" - List 4-5 specific challenges/risk factors based on the property features
-3. "suggestions" - List 6-7 actionable strategies to maximize success given these property features
-4. "recommendation" - One sentence summary recommendation
-
-RESPONSE FORMAT:
-{{
-  "pros": ["specific opportunity 1 based on property features", "specific opportunity 2 based on property features", ...],
-  "cons": ["specific challenge 1 based on property features", "specific challenge 2 based on property features", ...],
-  "suggestions": ["actionable strategy 1 based on property features", "actionable strategy 2 based on property features", ...],
-  "recommendation": "one sentence summary recommendation based on property features"
-}}
-
-Be specific and data-driven in your analysis. Reference the actual property feature values in your response. For example:
-- Instead of "High income area", say "Area has X households with income above 10 LPA"
-- Instead of "High foot traffic", say "Area has a footfall score of X"
-- Instead of "Young population", say "Area has X people in 18-60 age group"
-
-Focus on how these specific characteristics make this location suitable or challenging for a {business_type}.
-"""
-        
-        return prompt.strip()
+        return "".join((
+            PROPERTY_PROMPT_PREFIX % (business_type, area_name),
+            orjson.dumps(_prompt_features(property_data)).decode(),
+            PROPERTY_PROMPT_SUFFIX % (business_type, business_type)
+        ))
     
     def _generate_fallback_analysis(self, business_type: str, area_name: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,38 @@
+"""Thread-safe token-bucket rate limiter."""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket that lets callers burst up to capacity, then paces them at a fixed rate."""
+    
+    def __init__(self, max_per_second: float, burst: int = 1):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_per_second: Sustained number of acquisitions allowed per second
+            burst: Maximum number of tokens that can be saved up for a burst
+        """
+        self.rate = max_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            time.sleep(wait)
@@ -4,6 +4,7 @@
 import sys
 import os
 import logging
+import numpy as np
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -16,35 +17,37 @@ def verify_distances():
     """Verify distance calculations are correct."""
     try:
         # Import the distance calculation function
-        from agents.nodes.chain_brand_node import _calculate_distance
+        from utils.distance import haversine_km
         
         # Test with known coordinates
         # Chandigarh sector 17 (search location)
         lat1, lon1 = 30.7333, 76.7794
         
         # Some known cafes in Chandigarh with their coordinates
-        test_cases = [
+        test_cases = np.array([
             # (name, lat, lon, expected_distance_km)
             ("Sector 17 Plaza", 30.7361, 76.7894, 1.1),  # Approx 1.1 km
             ("Rose Garden", 30.7445, 76.8012, 2.5),      # Approx 2.5 km
             ("Rock Garden", 30.7536, 76.8324, 5.3),      # Approx 5.3 km
-        ]
+        ], dtype=[("name", "U32"), ("lat", "f8"), ("lon", "f8"), ("expected", "f8")])
         
         logger.info(f"Verifying distances from reference point: ({lat1}, {lon1})")
         
-        for name, lat2, lon2, expected_distance in test_cases:
-            calculated_distance = _calculate_distance(lat1, lon1, lat2, lon2)
-            logger.info(f"{name}:")
-            logger.info(f"  Coordinates: ({lat2}, {lon2})")
-            logger.info(f"  Expected distance: ~{expected_distance} km")
-            logger.info(f"  Calculated distance: {calculated_distance:.2f} km")
-            
-            # Check if the calculated distance is reasonable (within 20% of expected)
-            if abs(calculated_distance - expected_distance) / expected_distance < 0.2:
-                logger.info(f"  ✅ Distance calculation is accurate")
-            else:
-                logger.warning(f"  ⚠️  Distance may be inaccurate")
-            logger.info("---")
+        # All test distances and checks in one vectorized pass
+        calculated = haversine_km(lat1, lon1, test_cases["lat"], test_cases["lon"])
+        
+        # A calculated distance is reasonable when within 20% of the expected one
+        accurate = np.abs(calculated - test_cases["expected"]) / test_cases["expected"] < 0.2
+        
+        report = "\n".join(
+            f"  {'✅' if ok else '⚠️ '} {case['name']:<16} ({case['lat']}, {case['lon']})  "
+            f"expected ~{case['expected']} km, calculated {distance:.2f} km"
+            for case, distance, ok in zip(test_cases, calculated, accurate)
+        )
+        if accurate.all():
+            logger.info(f"All {len(test_cases)} distance calculations are accurate:\n{report}")
+        else:
+            logger.warning(f"{np.count_nonzero(~accurate)} of {len(test_cases)} distances may be inaccurate:\n{report}")
             
         # Test with actual SerpAPI data
         logger.info("Testing with actual SerpAPI data:")
@@ -44,26 +44,36 @@ def test_property_analyzer_import():
         print(f"❌ Error importing PropertyAnalyzer: {e}")
         return False
 
-def test_property_analyzer_initialization():
+def _create_analyzer():
+    """Create the PropertyAnalyzer shared by the tests, or None if that fails."""
+    try:
+        from utils.property_analyzer import PropertyAnalyzer
+        return PropertyAnalyzer()
+    except Exception:
+        return None
+
+def test_property_analyzer_initialization(analyzer=None):
     """Test that we can initialize the PropertyAnalyzer."""
     print("\n🔍 Testing PropertyAnalyzer initialization...")
     
     try:
-        from utils.property_analyzer import PropertyAnalyzer
-        analyzer = PropertyAnalyzer()
+        if analyzer is None:
+            from utils.property_analyzer import PropertyAnalyzer
+            analyzer = PropertyAnalyzer()
         print("✅ PropertyAnalyzer initialized successfully")
         return True
     except Exception as e:
         print(f"❌ Error initializing PropertyAnalyzer: {e}")
         return False
 
-def test_coordinate_matching():
+def test_coordinate_matching(analyzer=None):
     """Test coordinate matching functionality."""
     print("\n🔍 Testing coordinate matching...")
     
     try:
-        from utils.property_analyzer import PropertyAnalyzer
-        analyzer = PropertyAnalyzer()
+        if analyzer is None:
+            from utils.property_analyzer import PropertyAnalyzer
+            analyzer = PropertyAnalyzer()
         
         # Test with a known coordinate from the CSV
         # Using the first entry: "30.6818636, 76.6924349"
@@ -88,18 +98,27 @@ def main():
     
     tests = [
         test_csv_loading,
-        test_property_analyzer_import,
+        test_property_analyzer_import
+    ]
+    
+    # These share one analyzer rather than each loading the property data
+    analyzer_tests = [
         test_property_analyzer_initialization,
         test_coordinate_matching
     ]
     
     passed = 0
-    total = len(tests)
+    total = len(tests) + len(analyzer_tests)
     
     for test in tests:
         if test():
             passed += 1
     
+    analyzer = _create_analyzer()
+    for test in analyzer_tests:
+        if test(analyzer):
+            passed += 1
+    
     print("\n" + "=" * 50)
     print(f"📊 Verification Results: {passed}/{total} tests passed")
     